@@ -1,13 +1,104 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Journal, Volume, Issue, Article
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+from .models import User, Journal, Volume, Issue, Article, ArticleStatus, InvalidTransition, transition_sources
+from .changes import record_queryset
+from .stats import bulk_status_update
+
+
+# Paginator for large tables
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the database's row estimate instead of COUNT(*) for unfiltered
+    changelists. Filtered or small tables still get an exact count.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            estimate = self.estimate(self.object_list.model, self.object_list.db)
+            if estimate and estimate > self.exact_count_threshold:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def estimate(model, using):
+        connection = connections[using]
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [model._meta.db_table],
+                )
+            elif connection.vendor == 'sqlite':
+                # Highest rowid: an upper bound, read straight off the b-tree.
+                cursor.execute(f"SELECT MAX(_rowid_) FROM {table}")
+            else:
+                return None
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
+def indexed_lookup(model, path, term):
+    """
+    Q matching ``path`` (``^field`` prefix or ``=field`` exact) against
+    ``term``, case-sensitively, in a form an index on the field can serve.
+
+    Prefixes are ranges rather than LIKE, which SQLite only runs off an index
+    when it is case-sensitive. Related fields become ``fk__in`` subqueries, so
+    each step is an index lookup instead of a join the planner scans.
+    """
+    kind, path = path[0], path[1:]
+    name, _, rest = path.partition('__')
+    if rest:
+        related = model._meta.get_field(name).related_model
+        return Q(**{f'{name}__in': related._default_manager.filter(indexed_lookup(related, kind + rest, term)).values('pk')})
+    if kind == '^':
+        return Q(**{f'{name}__gte': term, f'{name}__lt': term + '\U0010ffff'})
+    return Q(**{name: term})
+
+
+class IndexedSearchMixin:
+    """
+    Search ``search_fields`` (each ``^field`` or ``=field``) with
+    indexed_lookup() instead of Django's case-insensitive lookups, which scan
+    the whole table. Words are ANDed and fields ORed, as in Django's search.
+    """
+    def get_search_results(self, request, queryset, search_term):
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            match = Q()
+            for path in self.get_search_fields(request):
+                match |= indexed_lookup(self.model, path, bit)
+            queryset = queryset.filter(match)
+        return queryset, False
+
+
+class LargeTableAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) Django runs for "N total".
+    show_full_result_count = False
 
 
 # Custom User Admin
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(IndexedSearchMixin, BaseUserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ('email', 'name', 'role', 'is_staff', 'is_active')
     list_filter = ('role', 'is_staff', 'is_active')
-    search_fields = ('email', 'name')
+    # Case-insensitive prefix search on the indexed, case-folded copies; also
+    # backs the publisher autocomplete on articles.
+    search_fields = ('^email_folded', '^name_folded')
     ordering = ('email',)
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -22,10 +113,106 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        return super().get_search_results(request, queryset, search_term.casefold())
+
+
+class JournalAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display = ('name', 'slug', 'issn', 'created_at')
+    search_fields = ('^name', '=slug', '=issn')
+    prepopulated_fields = {'slug': ('name',)}
+
+
+class VolumeAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'number', 'year', 'journal')
+    list_filter = ('year',)
+    search_fields = ('^journal__name',)
+    autocomplete_fields = ('journal',)
+
+    def get_queryset(self, request):
+        # Volume.__str__ reads journal.name; this also covers the
+        # autocomplete results used by IssueAdmin.
+        return super().get_queryset(request).select_related('journal')
+
+
+class IssueAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'number', 'month', 'volume')
+    list_select_related = ('volume__journal',)
+    list_filter = ('month',)
+    search_fields = ('^title', '^volume__journal__name')
+    autocomplete_fields = ('volume',)
+
+
+# Article admin
+def transition_action(target, description):
+    """
+    Bulk status change as a single UPDATE, limited to rows whose current
+    status may move to ``target`` (see ARTICLE_TRANSITIONS); anything else in
+    the selection is left untouched.
+    """
+    sources = transition_sources(target)
+
+    def action(modeladmin, request, queryset):
+        eligible = queryset.filter(status__in=sources)
+        with transaction.atomic():
+            record_queryset(eligible)
+            updated = bulk_status_update(
+                eligible, target, updated_at=timezone.now(), version=F('version') + 1,
+            )
+        skipped = queryset.count() - updated
+        message = f"{updated} article(s) marked {target.label.lower()}."
+        if skipped:
+            message += f" {skipped} skipped (not {' / '.join(s.label for s in sources)})."
+        modeladmin.message_user(request, message)
+
+    action.__name__ = f'mark_{target.lower()}'
+    action.short_description = description
+    action.allowed_permissions = ('change',)
+    return action
+
+
+class ArticleAdminForm(forms.ModelForm):
+    def clean_status(self):
+        # The instance still holds the status it was loaded with here.
+        status = self.cleaned_data['status']
+        if not self.instance._state.adding:
+            try:
+                self.instance.check_transition(status)
+            except InvalidTransition as e:
+                raise forms.ValidationError(str(e))
+        return status
+
+
+class ArticleAdmin(LargeTableAdmin):
+    form = ArticleAdminForm
+    list_display = ('title', 'status', 'payment_verified', 'issue', 'publisher', 'created_at')
+    list_select_related = ('issue', 'publisher')
+    list_filter = ('status', 'payment_verified')
+    search_fields = ('^title', '=slug')
+    autocomplete_fields = ('issue', 'publisher')
+    readonly_fields = ('created_at', 'updated_at', 'version')
+    actions = (
+        transition_action(ArticleStatus.UNDER_REVIEW, "Start review of selected articles"),
+        transition_action(ArticleStatus.APPROVED, "Approve selected articles"),
+        transition_action(ArticleStatus.REJECTED, "Reject selected articles"),
+        transition_action(ArticleStatus.PUBLISHED, "Publish selected articles"),
+        'mark_payment_verified',
+    )
+
+    @admin.action(description="Mark payment verified", permissions=['change'])
+    def mark_payment_verified(self, request, queryset):
+        unverified = queryset.filter(payment_verified=False)
+        with transaction.atomic():
+            record_queryset(unverified)
+            updated = unverified.update(
+                payment_verified=True, updated_at=timezone.now(), version=F('version') + 1
+            )
+        self.message_user(request, f"{updated} payment(s) marked verified.")
+
 
 # Register models
 admin.site.register(User, UserAdmin)
-admin.site.register(Journal)
-admin.site.register(Volume)
-admin.site.register(Issue)
-admin.site.register(Article)
+admin.site.register(Journal, JournalAdmin)
+admin.site.register(Volume, VolumeAdmin)
+admin.site.register(Issue, IssueAdmin)
+admin.site.register(Article, ArticleAdmin)
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class HomeAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home_app'
+
+    def ready(self):
+        # Connects the receivers that keep the statistics rollups and the
+        # change feed current: any process may write articles.
+        #
+        # The other receivers only matter where requests are served, and
+        # their modules pull in simplejwt and prometheus_client, so they are
+        # connected by the web entry points instead of on every manage.py
+        # command: the middleware imports metrics, and the URLconf's views
+        # import counters (flushing the view counters) and tokens (keeping
+        # the blacklist cache in step). Commands that need them import them.
+        from . import changes, stats  # noqa: F401
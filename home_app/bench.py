@@ -0,0 +1,219 @@
+import timeit
+
+from .seeding import seed_dataset
+
+
+# -------------------------
+# Benchmark suites
+# -------------------------
+# Each suite is a function taking the seeded dataset and the repeat count and
+# returning a list of (group, label, seconds per call, extra info) rows. The
+# first row of a group is the baseline the others are compared against. Run
+# them with ``python manage.py benchmark <suite>``; the seed is rolled back
+# afterwards.
+
+SUITES = {}
+
+
+def register(name):
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def measure(func, repeat=5, number=1):
+    """Best-of-``repeat`` wall time of one call to ``func``, in seconds."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def run_suite(name, repeat=5, **seed_kwargs):
+    dataset = seed_dataset(**seed_kwargs)
+    return SUITES[name](dataset, repeat)
+
+
+# -------------------------
+# Renderers
+# -------------------------
+@register('renderers')
+def bench_renderers(dataset, repeat):
+    from rest_framework.renderers import JSONRenderer
+    from .models import Article
+    from .renderers import FastJSONRenderer, MessagePackRenderer
+    from .serializers import ArticleSerializer
+
+    data = ArticleSerializer(
+        Article.objects.select_related('issue__volume__journal', 'counter'), many=True
+    ).data
+
+    rows = []
+    for renderer in (JSONRenderer(), FastJSONRenderer(), MessagePackRenderer()):
+        size = len(renderer.render(data))
+        seconds = measure(lambda: renderer.render(data), repeat=repeat)
+        rows.append(('articles', type(renderer).__name__, seconds, f'{size} bytes'))
+    return rows
+
+
+# -------------------------
+# Projections
+# -------------------------
+@register('projections')
+def bench_projections(dataset, repeat):
+    from .models import Article, Issue, Volume
+    from .projections import ArticleProjection, IssueProjection, VolumeProjection
+    from .serializers import ArticleSerializer, IssueSerializer, VolumeSerializer
+
+    rows = []
+    for model, serializer_class, projection_class in (
+        (Article, ArticleSerializer, ArticleProjection),
+        (Issue, IssueSerializer, IssueProjection),
+        (Volume, VolumeSerializer, VolumeProjection),
+    ):
+        group = model._meta.model_name
+        info = f'{model.objects.count()} rows'
+        seconds = measure(lambda: serializer_class(model.objects.all(), many=True).data, repeat=repeat)
+        rows.append((group, serializer_class.__name__, seconds, info))
+        seconds = measure(lambda: projection_class(model.objects.all()).data, repeat=repeat)
+        rows.append((group, projection_class.__name__, seconds, info))
+    return rows
+
+
+# -------------------------
+# Serializer setup
+# -------------------------
+def build_fields(serializer):
+    """Build every field of a serializer tree, as rendering it would."""
+    from rest_framework.serializers import BaseSerializer
+
+    serializer = getattr(serializer, 'child', serializer)
+    for field in serializer.fields.values():
+        if isinstance(field, BaseSerializer):
+            build_fields(field)
+
+
+@register('serializer_setup')
+def bench_serializer_setup(dataset, repeat):
+    from unittest import mock
+    from rest_framework.serializers import ModelSerializer
+    from .serializers import ArticleSerializer, CachedFieldsModelSerializer, IssueSerializer, VolumeSerializer
+
+    rows = []
+    for serializer_class in (ArticleSerializer, IssueSerializer, VolumeSerializer):
+        group = serializer_class.Meta.model._meta.model_name
+        setup = lambda: build_fields(serializer_class([], many=True))
+        with mock.patch.object(CachedFieldsModelSerializer, 'get_fields', ModelSerializer.get_fields):
+            rows.append((group, 'ModelSerializer.get_fields', measure(setup, repeat=repeat, number=100), 'per request'))
+        rows.append((group, 'cached field templates', measure(setup, repeat=repeat, number=100), 'per request'))
+    return rows
+
+
+# -------------------------
+# Middleware
+# -------------------------
+STOCK_MIDDLEWARE = {
+    'home_app.middleware.SessionMiddleware': 'django.contrib.sessions.middleware.SessionMiddleware',
+    'home_app.middleware.CsrfViewMiddleware': 'django.middleware.csrf.CsrfViewMiddleware',
+    'home_app.middleware.AuthenticationMiddleware': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'home_app.middleware.MessageMiddleware': 'django.contrib.messages.middleware.MessageMiddleware',
+    'home_app.middleware.XFrameOptionsMiddleware': 'django.middleware.clickjacking.XFrameOptionsMiddleware',
+}
+
+
+@register('middleware')
+def bench_middleware(dataset, repeat):
+    from django.conf import settings
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.core.handlers.base import BaseHandler
+    from django.test import RequestFactory, override_settings
+
+    # A browser that signed in through the admin or Google also sends its
+    # session cookie to the API.
+    session = SessionStore()
+    session['seen'] = True
+    session.create()
+    factory = RequestFactory()
+    requests = {
+        'no cookie': lambda: factory.get('/api/journals/'),
+        'cookie': lambda: factory.get(
+            '/api/journals/', HTTP_COOKIE=f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+        ),
+    }
+    chains = {
+        'stock middleware': [STOCK_MIDDLEWARE.get(path, path) for path in settings.MIDDLEWARE],
+        'lean /api/ middleware': settings.MIDDLEWARE,
+    }
+
+    rows = []
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        for group, make_request in requests.items():
+            for label, middleware in chains.items():
+                with override_settings(MIDDLEWARE=middleware):
+                    handler = BaseHandler()
+                    handler.load_middleware()
+                seconds = measure(lambda: handler.get_response(make_request()), repeat=repeat, number=200)
+                rows.append((group, label, seconds, 'GET /api/journals/'))
+    return rows
+
+
+# -------------------------
+# Token blacklist
+# -------------------------
+@register('token_blacklist')
+def bench_token_blacklist(dataset, repeat, tokens=50000):
+    from datetime import timedelta
+    from unittest import mock
+    from django.utils import timezone
+    from rest_framework_simplejwt import tokens as jwt_tokens
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+    from .tokens import RefreshToken, prune_expired
+
+    user = dataset['users'][0]
+    # A deployment's worth of logins, long expired, some of them logged out.
+    expired = timezone.now() - timedelta(days=30)
+    OutstandingToken.objects.bulk_create(
+        OutstandingToken(user=user, jti=f'bench-{i}', token='', created_at=expired, expires_at=expired)
+        for i in range(tokens)
+    )
+    BlacklistedToken.objects.bulk_create(
+        BlacklistedToken(token=token) for token in OutstandingToken.objects.filter(jti__startswith='bench-')[::10]
+    )
+    encoded = str(RefreshToken.for_user(user))
+
+    rows = []
+    for group in ('unpruned', 'pruned'):
+        info = f'{OutstandingToken.objects.count()} outstanding'
+        seconds = measure(lambda: jwt_tokens.RefreshToken(encoded), repeat=repeat, number=200)
+        rows.append((group, 'simplejwt RefreshToken', seconds, info))
+        seconds = measure(lambda: RefreshToken(encoded), repeat=repeat, number=200)
+        rows.append((group, 'blacklist check, local cache', seconds, info))
+        # "Not blacklisted" is only cached in a cache the workers share.
+        with mock.patch('home_app.tokens.is_shared', return_value=True):
+            seconds = measure(lambda: RefreshToken(encoded), repeat=repeat, number=200)
+        rows.append((group, 'blacklist check, shared cache', seconds, info))
+        if group == 'unpruned':
+            pruning = measure(prune_expired, repeat=1)
+    rows.append(('prune', 'prune_expired', pruning, f'{tokens} tokens'))
+    return rows
+
+
+# -------------------------
+# Article feed
+# -------------------------
+@register('article_feed')
+def bench_article_feed(dataset, repeat):
+    from .models import Article, ArticleStatus
+
+    journal = dataset['journals'][0]
+    year = journal.volumes.order_by('year').values_list('year', flat=True).first()
+    latest = ('-created_at', '-id')
+    rows = []
+    for group, joined, denormalized in (
+        ('journal', {'issue__volume__journal': journal}, {'journal': journal}),
+        ('journal+year', {'issue__volume__journal': journal, 'issue__volume__year': year},
+         {'journal': journal, 'year': year}),
+    ):
+        for label, filters in (('through issue/volume', joined), ('Article.journal/year', denormalized)):
+            query = Article.objects.filter(status=ArticleStatus.PUBLISHED, **filters).order_by(*latest)
+            seconds = measure(lambda: list(query[:20].values_list('pk', flat=True)), repeat=repeat, number=20)
+            rows.append((group, label, seconds, 'latest 20 published'))
+    return rows
@@ -0,0 +1,200 @@
+from django.db.models import Exists, Max, OuterRef
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Journal, Volume, Issue, Article, Change
+from .projections import _datetime, _file_storage
+
+
+# -------------------------
+# Change feed
+# -------------------------
+# Every write to a Journal, Volume, Issue or Article appends a Change row in
+# the same transaction as the write. Single-row saves and deletes are caught
+# by the receivers below; set-based writes (admin actions, the review queue,
+# delete_subtree, seeding) call record()/record_queryset() themselves.
+#
+# The Change primary key is the feed sequence. SQLite has a single writer, so
+# ids become visible in order; a database with concurrent writers would also
+# need the feed to hold back ids younger than the oldest open transaction.
+
+RECORD_CHUNK_SIZE = 2000
+
+
+def latest_seq():
+    """Sequence of the newest change; it only grows (compact() keeps the newest)."""
+    return Change.objects.aggregate(seq=Max('id'))['seq'] or 0
+
+
+def record(model_name, pks, deleted=False):
+    Change.objects.bulk_create(
+        [Change(model=model_name, object_id=pk, deleted=deleted) for pk in pks],
+        batch_size=RECORD_CHUNK_SIZE,
+    )
+
+
+def record_queryset(queryset, deleted=False, chunk_size=RECORD_CHUNK_SIZE):
+    """Record a change for every row of ``queryset``, in bounded chunks."""
+    model_name = queryset.model._meta.model_name
+    batch = []
+    for pk in queryset.order_by().values_list('pk', flat=True).iterator(chunk_size=chunk_size):
+        batch.append(pk)
+        if len(batch) >= chunk_size:
+            record(model_name, batch, deleted)
+            batch = []
+    record(model_name, batch, deleted)
+
+
+def compact():
+    """
+    Drop changes superseded by a later change to the same row. Every row's
+    latest change survives, so any cursor still yields a complete delta.
+    """
+    superseded = Change.objects.filter(
+        model=OuterRef('model'), object_id=OuterRef('object_id'), id__gt=OuterRef('id')
+    )
+    return Change.objects.filter(Exists(superseded)).delete()[0]
+
+
+# -------------------------
+# Reading the feed
+# -------------------------
+# Rows are flat (foreign keys as ids) so a client can apply them one by one.
+
+def _id(value):
+    return str(value) if value is not None else None
+
+
+def _file_url(name, request):
+    if not name:
+        return None
+    url = _file_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def _journal(row, request):
+    return {
+        'id': _id(row['id']),
+        'name': row['name'],
+        'slug': row['slug'],
+        'description': row['description'],
+        'issn': row['issn'],
+        'created_at': _datetime(row['created_at']),
+        'updated_at': _datetime(row['updated_at']),
+    }
+
+
+def _volume(row, request):
+    return {
+        'id': _id(row['id']),
+        'number': row['number'],
+        'year': row['year'],
+        'journal': _id(row['journal_id']),
+        'created_at': _datetime(row['created_at']),
+        'updated_at': _datetime(row['updated_at']),
+    }
+
+
+def _issue(row, request):
+    return {
+        'id': _id(row['id']),
+        'number': row['number'],
+        'title': row['title'],
+        'month': row['month'],
+        'volume': _id(row['volume_id']),
+        'created_at': _datetime(row['created_at']),
+        'updated_at': _datetime(row['updated_at']),
+    }
+
+
+def _article(row, request):
+    return {
+        'id': _id(row['id']),
+        'issue': _id(row['issue_id']),
+        'publisher': row['publisher_id'],
+        'title': row['title'],
+        'slug': row['slug'],
+        'authors': row['authors'],
+        'abstract': row['abstract'],
+        'file': _file_url(row['file'], request),
+        'status': row['status'],
+        'payment_proof': _file_url(row['payment_proof'], request),
+        'payment_verified': row['payment_verified'],
+        'created_at': _datetime(row['created_at']),
+        'updated_at': _datetime(row['updated_at']),
+        'version': row['version'],
+        'lease_expires_at': _datetime(row['lease_expires_at']),
+        'reviewer': row['reviewer_id'],
+    }
+
+
+FEED_MODELS = {
+    'journal': (Journal, _journal),
+    'volume': (Volume, _volume),
+    'issue': (Issue, _issue),
+    'article': (Article, _article),
+}
+
+
+def changes_since(since, limit, request=None):
+    """
+    Up to ``limit`` changes after sequence ``since``, one entry per row (its
+    latest change in the page), plus the sequence to resume from and whether
+    more changes are waiting.
+
+    Each entry is ``{'seq', 'model', 'id', 'deleted', 'data'}``; ``data`` is
+    the row as it is now, or None for a tombstone.
+    """
+    page = list(
+        Change.objects.filter(id__gt=since).order_by('id')
+        .values_list('id', 'model', 'object_id', 'deleted')[:limit + 1]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    latest = {}
+    for seq, model, object_id, deleted in page:
+        latest[model, object_id] = (seq, deleted)
+
+    current = {}
+    for name, (model, to_data) in FEED_MODELS.items():
+        pks = [object_id for (model_name, object_id), (_, deleted) in latest.items()
+               if model_name == name and not deleted]
+        if pks:
+            for row in model.objects.filter(pk__in=pks).values():
+                current[name, row['id']] = to_data(row, request)
+
+    entries = []
+    for (model, object_id), (seq, deleted) in latest.items():
+        # A row that has gone since is reported as deleted; its own tombstone
+        # follows later in the feed.
+        data = None if deleted else current.get((model, object_id))
+        entries.append({
+            'seq': seq,
+            'model': model,
+            'id': str(object_id),
+            'deleted': data is None,
+            'data': data,
+        })
+    entries.sort(key=lambda entry: entry['seq'])
+    return entries, (page[-1][0] if page else since), has_more
+
+
+# -------------------------
+# Receivers
+# -------------------------
+@receiver(post_save, sender=Journal)
+@receiver(post_save, sender=Volume)
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Article)
+def row_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record(sender._meta.model_name, [instance.pk])
+
+
+@receiver(post_delete, sender=Journal)
+@receiver(post_delete, sender=Volume)
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Article)
+def row_deleted(sender, instance, **kwargs):
+    record(sender._meta.model_name, [instance.pk], deleted=True)
@@ -0,0 +1,168 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connection, transaction
+from django.dispatch import receiver
+
+from .metrics import UNFLUSHED_COUNTERS
+from .models import Article, ArticleCounter, ArticleStatus
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# Write-behind counters
+# -------------------------
+# Article views and downloads are counted in memory, per process, and added
+# to ArticleCounter in one batched upsert per flush instead of one UPDATE per
+# hit. A flush runs every COUNTER_FLUSH_INTERVAL seconds from a background
+# thread (started by the first hit, so processes that count nothing don't get
+# one), at the end of a request that finds the last flush that old, when
+# MAX_PENDING articles are waiting, and at interpreter exit.
+#
+# A crash loses at most the hits since the last flush: one interval's worth.
+# Counts read back lag behind by as much.
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+MAX_PENDING = 10000
+KINDS = ('views', 'downloads')
+
+_lock = threading.Lock()
+_pending = {}  # article pk -> [views, downloads]
+_last_flush = time.monotonic()
+_database = None  # the database the pending hits were counted against
+_flusher = None  # the background flush thread
+
+
+def flush_interval():
+    return getattr(settings, 'COUNTER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+def hit(article_id, kind='views'):
+    global _database
+    index = KINDS.index(kind)
+    with _lock:
+        _database = connection.settings_dict['NAME']
+        _pending.setdefault(article_id, [0, 0])[index] += 1
+        UNFLUSHED_COUNTERS.set(len(_pending))
+        full = len(_pending) >= MAX_PENDING
+        _start_flusher()
+    if full:
+        flush()
+
+
+def _flush_thread_enabled():
+    return getattr(settings, 'COUNTER_FLUSH_THREAD', True) and flush_interval() > 0
+
+
+def _start_flusher():
+    # Called with _lock held. A forked worker finds its parent's thread dead.
+    global _flusher
+    if (_flusher is None or not _flusher.is_alive()) and _flush_thread_enabled():
+        _flusher = threading.Thread(target=_flush_periodically, name='article-counters', daemon=True)
+        _flusher.start()
+
+
+def _flush_periodically():
+    while _flush_thread_enabled():
+        time.sleep(flush_interval())
+        if _pending:
+            try:
+                flush()
+            finally:
+                # This thread's own connection; don't hold it between flushes.
+                connection.close()
+
+
+def _take():
+    global _pending, _last_flush
+    with _lock:
+        pending, _pending = _pending, {}
+        _last_flush = time.monotonic()
+        UNFLUSHED_COUNTERS.set(0)
+    return pending
+
+
+def _restore(pending):
+    with _lock:
+        for article_id, (views, downloads) in pending.items():
+            counts = _pending.setdefault(article_id, [0, 0])
+            counts[0] += views
+            counts[1] += downloads
+        UNFLUSHED_COUNTERS.set(len(_pending))
+
+
+def _upsert(rows):
+    table = connection.ops.quote_name(ArticleCounter._meta.db_table)
+    prep = ArticleCounter._meta.get_field('article').get_db_prep_value
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (article_id, views, downloads) VALUES (%s, %s, %s) '
+            f'ON CONFLICT (article_id) DO UPDATE SET '
+            f'views = {table}.views + excluded.views, downloads = {table}.downloads + excluded.downloads',
+            [(prep(article_id, connection), views, downloads) for article_id, views, downloads in rows],
+        )
+
+
+def flush():
+    """Add the buffered counts to ArticleCounter. Returns the number of articles written."""
+    pending = _take()
+    if not pending:
+        return 0
+    try:
+        with transaction.atomic():
+            # Hits on articles deleted since are dropped.
+            existing = set(Article.objects.filter(pk__in=pending).values_list('pk', flat=True))
+            _upsert([(pk, *pending[pk]) for pk in existing])
+    except DatabaseError:
+        logger.exception("Flushing article counters failed; keeping them for the next flush")
+        _restore(pending)
+        return 0
+    return len(existing)
+
+
+@receiver(request_finished)
+def flush_when_due(sender, **kwargs):
+    if _pending and time.monotonic() - _last_flush >= flush_interval():
+        flush()
+
+
+@atexit.register
+def _flush_at_exit():
+    # Not if the database has been swapped out since, as the test runner does.
+    if _pending and connection.settings_dict['NAME'] == _database:
+        flush()
+
+
+def ranked(kind='views'):
+    """All counters by ``kind``, highest first: a walk down its ranking index."""
+    return ArticleCounter.objects.order_by(f'-{kind}', 'article').values_list('article_id', 'views', 'downloads')
+
+
+def most_read(kind='views', limit=10):
+    """
+    Top ``limit`` published articles by ``kind``. Counters are read off the
+    ranking index a page at a time and matched against published articles,
+    so only the top of the table is touched.
+    """
+    results, offset, page = [], 0, max(limit * 2, 50)
+    while len(results) < limit:
+        rows = list(ranked(kind)[offset:offset + page])
+        published = {
+            pk: (slug, title)
+            for pk, slug, title in Article.objects.filter(
+                pk__in=[row[0] for row in rows], status=ArticleStatus.PUBLISHED,
+            ).values_list('pk', 'slug', 'title')
+        }
+        results += [
+            {'id': pk, 'slug': published[pk][0], 'title': published[pk][1], 'views': views, 'downloads': downloads}
+            for pk, views, downloads in rows if pk in published
+        ]
+        if len(rows) < page:
+            break
+        offset += page
+    return results[:limit]
@@ -0,0 +1,83 @@
+from django.db import transaction
+
+from .models import Journal, Volume, Issue, Article, ArticleCounter, ArticleStatsRollup, PendingFileDeletion
+from .changes import record_queryset
+from .stats import subtract_articles
+
+
+# -------------------------
+# Set-based subtree deletes
+# -------------------------
+# Model.delete() lets Django's collector load every volume, issue and article
+# of a journal into memory to cascade. Here each level is removed with one
+# DELETE ... WHERE ... IN (subquery), bottom-up, in a single transaction, and
+# the article files are queued in PendingFileDeletion instead of being left
+# orphaned on disk.
+#
+# Anything that gains a foreign key to these models, or otherwise derives
+# from them (like the stats rollups and the change feed), must be handled here
+# too.
+
+FILE_CHUNK_SIZE = 2000
+
+
+def _article_filter(model):
+    return {
+        Journal: 'issue__volume__journal__in',
+        Volume: 'issue__volume__in',
+        Issue: 'issue__in',
+        Article: 'pk__in',
+    }[model]
+
+
+def queue_article_files(articles, chunk_size=FILE_CHUNK_SIZE):
+    """Queue the stored files of ``articles`` for removal, in bounded chunks."""
+    batch = []
+    queued = 0
+    rows = articles.order_by().values_list('file', 'payment_proof')
+    for file, payment_proof in rows.iterator(chunk_size=chunk_size):
+        batch.extend(PendingFileDeletion(path=path) for path in (file, payment_proof) if path)
+        if len(batch) >= chunk_size:
+            PendingFileDeletion.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+    if batch:
+        PendingFileDeletion.objects.bulk_create(batch)
+        queued += len(batch)
+    return queued
+
+
+def _raw_delete(queryset):
+    # Plain DELETE: no collector, no instances, no per-row signals.
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_subtree(queryset):
+    """
+    Delete the Journal/Volume/Issue/Article rows in ``queryset`` and
+    everything below them. Returns ``(rows deleted per model, files queued)``.
+    """
+    model = queryset.model
+    articles = Article.objects.filter(**{_article_filter(model): queryset})
+    levels = [(Article, articles)]
+    if model in (Journal, Volume):
+        lookup = 'volume__journal__in' if model is Journal else 'volume__in'
+        levels.append((Issue, Issue.objects.filter(**{lookup: queryset})))
+    if model is Journal:
+        levels.append((Volume, Volume.objects.filter(journal__in=queryset)))
+    if model is not Article:
+        levels.append((model, queryset))
+
+    deleted = {}
+    with transaction.atomic():
+        queued = queue_article_files(articles)
+        if model is Journal:
+            # Every rollup row of these journals goes, whatever its count.
+            ArticleStatsRollup.objects.filter(journal_id__in=queryset.values('pk')).delete()
+        else:
+            subtract_articles(articles)
+        _raw_delete(ArticleCounter.objects.filter(article__in=articles))
+        for level_model, level_queryset in levels:
+            record_queryset(level_queryset, deleted=True)
+            deleted[level_model._meta.label] = _raw_delete(level_queryset)
+    return deleted, queued
@@ -0,0 +1,151 @@
+import asyncio
+import contextvars
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Max
+
+from .changes import latest_seq
+from .models import Article, Change
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# Article status events
+# -------------------------
+# One StatusEventBus per process fans article status changes out to the open
+# server-sent-event streams. It reads the change feed (home_app.changes) once
+# per SSE_POLL_INTERVAL however many streams are open, so it sees writes made
+# by every process, and an idle stream costs one coroutine and a small queue.
+#
+# Streams are async iterators and need the ASGI entry point
+# (ujoset_backend.asgi); under WSGI each one would pin a worker thread.
+
+DEFAULT_POLL_INTERVAL = 1.0
+POLL_BATCH = 1000
+QUEUE_SIZE = 100
+
+
+def poll_interval():
+    return getattr(settings, 'SSE_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+
+
+def format_event(seq, article_id, slug, status):
+    data = json.dumps({'id': str(article_id), 'slug': slug, 'status': status})
+    return f'id: {seq}\nevent: status\ndata: {data}\n\n'
+
+
+def _statuses(publisher_id):
+    return dict(Article.objects.filter(publisher_id=publisher_id).values_list('pk', 'status'))
+
+
+def _poll(cursor, publisher_ids):
+    """Article changes after ``cursor`` for ``publisher_ids``, and the new cursor."""
+    changes = list(
+        Change.objects.filter(id__gt=cursor).order_by('id').values_list('id', 'model', 'object_id')[:POLL_BATCH]
+    )
+    if not changes:
+        return [], cursor
+    seqs = {object_id: seq for seq, model, object_id in changes if model == 'article'}
+    rows = Article.objects.filter(pk__in=seqs, publisher_id__in=publisher_ids).values_list(
+        'pk', 'publisher_id', 'slug', 'status'
+    )
+    events = sorted((seqs[pk], publisher_id, pk, slug, status) for pk, publisher_id, slug, status in rows)
+    return events, changes[-1][0]
+
+
+def replay(publisher_id, since):
+    """Current status of the publisher's articles changed after ``since``, as SSE events."""
+    seqs = dict(
+        Change.objects.filter(id__gt=since, model='article')
+        .values('object_id').annotate(seq=Max('id')).values_list('object_id', 'seq')
+    )
+    rows = Article.objects.filter(pk__in=seqs, publisher_id=publisher_id).values_list('pk', 'slug', 'status')
+    return [format_event(seqs[pk], pk, slug, status) for pk, slug, status in sorted(rows, key=lambda r: seqs[r[0]])]
+
+
+class Subscription:
+    def __init__(self, publisher_id):
+        self.publisher_id = publisher_id
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The stream ends; the client reconnects with Last-Event-ID and
+            # the missed events are replayed from the change feed.
+            self.overflowed = True
+
+
+class StatusEventBus:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.subscriptions = {}  # publisher_id -> {Subscription}
+        self.statuses = {}  # publisher_id -> {article_id: status last sent}
+        self.cursor = 0
+        self.task = None
+
+    def _ensure_loop(self):
+        # Tests and management commands run each async block on a fresh loop;
+        # anything left from a previous loop is dead.
+        if self.task is not None and self.task.get_loop() is not asyncio.get_running_loop():
+            self.reset()
+
+    async def subscribe(self, publisher_id):
+        self._ensure_loop()
+        subscription = Subscription(publisher_id)
+        first = publisher_id not in self.subscriptions
+        self.subscriptions.setdefault(publisher_id, set()).add(subscription)
+        if self.task is None:
+            # A fresh context, so the poller's database work isn't tied to the
+            # thread (and connection) of whichever request happened to start it.
+            self.task = contextvars.Context().run(asyncio.create_task, self.run())
+        if first:
+            statuses = await sync_to_async(_statuses)(publisher_id)
+            if publisher_id in self.subscriptions:
+                self.statuses[publisher_id] = statuses
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscribers = self.subscriptions.get(subscription.publisher_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self.subscriptions[subscription.publisher_id]
+            self.statuses.pop(subscription.publisher_id, None)
+
+    def dispatch(self, events):
+        for seq, publisher_id, article_id, slug, status in events:
+            statuses = self.statuses.get(publisher_id)
+            if statuses is None or statuses.get(article_id) == status:
+                continue
+            statuses[article_id] = status
+            event = format_event(seq, article_id, slug, status)
+            for subscription in self.subscriptions[publisher_id]:
+                subscription.push(event)
+
+    async def run(self):
+        try:
+            self.cursor = await sync_to_async(latest_seq)()
+            while self.subscriptions:
+                await asyncio.sleep(poll_interval())
+                try:
+                    events, self.cursor = await sync_to_async(_poll)(self.cursor, list(self.subscriptions))
+                except DatabaseError:
+                    logger.exception("Polling the change feed for status events failed")
+                    continue
+                self.dispatch(events)
+        finally:
+            self.task = None
+
+
+bus = StatusEventBus()
@@ -0,0 +1,155 @@
+import csv
+import json
+import re
+
+from .models import Article, ArticleStatus
+from .projections import _datetime, _file_storage
+
+
+# -------------------------
+# Bulk metadata export
+# -------------------------
+# Articles joined with their issue, volume and journal in one values_list()
+# query, read through .iterator() and written out row by row, so an export
+# of the whole database holds one chunk of rows at a time.
+
+CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    'id', 'slug', 'title', 'authors', 'abstract', 'status', 'file', 'created_at', 'updated_at',
+    'issue__number', 'issue__title', 'issue__month',
+    'issue__volume__number', 'issue__volume__year',
+    'issue__volume__journal__name', 'issue__volume__journal__slug', 'issue__volume__journal__issn',
+)
+COLUMNS = (
+    'id', 'slug', 'title', 'authors', 'abstract', 'status', 'file', 'created_at', 'updated_at',
+    'issue_number', 'issue_title', 'issue_month', 'volume_number', 'volume_year',
+    'journal', 'journal_slug', 'issn',
+)
+
+FORMATS = {
+    # format: (content type, file extension)
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'bibtex': ('application/x-bibtex; charset=utf-8', 'bib'),
+    'ris': ('application/x-research-info-systems; charset=utf-8', 'ris'),
+}
+
+
+def export_queryset(journal=None, status=ArticleStatus.PUBLISHED, year=None, updated_since=None):
+    """Articles to export; ``status=None`` exports every status."""
+    articles = Article.objects.all()
+    if journal:
+        articles = articles.filter(journal__slug=journal)
+    if status:
+        articles = articles.filter(status=status)
+    if year:
+        articles = articles.filter(year=year)
+    if updated_since:
+        articles = articles.filter(updated_at__gte=updated_since)
+    return articles.order_by('created_at', 'id')
+
+
+def export_rows(articles, absolute_uri=None, chunk_size=CHUNK_SIZE):
+    """Yield one flat dict (keys: COLUMNS) per article."""
+    rows = articles.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for values in rows:
+        row = dict(zip(COLUMNS, values))
+        row['id'] = str(row['id'])
+        row['created_at'] = _datetime(row['created_at'])
+        row['updated_at'] = _datetime(row['updated_at'])
+        if row['file']:
+            url = _file_storage.url(row['file'])
+            row['file'] = absolute_uri(url) if absolute_uri else url
+        yield row
+
+
+def authors(row):
+    return [name.strip() for name in (row['authors'] or '').split(',') if name.strip()]
+
+
+# -------------------------
+# Writers
+# -------------------------
+# Each takes the export_rows() iterator and yields text chunks.
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def write_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow([row[column] for column in COLUMNS])
+
+
+def write_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+# Backslash-escaping \, ~ and ^ would give a line break (\\) and accent
+# commands (\~, \^) that swallow the next character, so those three get
+# text commands instead.
+BIBTEX_ESCAPES = {
+    '\\': r'\textbackslash{}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    **{char: '\\' + char for char in '{}&%$#_'},
+}
+BIBTEX_SPECIAL = re.compile('|'.join(map(re.escape, BIBTEX_ESCAPES)))
+
+
+def bibtex_escape(value):
+    return BIBTEX_SPECIAL.sub(lambda match: BIBTEX_ESCAPES[match.group()], str(value))
+
+
+def write_bibtex(rows):
+    for row in rows:
+        fields = [
+            ('title', row['title']),
+            ('author', ' and '.join(authors(row))),
+            ('journal', row['journal']),
+            ('year', row['volume_year']),
+            ('volume', row['volume_number']),
+            ('number', row['issue_number']),
+            ('issn', row['issn']),
+            ('abstract', row['abstract']),
+            ('url', row['file']),
+        ]
+        body = ',\n'.join(f'  {name} = {{{bibtex_escape(value)}}}' for name, value in fields if value not in (None, ''))
+        yield f'@article{{{row["slug"]},\n{body}\n}}\n\n'
+
+
+def write_ris(rows):
+    for row in rows:
+        # RIS is line-based: one tag per line, so values are kept to one line.
+        lines = ['TY  - JOUR', 'TI  - ' + ' '.join(row['title'].split())]
+        lines += [f'AU  - {name}' for name in authors(row)]
+        for tag, column in (
+            ('JO', 'journal'), ('PY', 'volume_year'), ('VL', 'volume_number'),
+            ('IS', 'issue_number'), ('SN', 'issn'), ('UR', 'file'),
+        ):
+            if row[column] not in (None, ''):
+                lines.append(f'{tag}  - {row[column]}')
+        if row['abstract']:
+            lines.append('AB  - ' + ' '.join(row['abstract'].split()))
+        lines.append('ER  - ')
+        yield '\n'.join(lines) + '\n\n'
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'bibtex': write_bibtex,
+    'ris': write_ris,
+}
+
+
+def export(format, articles, absolute_uri=None):
+    """Iterator of text chunks for ``articles`` in ``format`` (a FORMATS key)."""
+    return WRITERS[format](export_rows(articles, absolute_uri))
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .changes import record
+from .models import User, Journal, Volume, Issue, Article, ArticleStatus, place_articles
+from .stats import add_articles
+
+
+# -------------------------
+# Back-issue archive import
+# -------------------------
+# `manage.py import_archive` reads a JSONL manifest, one article per line:
+#
+#   {"journal": "Journal of X", "issn": "1234-5678", "volume": 3, "year": 2019,
+#    "issue": 2, "month": 6, "title": "...", "authors": "A, B",
+#    "abstract": "...", "pdf": "2019/3/2/paper.pdf"}
+#
+# Optional keys: journal_slug, issue_title, slug, status (default
+# PUBLISHED) and publisher (an existing user's email).
+#
+# Each batch of lines is one transaction. An article whose slug already exists
+# is skipped, and PDFs are stored under their content hash. A rerun after an
+# interruption therefore picks up where the last committed batch stopped.
+# If a run dies after copying a PDF but before its batch commits, the file is
+# left orphaned; `manage.py gc_media` removes it.
+
+ARCHIVE_DIR = 'articles/archive'
+COPY_BLOCK = 1 << 20
+FILE_MODE = 0o644
+
+
+class ManifestError(ValueError):
+    pass
+
+
+@dataclass
+class Entry:
+    line: int
+    journal: str
+    journal_slug: str
+    issn: str
+    volume: int
+    year: int
+    issue: int
+    issue_title: str
+    month: int
+    slug: str
+    title: str
+    authors: str
+    abstract: str
+    status: str
+    pdf: str
+    publisher: str
+    file: str = None
+
+
+def article_slug(journal_slug, volume, issue, title, pdf):
+    """Deterministic slug, so reruns recognise articles already imported."""
+    natural_key = json.dumps([journal_slug, volume, issue, title, pdf])
+    suffix = hashlib.sha1(natural_key.encode()).hexdigest()[:8]
+    base = slugify(f'{journal_slug}-{volume}-{issue}-{title}')[:41].rstrip('-')
+    return f'{base}-{suffix}'
+
+
+def parse_entry(line_number, line):
+    try:
+        data = json.loads(line)
+        journal = data['journal'].strip()
+        journal_slug = data.get('journal_slug') or slugify(journal)
+        volume, issue = int(data['volume']), int(data['issue'])
+        title = data['title'].strip()
+        status = data.get('status', ArticleStatus.PUBLISHED).upper()
+        if status not in ArticleStatus.values:
+            raise ManifestError(f'unknown status {status!r}')
+        return Entry(
+            line=line_number,
+            journal=journal,
+            journal_slug=journal_slug,
+            issn=data.get('issn') or None,
+            volume=volume,
+            year=int(data['year']),
+            issue=issue,
+            issue_title=data.get('issue_title'),
+            month=int(data['month']) if data.get('month') else None,
+            slug=data.get('slug') or article_slug(journal_slug, volume, issue, title, data.get('pdf')),
+            title=title,
+            authors=data['authors'],
+            abstract=data.get('abstract'),
+            status=status,
+            pdf=data.get('pdf'),
+            publisher=data.get('publisher'),
+        )
+    except ManifestError:
+        raise
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ManifestError(f'{type(e).__name__}: {e}')
+
+
+def read_batches(lines, batch_size):
+    """Yield (entries, errors) per ``batch_size`` manifest lines."""
+    entries, errors = [], []
+    for number, line in enumerate(lines, 1):
+        if line.strip():
+            try:
+                entries.append(parse_entry(number, line))
+            except ManifestError as e:
+                errors.append((number, str(e)))
+        if number % batch_size == 0:
+            yield entries, errors
+            entries, errors = [], []
+    if entries or errors:
+        yield entries, errors
+
+
+def store_pdf(source, media_root):
+    """
+    Copy ``source`` under MEDIA_ROOT, named by its SHA-256, hashing while
+    copying. Runs in a worker process; returns (storage name, bytes, error).
+    """
+    try:
+        digest = hashlib.sha256()
+        directory = os.path.join(media_root, ARCHIVE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        size = 0
+        with open(source, 'rb') as src, tempfile.NamedTemporaryFile(dir=directory, delete=False) as tmp:
+            for block in iter(lambda: src.read(COPY_BLOCK), b''):
+                digest.update(block)
+                tmp.write(block)
+                size += len(block)
+        hexdigest = digest.hexdigest()
+        name = f'{ARCHIVE_DIR}/{hexdigest[:2]}/{hexdigest}.pdf'
+        target = os.path.join(media_root, name)
+        try:
+            # Reusing a stored copy: make it new again, or gc_media (whose
+            # reference set may predate this import) could take it for an old
+            # orphan.
+            os.utime(target)
+            os.remove(tmp.name)
+        except FileNotFoundError:
+            # Temporary files are private (0600); uploads get FILE_UPLOAD_PERMISSIONS' default.
+            os.chmod(tmp.name, FILE_MODE)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp.name, target)
+        return name, size, None
+    except OSError as e:
+        if 'tmp' in locals() and os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        return None, 0, str(e)
+
+
+def store_files(entries, pdf_root, media_root, map=map):
+    """
+    Store the PDF of every entry that names one, setting ``entry.file``.
+    ``map`` is the builtin or a process pool's. Returns (entries whose PDF
+    was stored or which have none, [(line, error)], bytes copied).
+    """
+    with_pdf = [entry for entry in entries if entry.pdf]
+    sources = [os.path.join(pdf_root, entry.pdf) for entry in with_pdf]
+    stored, errors, copied = [entry for entry in entries if not entry.pdf], [], 0
+    for entry, (name, size, error) in zip(with_pdf, map(store_pdf, sources, [media_root] * len(sources))):
+        if error:
+            errors.append((entry.line, error))
+            continue
+        entry.file = name
+        copied += size
+        stored.append(entry)
+    return stored, errors, copied
+
+
+def _get_or_create(queryset, natural_key, keys, build):
+    """
+    Map each natural key in ``keys`` to a pk, inserting the missing rows with
+    one bulk_create. Returns (mapping, pks of the rows inserted).
+    """
+    existing = {natural_key(row): row.pk for row in queryset}
+    missing = [build(key) for key in keys if key not in existing]
+    if not missing:
+        return existing, []
+    # Rows created concurrently (or clashing on another unique column) are
+    # skipped here and picked up, or found missing, by the re-read.
+    queryset.model.objects.bulk_create(missing, ignore_conflicts=True)
+    existing = {natural_key(row): row.pk for row in queryset.all()}
+    return existing, [row.pk for row in missing if existing.get(natural_key(row)) == row.pk]
+
+
+def write_batch(entries, default_publisher_id):
+    """
+    Insert one batch of entries (PDFs already stored) in a single transaction.
+    Returns (articles created, entries whose journal could not be created).
+    """
+    with transaction.atomic():
+        by_journal = {entry.journal_slug: entry for entry in entries}
+        journals, new_journals = _get_or_create(
+            Journal.objects.filter(slug__in=by_journal),
+            lambda row: row.slug,
+            by_journal,
+            lambda slug: Journal(slug=slug, name=by_journal[slug].journal, issn=by_journal[slug].issn),
+        )
+        rejected = [entry for entry in entries if entry.journal_slug not in journals]
+        entries = [entry for entry in entries if entry.journal_slug in journals]
+
+        by_volume = {(journals[entry.journal_slug], entry.volume): entry for entry in entries}
+        volumes, new_volumes = _get_or_create(
+            Volume.objects.filter(journal_id__in=journals.values(), number__in={key[1] for key in by_volume}),
+            lambda row: (row.journal_id, row.number),
+            by_volume,
+            lambda key: Volume(journal_id=key[0], number=key[1], year=by_volume[key].year),
+        )
+
+        def issue_key(entry):
+            return volumes[(journals[entry.journal_slug], entry.volume)], entry.issue
+
+        by_issue = {issue_key(entry): entry for entry in entries}
+        issues, new_issues = _get_or_create(
+            Issue.objects.filter(volume_id__in=volumes.values(), number__in={key[1] for key in by_issue}),
+            lambda row: (row.volume_id, row.number),
+            by_issue,
+            lambda key: Issue(
+                volume_id=key[0], number=key[1], title=by_issue[key].issue_title, month=by_issue[key].month,
+            ),
+        )
+
+        emails = {entry.publisher for entry in entries if entry.publisher}
+        publishers = dict(User.objects.filter(email__in=emails).values_list('email', 'pk'))
+        articles = Article.objects.bulk_create([
+            Article(
+                slug=entry.slug,
+                title=entry.title,
+                authors=entry.authors,
+                abstract=entry.abstract,
+                status=entry.status,
+                file=entry.file,
+                issue_id=issues[issue_key(entry)],
+                publisher_id=publishers.get(entry.publisher, default_publisher_id),
+            )
+            for entry in entries
+        ])
+        article_ids = [article.pk for article in articles]
+        # The volume may predate the manifest with another year than its lines.
+        place_articles(Article.objects.filter(pk__in=article_ids))
+
+        # bulk_create skips the receivers behind the change feed and the rollups.
+        record('journal', new_journals)
+        record('volume', new_volumes)
+        record('issue', new_issues)
+        record('article', article_ids)
+        add_articles(Article.objects.filter(pk__in=article_ids))
+    return articles, rejected
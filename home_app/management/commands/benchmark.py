@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from home_app.bench import SUITES, run_suite
+
+
+class Command(BaseCommand):
+    help = "Seed a throwaway dataset, run a benchmark suite against it and roll the seed back."
+
+    def add_arguments(self, parser):
+        parser.add_argument('suite', choices=sorted(SUITES))
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--journals', type=int, default=2)
+        parser.add_argument('--volumes', type=int, default=3)
+        parser.add_argument('--issues', type=int, default=4)
+        parser.add_argument('--articles', type=int, default=25, help="Articles per issue.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = run_suite(
+                options['suite'],
+                repeat=options['repeat'],
+                journals=options['journals'],
+                volumes=options['volumes'],
+                issues=options['issues'],
+                articles=options['articles'],
+                prefix='bench',
+            )
+            transaction.set_rollback(True)
+
+        baselines = {}
+        for group, label, seconds, info in rows:
+            baseline = baselines.setdefault(group, seconds)
+            speedup = f'x{baseline / seconds:.2f}' if seconds else ''
+            self.stdout.write(f'{group:<12} {label:<28} {seconds * 1000:>10.3f} ms  {speedup:>7}  {info}')
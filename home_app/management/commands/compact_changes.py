@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home_app.changes import compact
+
+
+class Command(BaseCommand):
+    help = "Drop change-feed entries superseded by a later change to the same row."
+
+    def handle(self, *args, **options):
+        removed = compact()
+        self.stdout.write(f"{removed} superseded change(s) removed.")
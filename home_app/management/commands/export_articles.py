@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home_app.export import FORMATS, export, export_queryset
+from home_app.models import ArticleStatus
+
+
+class Command(BaseCommand):
+    help = "Stream article metadata as CSV, JSONL, BibTeX or RIS to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', help="File to write (default: stdout).")
+        parser.add_argument('--journal', help="Journal slug.")
+        parser.add_argument(
+            '--status', default=ArticleStatus.PUBLISHED,
+            help="Article status, or 'all' (default: PUBLISHED).",
+        )
+        parser.add_argument('--year', type=int, help="Volume year.")
+        parser.add_argument('--base-url', default='', help="Prefix for file URLs, e.g. https://ujoset.com.ng")
+
+    def handle(self, *args, **options):
+        status = options['status'].upper()
+        if status != 'ALL' and status not in ArticleStatus.values:
+            raise CommandError(f"Unknown status {options['status']!r}.")
+        articles = export_queryset(
+            journal=options['journal'], status=None if status == 'ALL' else status, year=options['year'],
+        )
+        base_url = options['base_url'].rstrip('/')
+        chunks = export(options['format'], articles, (lambda url: base_url + url) if base_url else None)
+
+        output = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if output is not sys.stdout:
+                output.close()
@@ -0,0 +1,124 @@
+import hashlib
+import heapq
+import os
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home_app.models import Article
+
+
+def path_digest(path):
+    """64-bit fingerprint of a storage path, to keep the reference set at 8 bytes per entry."""
+    return int.from_bytes(hashlib.blake2b(path.encode(), digest_size=8).digest(), 'big')
+
+
+def sort_digests(digests, run_size=100000):
+    """
+    ``digests`` sorted into a new array without building a list of them:
+    runs of ``run_size`` are sorted in place, then merged. Takes 16 bytes
+    per entry while merging, plus one run as Python ints.
+    """
+    for start in range(0, len(digests), run_size):
+        digests[start:start + run_size] = array('Q', sorted(digests[start:start + run_size]))
+    view = memoryview(digests)
+    runs = [view[start:start + run_size] for start in range(0, len(digests), run_size)]
+    return array('Q', heapq.merge(*runs))
+
+
+def referenced_digests(chunk_size=5000):
+    """
+    Sorted array of the fingerprints of every path an Article references.
+
+    A fingerprint collision can only make an orphan look referenced, so the
+    worst case is a file that isn't collected, never one deleted by mistake.
+    """
+    digests = array('Q')
+    rows = Article.objects.order_by().values_list('file', 'payment_proof')
+    for file, payment_proof in rows.iterator(chunk_size=chunk_size):
+        if file:
+            digests.append(path_digest(file))
+        if payment_proof:
+            digests.append(path_digest(payment_proof))
+    return sort_digests(digests)
+
+
+def contains(digests, digest):
+    i = bisect_left(digests, digest)
+    return i < len(digests) and digests[i] == digest
+
+
+def walk_files(root):
+    """Yield DirEntry objects for every file under ``root`` without building lists."""
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+class Command(BaseCommand):
+    help = "Delete files under MEDIA_ROOT that no Article references any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be deleted.")
+        parser.add_argument(
+            '--min-age', type=float, default=24,
+            help="Only collect files older than this many hours (protects uploads in flight).",
+        )
+        parser.add_argument(
+            '--rate-limit', type=float, default=0,
+            help="Maximum deletions per second (0 = unlimited).",
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        # Started before the reference query: anything written after that is
+        # younger than the cutoff whenever min-age > 0.
+        cutoff = time.time() - options['min_age'] * 3600
+        digests = referenced_digests(options['chunk_size'])
+        interval = 1 / options['rate_limit'] if options['rate_limit'] else 0
+        directories = {
+            field.upload_to.strip('/')
+            for field in (Article._meta.get_field('file'), Article._meta.get_field('payment_proof'))
+        }
+
+        scanned = orphaned = freed = 0
+        next_delete = time.monotonic()
+        for directory in sorted(directories):
+            for entry in walk_files(os.path.join(media_root, directory)):
+                scanned += 1
+                name = os.path.relpath(entry.path, media_root).replace(os.sep, '/')
+                if contains(digests, path_digest(name)):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > cutoff:
+                    continue
+
+                orphaned += 1
+                freed += stat.st_size
+                if options['dry_run']:
+                    self.stdout.write(f'would delete {name}')
+                    continue
+                if interval:
+                    time.sleep(max(0, next_delete - time.monotonic()))
+                    next_delete = time.monotonic() + interval
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+        verb = "would be deleted" if options['dry_run'] else "deleted"
+        self.stdout.write(
+            f"{scanned} file(s) scanned, {len(digests)} reference(s), "
+            f"{orphaned} orphan(s) {verb} ({freed} bytes)."
+        )
@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from home_app.importing import read_batches, store_files, write_batch
+from home_app.models import Article, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Import back issues from a JSONL manifest (see home_app.importing): "
+        "PDFs are hashed and copied in a process pool, rows are bulk-inserted "
+        "one transaction per batch. Rerunning skips what is already imported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', help="JSONL manifest, one article per line.")
+        parser.add_argument('--pdf-root', help="Directory manifest 'pdf' paths are relative to (default: the manifest's).")
+        parser.add_argument('--publisher', required=True, help="Email of the user imported articles belong to.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help="Processes hashing and copying PDFs; 0 copies in this process.",
+        )
+
+    def handle(self, *args, **options):
+        publisher_id = User.objects.filter(email=options['publisher']).values_list('pk', flat=True).first()
+        if publisher_id is None:
+            raise CommandError(f"No user with email {options['publisher']!r}.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        pdf_root = options['pdf_root'] or os.path.dirname(os.path.abspath(options['manifest']))
+
+        pool = ProcessPoolExecutor(options['workers']) if options['workers'] > 0 else None
+        totals = {'imported': 0, 'skipped': 0, 'errors': 0, 'bytes': 0}
+        started = time.perf_counter()
+        try:
+            with open(options['manifest'], encoding='utf-8') as manifest:
+                for number, (entries, errors) in enumerate(read_batches(manifest, options['batch_size']), 1):
+                    batch_started = time.perf_counter()
+                    imported, skipped, errors, copied = self.import_batch(entries, errors, pdf_root, publisher_id, pool)
+                    for line, error in errors:
+                        self.stderr.write(f"line {line}: {error}")
+                    totals['imported'] += imported
+                    totals['skipped'] += skipped
+                    totals['errors'] += len(errors)
+                    totals['bytes'] += copied
+                    elapsed = time.perf_counter() - batch_started
+                    self.stdout.write(
+                        f"batch {number}: {imported} imported, {skipped} already present, {len(errors)} error(s), "
+                        f"{imported / elapsed:.0f} articles/s, {copied / elapsed / 2**20:.1f} MiB/s"
+                    )
+        finally:
+            if pool:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['imported']} article(s) imported, {totals['skipped']} already present, "
+            f"{totals['errors']} error(s) in {elapsed:.1f} s "
+            f"({totals['imported'] / elapsed:.0f} articles/s, {totals['bytes'] / elapsed / 2**20:.1f} MiB/s)"
+        ))
+
+    def import_batch(self, entries, errors, pdf_root, publisher_id, pool):
+        # Slugs already in the database (or earlier in the batch) are skipped,
+        # which is what makes rerunning an interrupted import safe.
+        total, unique = len(entries), {}
+        for entry in entries:
+            unique.setdefault(entry.slug, entry)
+        present = set(Article.objects.filter(slug__in=unique).values_list('slug', flat=True))
+        entries = [entry for slug, entry in unique.items() if slug not in present]
+        skipped = total - len(entries)
+
+        entries, file_errors, copied = store_files(
+            entries, pdf_root, settings.MEDIA_ROOT, map=pool.map if pool else map,
+        )
+        articles, rejected = write_batch(entries, publisher_id) if entries else ([], [])
+        errors = errors + file_errors + [
+            (entry.line, f"journal {entry.journal!r} clashes with an existing journal's name or ISSN")
+            for entry in rejected
+        ]
+        return len(articles), skipped, sorted(errors), copied
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from home_app.tokens import PRUNE_BATCH, prune_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired JWT outstanding tokens and their blacklist entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help="Seconds to sleep between batches, to leave room for other writers.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_expired(options['batch_size'], options['pause'])
+        self.stdout.write(f"{deleted} expired token(s) removed.")
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home_app.snapshots import Snapshot, snapshot_root
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the public JSON of journals, issues and published articles to "
+        "static files (with .gz/.br variants) for the front proxy to serve. "
+        "After the first run only files affected by changes since are rewritten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', help="Output directory (default: STATIC_SNAPSHOT_ROOT).")
+        parser.add_argument(
+            '--base-url', default=getattr(settings, 'STATIC_SNAPSHOT_BASE_URL', ''),
+            help="Prefix for file URLs, e.g. https://ujoset.com.ng (default: STATIC_SNAPSHOT_BASE_URL).",
+        )
+        parser.add_argument('--full', action='store_true', help="Render everything, not just what changed.")
+        parser.add_argument(
+            '--watch', type=float, metavar='SECONDS',
+            help="Keep running, applying changes every SECONDS.",
+        )
+
+    def handle(self, *args, **options):
+        root = options['root'] or snapshot_root()
+        self.publish(root, options['base_url'], options['full'])
+        while options['watch']:
+            time.sleep(options['watch'])
+            self.publish(root, options['base_url'], False, quiet=True)
+
+    def publish(self, root, base_url, full, quiet=False):
+        started = time.perf_counter()
+        snapshot = Snapshot(root, base_url)
+        if full or not snapshot.incremental():
+            full = True
+            snapshot.full()
+        if quiet and not (snapshot.written or snapshot.removed):
+            return
+        self.stdout.write(
+            f"{'Full' if full else 'Incremental'} snapshot up to change #{snapshot.seq}: "
+            f"{snapshot.written} file(s) written, {snapshot.removed} removed "
+            f"in {time.perf_counter() - started:.2f} s"
+        )
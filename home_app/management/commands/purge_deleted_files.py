@@ -0,0 +1,36 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from home_app.models import Article, PendingFileDeletion
+
+
+class Command(BaseCommand):
+    help = "Remove files queued by bulk deletes from storage, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        removed = kept = 0
+        while True:
+            batch = list(
+                PendingFileDeletion.objects.order_by('id').values_list('id', 'path')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            paths = {path for _, path in batch}
+            # A new upload may have been given the same name since.
+            in_use = set()
+            referencing = Article.objects.filter(Q(file__in=paths) | Q(payment_proof__in=paths))
+            for file, payment_proof in referencing.values_list('file', 'payment_proof'):
+                in_use.update((file, payment_proof))
+            for path in paths:
+                if path in in_use:
+                    kept += 1
+                else:
+                    default_storage.delete(path)
+                    removed += 1
+            PendingFileDeletion.objects.filter(id__in=[pk for pk, _ in batch]).delete()
+
+        self.stdout.write(f"{removed} file(s) removed, {kept} still referenced.")
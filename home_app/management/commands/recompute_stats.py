@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from home_app.models import ArticleStatsRollup
+from home_app.stats import recompute
+
+
+class Command(BaseCommand):
+    help = "Rebuild the article statistics rollups from the article table."
+
+    def handle(self, *args, **options):
+        recompute()
+        self.stdout.write(f"{ArticleStatsRollup.objects.count()} rollup row(s) rebuilt.")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home_app.review_queue import release_expired_leases
+
+
+class Command(BaseCommand):
+    help = "Return articles whose review lease expired to the SUBMITTED queue."
+
+    def handle(self, *args, **options):
+        released = release_expired_leases()
+        self.stdout.write(f"{released} expired lease(s) released.")
@@ -0,0 +1,140 @@
+import asyncio
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, transaction
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from home_app.changes import record_queryset
+from home_app.events import bus
+from home_app.models import Article, ArticleStatus
+from home_app.seeding import seed_dataset
+from home_app.stats import bulk_status_update
+
+
+class Stream:
+    """One event-stream request driven straight through the ASGI application."""
+
+    def __init__(self, app, path, query):
+        self.chunks = asyncio.Queue()
+        self.closed = asyncio.Event()
+        self.scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': urlencode(query).encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'accept', b'text/event-stream')],
+            'client': ('127.0.0.1', 50000),
+            'server': ('localhost', 80),
+        }
+        self.requested = False
+        self.task = asyncio.create_task(app(self.scope, self.receive, self.send))
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.closed.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.body' and message.get('body'):
+            self.chunks.put_nowait(message['body'])
+
+    async def wait_for(self, marker):
+        while marker not in await self.chunks.get():
+            pass
+
+    async def close(self):
+        self.closed.set()
+        await self.task
+
+
+class Command(BaseCommand):
+    help = (
+        "Open many article-status event streams in-process through the ASGI "
+        "application, then measure memory per idle stream and how long a "
+        "status change takes to reach all of them. The seed is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=1000)
+        parser.add_argument('--publishers', type=int, default=20)
+        parser.add_argument('--poll-interval', type=float, default=0.1)
+
+    def handle(self, *args, **options):
+        # Like Django's test client: keep the one connection (and its
+        # transaction) open across the in-process requests.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with override_settings(
+                SSE_POLL_INTERVAL=options['poll_interval'], ALLOWED_HOSTS=['localhost'], DEBUG=False,
+            ), transaction.atomic():
+                report = async_to_sync(self.run)(options['connections'], options['publishers'])
+                transaction.set_rollback(True)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        for line in report:
+            self.stdout.write(line)
+
+    async def run(self, connections, publishers):
+        from ujoset_backend.asgi import application
+
+        data = await sync_to_async(seed_dataset)(
+            journals=1, volumes=1, issues=1, articles=publishers * 2, publishers=publishers, prefix='sse'
+        )
+        tokens = [str(AccessToken.for_user(user)) for user in data['users']]
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        streams = [
+            Stream(application, '/api/events/article-status/', {'token': tokens[i % publishers]})
+            for i in range(connections)
+        ]
+        await asyncio.gather(*(stream.wait_for(b'retry:') for stream in streams))
+        opened = time.perf_counter() - started
+        per_stream = (tracemalloc.get_traced_memory()[0] - before) / connections
+        tracemalloc.stop()
+
+        # One article per publisher moves to APPROVED in a single set-based write.
+        targets = Article.objects.filter(
+            pk__in=[article.pk for article in data['articles'][:publishers]]
+        ).exclude(status=ArticleStatus.APPROVED)
+
+        def approve():
+            with transaction.atomic():
+                record_queryset(targets)
+                bulk_status_update(targets, ArticleStatus.APPROVED)
+
+        changed = await sync_to_async(targets.count)()
+        started = time.perf_counter()
+        await sync_to_async(approve)()
+        receiving = [
+            stream for i, stream in enumerate(streams)
+            if data['articles'][i % publishers].status != ArticleStatus.APPROVED
+        ]
+        await asyncio.gather(*(stream.wait_for(b'event: status') for stream in receiving))
+        delivered = time.perf_counter() - started
+
+        await asyncio.gather(*(stream.close() for stream in streams))
+        return [
+            f"{connections} stream(s) for {publishers} publisher(s) opened in {opened:.2f} s",
+            f"~{per_stream / 1024:.1f} KiB traced per idle stream",
+            f"{changed} status change(s) reached {len(receiving)} stream(s) in {delivered * 1000:.0f} ms "
+            f"(poll interval {settings.SSE_POLL_INTERVAL * 1000:.0f} ms)",
+            f"{len(bus.subscriptions)} publisher(s) still subscribed after close",
+        ]
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from home_app.startup import SETUP_SNIPPET, URLCONF_SNIPPET, profile_startup
+
+
+class Command(BaseCommand):
+    help = "Report cold-start import time per module (or per top-level package)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25)
+        parser.add_argument(
+            '--by-package', action='store_true',
+            help="Sum self time per top-level package instead of listing modules.",
+        )
+        parser.add_argument(
+            '--urls', action='store_true',
+            help="Also import the URLconf, i.e. what a web worker pays before its first request.",
+        )
+
+    def handle(self, *args, **options):
+        snippet = URLCONF_SNIPPET if options['urls'] else SETUP_SNIPPET
+        wall = profile_startup(snippet, importtime=False).seconds
+        profile = profile_startup(snippet)
+
+        if options['by_package']:
+            totals = defaultdict(int)
+            for record in profile.imports:
+                totals[record.module.split('.')[0]] += record.self_us
+            rows = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+            self.stdout.write(f"{'self ms':>10}  package")
+            for package, self_us in rows[:options['limit']]:
+                self.stdout.write(f'{self_us / 1000:>10.1f}  {package}')
+        else:
+            rows = sorted(profile.imports, key=lambda record: record.cumulative_us, reverse=True)
+            self.stdout.write(f"{'cumul ms':>10} {'self ms':>9}  module")
+            for record in rows[:options['limit']]:
+                self.stdout.write(
+                    f'{record.cumulative_us / 1000:>10.1f} {record.self_us / 1000:>9.1f}  {record.module}'
+                )
+
+        self.stdout.write(f'\n{len(profile.modules)} modules loaded, cold start {wall * 1000:.0f} ms')
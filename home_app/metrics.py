@@ -0,0 +1,174 @@
+import json
+import os
+import time
+from contextvars import ContextVar
+
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.db.models import Sum
+from django.dispatch import receiver
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+
+# -------------------------
+# Prometheus metrics
+# -------------------------
+# Collected in process with prometheus_client and served at /metrics
+# (MetricsView) in the Prometheus text format.
+#
+# Under a multi-process server, set PROMETHEUS_MULTIPROC_DIR to a directory
+# shared by the workers and emptied before they start. Each worker then
+# writes its samples to its own mmap'ed files there, and a scrape sums the
+# files of all workers. A server that replaces workers should call
+# prometheus_client.multiprocess.mark_process_dead(pid) for each exiting one
+# (gunicorn: child_exit hook), or its live gauges stay in the sum.
+#
+# Per-request work is kept off the shared metrics: database queries are
+# tallied in a per-request context variable and recorded once when the
+# response is ready. The queue depths are read from the database at scrape
+# time, with a few cheap queries.
+
+UNMATCHED = '<unmatched>'  # WhiteNoise files, 404s
+
+REQUEST_LATENCY = Histogram(
+    'ujoset_http_request_duration_seconds',
+    'Time to the response (to its start, for streaming responses), per route.',
+    ['route', 'method'],
+)
+RESPONSES = Counter('ujoset_http_responses', 'Responses per route and status code.', ['route', 'method', 'status'])
+DB_QUERIES = Histogram(
+    'ujoset_db_queries_per_request',
+    'Database queries run while building each response, per route.',
+    ['route'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_QUERY_SECONDS = Counter('ujoset_db_query_seconds', 'Time spent in database queries, per route.', ['route'])
+CACHE_LOOKUPS = Counter('ujoset_cache_lookups', 'Cache lookups by cache and result (hit, stale, miss).', ['cache', 'result'])
+UPLOAD_BYTES = Counter('ujoset_upload_bytes', 'Bytes of uploaded files, per route.', ['route'])
+LOGINS = Counter('ujoset_logins', 'Login attempts by flow (api, session) and outcome.', ['flow', 'outcome'])
+UNFLUSHED_COUNTERS = Gauge(
+    'ujoset_unflushed_article_counters',
+    'Articles with buffered view/download hits not yet written (home_app.counters).',
+    multiprocess_mode='livesum',
+)
+
+
+# -------------------------
+# Requests and queries
+# -------------------------
+_tally = ContextVar('metrics_tally', default=None)  # [queries, seconds] of the current request
+
+
+def _count_query(execute, sql, params, many, context):
+    tally = _tally.get()
+    if tally is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        tally[0] += 1
+        tally[1] += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+for _connection in connections.all(initialized_only=True):
+    instrument_connection(None, _connection)
+
+
+def request_started():
+    """Start tallying the queries of a request; pass the result to request_finished()."""
+    return _tally.set([0, 0.0]), time.perf_counter()
+
+
+def request_finished(request, response, started):
+    token, start = started
+    seconds = time.perf_counter() - start
+    queries, query_seconds = _tally.get()
+    _tally.reset(token)
+
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match else UNMATCHED
+    REQUEST_LATENCY.labels(route, request.method).observe(seconds)
+    RESPONSES.labels(route, request.method, str(response.status_code)).inc()
+    DB_QUERIES.labels(route).observe(queries)
+    if query_seconds:
+        DB_QUERY_SECONDS.labels(route).inc(query_seconds)
+    # Only set once something (the view, DRF's parser) read the upload.
+    files = request.__dict__.get('_files')
+    if files:
+        UPLOAD_BYTES.labels(route).inc(sum(f.size for _, uploads in files.lists() for f in uploads))
+
+
+# -------------------------
+# Logins
+# -------------------------
+# LoginView counts its own successes: it issues JWTs without calling login().
+
+@receiver(user_logged_in)
+def session_login(sender, request, user, **kwargs):
+    LOGINS.labels('session', 'success').inc()
+
+
+@receiver(user_login_failed)
+def login_failed(sender, credentials, request=None, **kwargs):
+    flow = 'api' if request is not None and request.path.startswith('/api/') else 'session'
+    LOGINS.labels(flow, 'failure').inc()
+
+
+# -------------------------
+# Queue depths
+# -------------------------
+class QueueCollector:
+    """Backlogs of the background jobs, read at scrape time."""
+
+    def collect(self):
+        try:
+            return list(self.depths())
+        except DatabaseError:
+            # Still serve the process metrics while the database is down.
+            return []
+
+    def depths(self):
+        from .changes import latest_seq
+        from .models import ArticleStatsRollup, ArticleStatus, PendingFileDeletion
+        from .snapshots import MANIFEST, snapshot_root
+
+        yield GaugeMetricFamily(
+            'ujoset_pending_file_deletions', 'Files queued for `manage.py purge_deleted_files`.',
+            value=PendingFileDeletion.objects.count(),
+        )
+        submitted = ArticleStatsRollup.objects.filter(status=ArticleStatus.SUBMITTED).aggregate(n=Sum('count'))['n']
+        yield GaugeMetricFamily(
+            'ujoset_review_queue_depth', 'Submitted articles waiting for a reviewer.', value=submitted or 0,
+        )
+        try:
+            with open(os.path.join(snapshot_root(), MANIFEST)) as f:
+                published = json.load(f)['seq']
+        except (OSError, ValueError, KeyError):
+            return
+        yield GaugeMetricFamily(
+            'ujoset_snapshot_lag', 'Change-feed sequence numbers not yet in the static snapshot (publish_static).',
+            value=latest_seq() - published,
+        )
+
+
+_queues = CollectorRegistry()
+_queues.register(QueueCollector())
+
+
+def render():
+    """The metrics of this process, or of all workers in multiprocess mode, as text."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_queues)
@@ -0,0 +1,103 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, csrf
+
+from . import metrics
+
+
+# -------------------------
+# Browser-only middleware
+# -------------------------
+# The API authenticates with JWTs (JWTAuthentication) and never reads the
+# session, the messages or request.user as set by AuthenticationMiddleware;
+# its views are CSRF-exempt and return JSON, which is never framed. Yet the
+# stock stack loads (and, when touched, saves) the session of every request
+# that carries a session cookie, and runs CSRF, messages and clickjacking
+# around every /api/ view.
+#
+# These subclasses of that browser-only middleware pass requests whose path
+# starts with one of LEAN_MIDDLEWARE_PREFIXES straight to the next layer. All
+# other requests (the admin, the social-auth flow, the frontend) get the
+# stock behaviour. Being subclasses, they still satisfy the admin's checks
+# for the middleware it depends on.
+
+DEFAULT_LEAN_PREFIXES = ('/api/',)
+
+
+def lean_prefixes():
+    return tuple(getattr(settings, 'LEAN_MIDDLEWARE_PREFIXES', DEFAULT_LEAN_PREFIXES))
+
+
+class BrowserOnlyMixin:
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.lean_prefixes = lean_prefixes()
+
+    def is_lean(self, request):
+        return request.path_info.startswith(self.lean_prefixes)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            # In async mode this is the next layer's coroutine, awaited by
+            # the handler like our own would be.
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(BrowserOnlyMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(BrowserOnlyMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # Registered with the handler separately from __call__.
+        if self.is_lean(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(BrowserOnlyMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(BrowserOnlyMixin, messages.MessageMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(BrowserOnlyMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
+
+
+# -------------------------
+# Request metrics
+# -------------------------
+class MetricsMiddleware:
+    """
+    Latency, status, query and upload metrics of every request (see
+    home_app.metrics). Goes first in MIDDLEWARE so the whole stack is timed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = metrics.request_started()
+        response = self.get_response(request)
+        metrics.request_finished(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = metrics.request_started()
+        response = await self.get_response(request)
+        metrics.request_finished(request, response, started)
+        return response
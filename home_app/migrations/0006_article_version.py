@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0005_pendingfiledeletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-19 05:10
+
+import uuid
+
+from django.db import migrations, models
+from django.db.models import Count
+
+NO_JOURNAL = uuid.UUID(int=0)
+
+
+def backfill(apps, schema_editor):
+    # Same rows as home_app.stats.recompute(), on the historical models.
+    Article = apps.get_model('home_app', 'Article')
+    ArticleStatsRollup = apps.get_model('home_app', 'ArticleStatsRollup')
+    groups = Article.objects.order_by().values(
+        'issue__volume__journal_id', 'issue__volume__year', 'issue__month', 'status',
+    ).annotate(n=Count('pk'))
+    ArticleStatsRollup.objects.bulk_create(
+        ArticleStatsRollup(
+            journal_id=row['issue__volume__journal_id'] or NO_JOURNAL,
+            year=row['issue__volume__year'] or 0,
+            month=row['issue__month'] or 0,
+            status=row['status'],
+            count=row['n'],
+        )
+        for row in groups.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0007_review_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('journal_id', models.UUIDField()),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('UNDER_REVIEW', 'Under Review'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('PUBLISHED', 'Published')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('journal_id', 'year', 'month', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-19 05:14
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Existing rows enter the feed as upserts, parents first, so a client
+    # syncing from the start of the feed sees everything.
+    Change = apps.get_model('home_app', 'Change')
+    for name in ('journal', 'volume', 'issue', 'article'):
+        rows = apps.get_model('home_app', name).objects.order_by('created_at').values_list('pk', flat=True)
+        batch = []
+        for pk in rows.iterator(chunk_size=2000):
+            batch.append(Change(model=name, object_id=pk))
+            if len(batch) >= 2000:
+                Change.objects.bulk_create(batch)
+                batch = []
+        Change.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0008_article_stats_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=16)),
+                ('object_id', models.UUIDField()),
+                ('deleted', models.BooleanField(default=False)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'object_id', 'id'], name='change_object_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
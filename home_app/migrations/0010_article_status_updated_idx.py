@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0009_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', 'updated_at', 'id'], name='article_status_updated_idx'),
+        ),
+    ]
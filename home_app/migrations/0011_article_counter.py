@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0010_article_status_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleCounter',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counter', serialize=False, to='home_app.article')),
+                ('views', models.PositiveBigIntegerField(default=0)),
+                ('downloads', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-views', 'article'], name='counter_views_idx'), models.Index(fields=['-downloads', 'article'], name='counter_downloads_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-19 06:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill(apps, schema_editor):
+    # Same UPDATE as home_app.models.place_articles(), on the historical models.
+    Article = apps.get_model('home_app', 'Article')
+    Volume = apps.get_model('home_app', 'Volume')
+    volume = Volume.objects.filter(issues=OuterRef('issue_id'))
+    Article.objects.filter(issue__isnull=False).update(
+        journal_id=Subquery(volume.values('journal_id')[:1]),
+        year=Subquery(volume.values('year')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_app', '0011_article_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='journal',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='home_app.journal'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='year',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['journal', 'status', 'created_at', 'id'], name='article_journal_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['journal', 'year', 'status', 'created_at', 'id'], name='article_journal_year_idx'),
+        ),
+    ]
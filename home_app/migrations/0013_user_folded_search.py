@@ -0,0 +1,51 @@
+# Generated by Django 5.2.3 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # What User.fold() computes, on the historical model.
+    User = apps.get_model('home_app', 'User')
+    users = User.objects.only('name', 'email')
+    for user in users.iterator(chunk_size=1000):
+        User.objects.filter(pk=user.pk).update(
+            name_folded=(user.name or '').casefold(), email_folded=(user.email or '').casefold(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('home_app', '0012_article_journal_year'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_email_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_name_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_folded',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='name_folded',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email_folded'], name='user_email_folded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['name_folded'], name='user_name_folded_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.utils.text import slugify
 import uuid
@@ -21,6 +22,53 @@ class ArticleStatus(models.TextChoices):
     PUBLISHED = "PUBLISHED", "Published"
 
 
+# Allowed Article.status moves. Writers check against the status they read
+# and make the UPDATE conditional on Article.version, so a transition can't
+# be applied to a row someone else has moved in the meantime.
+ARTICLE_TRANSITIONS = {
+    ArticleStatus.DRAFT: {ArticleStatus.SUBMITTED},
+    ArticleStatus.SUBMITTED: {ArticleStatus.UNDER_REVIEW, ArticleStatus.REJECTED, ArticleStatus.DRAFT},
+    ArticleStatus.UNDER_REVIEW: {ArticleStatus.APPROVED, ArticleStatus.REJECTED, ArticleStatus.SUBMITTED},
+    ArticleStatus.APPROVED: {ArticleStatus.PUBLISHED},
+    ArticleStatus.REJECTED: {ArticleStatus.DRAFT},
+    ArticleStatus.PUBLISHED: set(),
+}
+
+
+def transition_sources(target):
+    """Statuses an article may move to ``target`` from."""
+    return [source for source, targets in ARTICLE_TRANSITIONS.items() if target in targets]
+
+
+class InvalidTransition(ValueError):
+    pass
+
+
+class StaleVersion(Exception):
+    """The row was changed by another writer since it was read."""
+
+
+class LoadedValuesMixin:
+    """
+    Remembers ``tracked_fields`` as loaded from the database, so a save can
+    tell what actually changed (used to keep the stats rollups current).
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.reset_loaded_values()
+        return instance
+
+    def reset_loaded_values(self):
+        self._loaded_values = {name: self.__dict__.get(name) for name in self.tracked_fields}
+
+    def loaded_values(self):
+        """Tracked values as last loaded or saved; None for a new instance."""
+        return getattr(self, '_loaded_values', None)
+
+
 # -------------------------
 # Custom User Manager
 # -------------------------
@@ -62,14 +110,43 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
+    # Case-folded copies of name and email for the directory's prefix search,
+    # written by save(). Folding in the database instead would depend on the
+    # backend: SQLite's LOWER() only folds ASCII.
+    name_folded = models.TextField(blank=True, default='', editable=False)
+    email_folded = models.TextField(blank=True, default='', editable=False)
+
     objects = UserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    class Meta:
+        indexes = [
+            # User directory: filter by role or institution, keyset-paginate by email.
+            models.Index(fields=['role', 'email'], name='user_role_email_idx'),
+            models.Index(fields=['Institution', 'email'], name='user_institution_email_idx'),
+            # Case-insensitive prefix search (range scans on the folded copies).
+            models.Index(fields=['email_folded'], name='user_email_folded_idx'),
+            models.Index(fields=['name_folded'], name='user_name_folded_idx'),
+        ]
+
     def __str__(self):
         return self.email or "Unnamed User"
 
+    def fold(self):
+        """Refresh name_folded and email_folded; bulk_create() callers must call it themselves."""
+        self.name_folded = (self.name or '').casefold()
+        self.email_folded = (self.email or '').casefold()
+        return self
+
+    def save(self, *args, **kwargs):
+        self.fold()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'name', 'email'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'name_folded', 'email_folded'}
+        super().save(*args, **kwargs)
+
 
 # -------------------------
 # Journal
@@ -95,7 +172,9 @@ class Journal(models.Model):
 # -------------------------
 # Volume
 # -------------------------
-class Volume(models.Model):
+class Volume(LoadedValuesMixin, models.Model):
+    tracked_fields = ('journal_id', 'year')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     number = models.IntegerField()
     year = models.IntegerField()
@@ -106,6 +185,12 @@ class Volume(models.Model):
     class Meta:
         unique_together = ('journal', 'number')
 
+    def save(self, *args, **kwargs):
+        loaded = self.loaded_values()
+        super().save(*args, **kwargs)
+        if loaded and (loaded['journal_id'], loaded['year']) != (self.journal_id, self.year):
+            place_articles(Article.objects.filter(issue__volume=self))
+
     def __str__(self):
         return f"Volume {self.number} ({self.year}) - {self.journal.name}"
 
@@ -113,7 +198,9 @@ class Volume(models.Model):
 # -------------------------
 # Issue
 # -------------------------
-class Issue(models.Model):
+class Issue(LoadedValuesMixin, models.Model):
+    tracked_fields = ('volume_id', 'month')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     number = models.IntegerField()
     title = models.CharField(max_length=255, null=True, blank=True)
@@ -124,12 +211,30 @@ class Issue(models.Model):
 
     class Meta:
         unique_together = ('volume', 'number')
+        indexes = [models.Index(fields=['title'], name='issue_title_idx')]  # admin prefix search
+
+    def save(self, *args, **kwargs):
+        loaded = self.loaded_values()
+        super().save(*args, **kwargs)
+        if loaded and loaded['volume_id'] != self.volume_id:
+            place_articles(Article.objects.filter(issue=self))
 
     def __str__(self):
         return self.title or f"Issue {self.number}"
 
 
-class Article(models.Model):
+def place_articles(articles):
+    """Copy journal and year down from each article's volume, in one UPDATE."""
+    volume = Volume.objects.filter(issues=OuterRef('issue_id'))
+    return articles.update(
+        journal_id=Subquery(volume.values('journal_id')[:1]),
+        year=Subquery(volume.values('year')[:1]),
+    )
+
+
+class Article(LoadedValuesMixin, models.Model):
+    tracked_fields = ('status', 'issue_id')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
     slug = models.SlugField(unique=True, blank=True)
@@ -157,14 +262,50 @@ class Article(models.Model):
         on_delete=models.CASCADE,
         related_name='articles'
     )
+    # Copied down from issue -> volume so listings filter on this table
+    # alone. Set by save() and save_versioned() when the issue changes, by
+    # Issue/Volume.save() when an issue or volume moves, and by
+    # place_articles() after bulk writes.
+    journal = models.ForeignKey(
+        Journal,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=False,  # leads the feed indexes below
+    )
+    year = models.IntegerField(null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Optimistic concurrency: bumped by every write, see save() and save_versioned().
+    version = models.PositiveIntegerField(default=0)
+
+    # Review queue: who holds the article and until when (see review_queue.py).
+    reviewer = models.ForeignKey(
+        'User',
+        on_delete=models.SET_NULL,
+        related_name='reviews',
+        null=True,
+        blank=True
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['title'], name='article_title_idx'),  # admin prefix search
+            # Next SUBMITTED articles, oldest first; expired review leases.
+            models.Index(fields=['status', 'created_at'], name='article_status_created_idx'),
+            models.Index(fields=['status', 'lease_expires_at'], name='article_status_lease_idx'),
+            # OAI-PMH harvesting: published articles in (updated_at, id) order.
+            models.Index(fields=['status', 'updated_at', 'id'], name='article_status_updated_idx'),
+            # Filtered listings (ArticleFeedView): newest first within a
+            # journal, or a journal's year, and status.
+            models.Index(fields=['journal', 'status', 'created_at', 'id'], name='article_journal_feed_idx'),
+            models.Index(fields=['journal', 'year', 'status', 'created_at', 'id'], name='article_journal_year_idx'),
         ]
         ordering = ['-created_at']
 
@@ -177,7 +318,152 @@ class Article(models.Model):
                 unique_slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = unique_slug
+        loaded = self.loaded_values()
+        if loaded is None or loaded['issue_id'] != self.issue_id:
+            self.place()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'journal', 'year'}
+        bump = not self._state.adding
+        if bump:
+            # Incremented by the database, so a stale instance can't write its
+            # own old version back; read back below.
+            self.version = models.F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
         super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+
+    def place(self):
+        """Copy journal and year down from the article's issue."""
+        row = None
+        if self.issue_id is not None:
+            row = Issue.objects.filter(pk=self.issue_id).values_list('volume__journal_id', 'volume__year').first()
+        self.journal_id, self.year = row or (None, None)
+
+    def check_transition(self, status):
+        if status != self.status and status not in ARTICLE_TRANSITIONS[self.status]:
+            raise InvalidTransition(
+                f"Cannot move article from {self.status} to {status}."
+            )
+
+    def save_versioned(self, fields):
+        """
+        Write ``fields`` with ``UPDATE ... WHERE id = ? AND version = ?``.
+
+        Raises StaleVersion if another writer got there first; no lock is
+        held between reading the row and writing it.
+        """
+        fields = set(fields)
+        if 'issue' in fields:
+            self.place()
+            fields |= {'journal', 'year'}
+        values = {}
+        for name in fields | {'updated_at'}:
+            field = self._meta.get_field(name)
+            # pre_save commits uploaded files and stamps auto_now fields.
+            values[field.attname] = field.pre_save(self, add=False)
+        updated = Article.objects.filter(pk=self.pk, version=self.version).update(
+            version=models.F('version') + 1, **values
+        )
+        if not updated:
+            raise StaleVersion(self.pk)
+        self.version += 1
+        # It is a save as far as everything listening is concerned.
+        models.signals.post_save.send(
+            sender=Article, instance=self, created=False,
+            update_fields=frozenset(fields), raw=False, using=self._state.db,
+        )
 
     def __str__(self):
         return self.title
+
+
+# -------------------------
+# Deferred file cleanup
+# -------------------------
+class PendingFileDeletion(models.Model):
+    """
+    Storage path whose row was deleted; removed from disk later by
+    `manage.py purge_deleted_files`. Rows are written in the same
+    transaction as the delete, so a rollback leaves the files alone.
+    """
+    path = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.path
+
+
+
+# -------------------------
+# Dashboard statistics
+# -------------------------
+class ArticleStatsRollup(models.Model):
+    """
+    Article count per journal x volume year x issue month x status, kept
+    current by home_app.stats. Articles outside any issue are counted under
+    journal NO_JOURNAL, year 0 and month 0.
+    """
+    NO_JOURNAL = uuid.UUID(int=0)
+
+    # Not a ForeignKey: the rollup must be able to hold NO_JOURNAL, and a
+    # journal's counts are removed together with the journal itself.
+    journal_id = models.UUIDField()
+    year = models.IntegerField()
+    month = models.IntegerField()
+    status = models.CharField(max_length=20, choices=ArticleStatus.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('journal_id', 'year', 'month', 'status')
+
+    def __str__(self):
+        return f"{self.journal_id} {self.year}-{self.month} {self.status}: {self.count}"
+
+
+# -------------------------
+# Change feed
+# -------------------------
+class Change(models.Model):
+    """
+    One write to a Journal, Volume, Issue or Article, in commit order; the
+    auto-incrementing id is the change-feed sequence. Maintained by
+    home_app.changes.
+    """
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=16)
+    object_id = models.UUIDField()
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [models.Index(fields=['model', 'object_id', 'id'], name='change_object_idx')]
+
+    def __str__(self):
+        return f"#{self.id} {'delete' if self.deleted else 'upsert'} {self.model} {self.object_id}"
+
+
+# -------------------------
+# View and download counters
+# -------------------------
+class ArticleCounter(models.Model):
+    """
+    Views and downloads per article, added in batches by home_app.counters
+    rather than per hit. A table of its own, so a full Article.save() from
+    a stale instance can't overwrite counts flushed since it was read.
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='counter')
+    views = models.PositiveBigIntegerField(default=0)
+    downloads = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # "Most read" rankings: read from the top of the index.
+            models.Index(fields=['-views', 'article'], name='counter_views_idx'),
+            models.Index(fields=['-downloads', 'article'], name='counter_downloads_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id}: {self.views} views, {self.downloads} downloads"
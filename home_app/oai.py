@@ -0,0 +1,364 @@
+import base64
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import Journal, Article, ArticleStatus
+from .projections import _file_storage
+
+
+# -------------------------
+# OAI-PMH 2.0 provider
+# -------------------------
+# Published articles are the OAI items; journals are the sets. Lists are
+# ordered by (updated_at, id) and resumption tokens carry the last key seen,
+# so every page is an index range scan on article_status_updated_idx and a
+# full harvest never uses OFFSET. Pages are streamed record by record.
+
+OAI_NS = 'http://www.openarchives.org/OAI/2.0/'
+DC_PREFIX = 'oai_dc'
+DEFAULT_PAGE_SIZE = 100
+GRANULARITY = 'YYYY-MM-DDThh:mm:ssZ'
+
+VERB_ARGUMENTS = {
+    # verb: (required, optional, exclusive)
+    'Identify': ((), (), None),
+    'ListMetadataFormats': ((), ('identifier',), None),
+    'ListSets': ((), (), 'resumptionToken'),
+    'ListIdentifiers': (('metadataPrefix',), ('from', 'until', 'set'), 'resumptionToken'),
+    'ListRecords': (('metadataPrefix',), ('from', 'until', 'set'), 'resumptionToken'),
+    'GetRecord': (('identifier', 'metadataPrefix'), (), None),
+}
+
+RECORD_FIELDS = (
+    'id', 'slug', 'title', 'authors', 'abstract', 'file', 'created_at', 'updated_at',
+    'issue__number', 'issue__month', 'issue__volume__number', 'issue__volume__year',
+    'issue__volume__journal__name', 'issue__volume__journal__issn', 'issue__volume__journal__slug',
+)
+
+
+class OAIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def page_size():
+    return getattr(settings, 'OAI_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+
+
+def repository_identifier():
+    return getattr(settings, 'OAI_REPOSITORY_IDENTIFIER', 'ujoset.com.ng')
+
+
+def oai_identifier(pk):
+    return f'oai:{repository_identifier()}:{pk}'
+
+
+def datestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def published():
+    return Article.objects.filter(status=ArticleStatus.PUBLISHED)
+
+
+# -------------------------
+# Arguments
+# -------------------------
+def parse_datestamp(value, end=False):
+    """A from/until argument; a bare day covers the whole day."""
+    try:
+        if len(value) == 10:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+            moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+            return moment.replace(tzinfo=dt_timezone.utc), 'day'
+        moment = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=dt_timezone.utc)
+        return (moment + timedelta(seconds=1) if end else moment), 'seconds'
+    except ValueError:
+        raise OAIError('badArgument', f'Invalid datestamp {value!r}.')
+
+
+def encode_token(arguments, key):
+    payload = dict(arguments, key=[key[0].isoformat(), str(key[1])])
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_token(token, verb):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        updated_at, pk = payload.pop('key')
+        key = (datetime.fromisoformat(updated_at), pk)
+        if payload.pop('verb') != verb:
+            raise ValueError
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise OAIError('badResumptionToken', 'The resumption token is invalid.')
+    return dict(payload, verb=verb), key
+
+
+def parse_arguments(params):
+    """
+    Validate the request arguments. Returns ``(arguments, key)``; ``key`` is
+    the last (updated_at, id) seen when resuming from a token, else None.
+    """
+    verb = params.get('verb')
+    if verb not in VERB_ARGUMENTS:
+        raise OAIError('badVerb', 'Missing or illegal verb.')
+    if any(len(params.getlist(name)) > 1 for name in params):
+        raise OAIError('badArgument', 'Arguments may not be repeated.')
+    required, optional, exclusive = VERB_ARGUMENTS[verb]
+    names = set(params) - {'verb'}
+    if exclusive and exclusive in names:
+        if names != {exclusive}:
+            raise OAIError('badArgument', f'{exclusive} is an exclusive argument.')
+        if verb == 'ListSets':
+            raise OAIError('badResumptionToken', 'The resumption token is invalid.')
+        return decode_token(params[exclusive], verb)
+    if names - set(required) - set(optional):
+        illegal = ', '.join(sorted(names - set(required) - set(optional)))
+        raise OAIError('badArgument', f"Illegal argument(s): {illegal}.")
+    if set(required) - names:
+        raise OAIError('badArgument', f"Missing argument(s): {', '.join(sorted(set(required) - names))}.")
+
+    arguments = {name: params[name] for name in names}
+    arguments['verb'] = verb
+    if 'metadataPrefix' in arguments and arguments['metadataPrefix'] != DC_PREFIX:
+        raise OAIError('cannotDisseminateFormat', f"Only {DC_PREFIX} is supported.")
+    granularities = set()
+    for name in ('from', 'until'):
+        if name in arguments:
+            granularities.add(parse_datestamp(arguments[name])[1])
+    if len(granularities) > 1:
+        raise OAIError('badArgument', 'from and until must have the same granularity.')
+    return arguments, None
+
+
+def filter_records(arguments, key=None):
+    articles = published()
+    if 'from' in arguments:
+        articles = articles.filter(updated_at__gte=parse_datestamp(arguments['from'])[0])
+    if 'until' in arguments:
+        articles = articles.filter(updated_at__lt=parse_datestamp(arguments['until'], end=True)[0])
+    if 'set' in arguments:
+        articles = articles.filter(journal__slug=arguments['set'])
+    if key is not None:
+        updated_at, pk = key
+        # The redundant >= gives the planner a range to seek to.
+        articles = articles.filter(Q(updated_at__gt=updated_at) | Q(pk__gt=pk), updated_at__gte=updated_at)
+    return articles.order_by('updated_at', 'id')
+
+
+# -------------------------
+# XML
+# -------------------------
+def element(name, value):
+    return f'<{name}>{escape(str(value))}</{name}>'
+
+
+def header(row):
+    parts = [
+        '<header>',
+        element('identifier', oai_identifier(row['id'])),
+        element('datestamp', datestamp(row['updated_at'])),
+    ]
+    if row['issue__volume__journal__slug']:
+        parts.append(element('setSpec', row['issue__volume__journal__slug']))
+    parts.append('</header>')
+    return ''.join(parts)
+
+
+def dublin_core(row, file_url):
+    parts = [
+        '<metadata><oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/oai_dc/ '
+        'http://www.openarchives.org/OAI/2.0/oai_dc.xsd">',
+        element('dc:title', row['title']),
+    ]
+    parts.extend(element('dc:creator', author.strip()) for author in row['authors'].split(',') if author.strip())
+    parts.append(element('dc:description', row['abstract']))
+    parts.append(element('dc:date', row['created_at'].date().isoformat()))
+    parts.append(element('dc:type', 'Text'))
+    if row['file']:
+        parts.append(element('dc:format', 'application/pdf'))
+        parts.append(element('dc:identifier', file_url(row['file'])))
+    if row['issue__volume__journal__name']:
+        source = (
+            f"{row['issue__volume__journal__name']}, Vol. {row['issue__volume__number']} "
+            f"({row['issue__volume__year']}), No. {row['issue__number']}"
+        )
+        parts.append(element('dc:source', source))
+        if row['issue__volume__journal__issn']:
+            parts.append(element('dc:source', f"ISSN {row['issue__volume__journal__issn']}"))
+    parts.append('</oai_dc:dc></metadata>')
+    return ''.join(parts)
+
+
+def envelope_start(base_url, arguments=None):
+    attributes = ''.join(f' {name}={quoteattr(value)}' for name, value in sorted((arguments or {}).items()))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<OAI-PMH xmlns="{OAI_NS}" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        f'xsi:schemaLocation="{OAI_NS} http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd">'
+        f'{element("responseDate", datestamp(timezone.now()))}'
+        f'<request{attributes}>{escape(base_url)}</request>'
+    )
+
+
+ENVELOPE_END = '</OAI-PMH>'
+
+
+def error_response(base_url, error, params):
+    # badVerb/badArgument responses must not echo the arguments.
+    echo = None if error.code in ('badVerb', 'badArgument') else {name: params[name] for name in params}
+    return (
+        envelope_start(base_url, echo)
+        + f'<error code="{error.code}">{escape(error.message)}</error>'
+        + ENVELOPE_END
+    )
+
+
+# -------------------------
+# Verbs
+# -------------------------
+# Each returns an iterator of XML chunks. Anything that can fail with an OAI
+# error is checked before the first chunk so the error replaces the response.
+
+def identify(base_url, arguments, context):
+    earliest = published().aggregate(earliest=Min('updated_at'))['earliest'] or timezone.now()
+    yield envelope_start(base_url, context['echo'])
+    yield (
+        '<Identify>'
+        + element('repositoryName', getattr(settings, 'OAI_REPOSITORY_NAME', 'UJOSET'))
+        + element('baseURL', base_url)
+        + element('protocolVersion', '2.0')
+        + element('adminEmail', getattr(settings, 'OAI_ADMIN_EMAIL', f'admin@{repository_identifier()}'))
+        + element('earliestDatestamp', datestamp(earliest))
+        + element('deletedRecord', 'no')
+        + element('granularity', GRANULARITY)
+        + '</Identify>'
+    )
+    yield ENVELOPE_END
+
+
+def list_metadata_formats(base_url, arguments, context):
+    if 'identifier' in arguments:
+        article_for(arguments['identifier'])
+    yield envelope_start(base_url, context['echo'])
+    yield (
+        '<ListMetadataFormats><metadataFormat>'
+        + element('metadataPrefix', DC_PREFIX)
+        + element('schema', 'http://www.openarchives.org/OAI/2.0/oai_dc.xsd')
+        + element('metadataNamespace', 'http://www.openarchives.org/OAI/2.0/oai_dc/')
+        + '</metadataFormat></ListMetadataFormats>'
+    )
+    yield ENVELOPE_END
+
+
+def list_sets(base_url, arguments, context):
+    journals = Journal.objects.order_by('slug').values_list('slug', 'name')
+    yield envelope_start(base_url, context['echo'])
+    yield '<ListSets>'
+    for slug, name in journals.iterator():
+        yield f'<set>{element("setSpec", slug)}{element("setName", name)}</set>'
+    yield '</ListSets>'
+    yield ENVELOPE_END
+
+
+def list_records(base_url, arguments, context, key=None, with_metadata=True):
+    verb = arguments['verb']
+    limit = page_size()
+    rows = filter_records(arguments, key).values(*RECORD_FIELDS)[:limit + 1].iterator()
+    first = next(rows, None)
+    if first is None:
+        raise OAIError('noRecordsMatch', 'No records match the request.')
+
+    def chunks():
+        yield envelope_start(base_url, context['echo'])
+        yield f'<{verb}>'
+        row, sent = first, 0
+        while row is not None and sent < limit:
+            if with_metadata:
+                yield f'<record>{header(row)}{dublin_core(row, context["file_url"])}</record>'
+            else:
+                yield header(row)
+            last, row, sent = row, next(rows, None), sent + 1
+        if row is not None:
+            yield element('resumptionToken', encode_token(arguments, (last['updated_at'], last['id'])))
+        elif key is not None:
+            # The last page of a resumed list carries an empty token.
+            yield '<resumptionToken/>'
+        yield f'</{verb}>'
+        yield ENVELOPE_END
+
+    return chunks()
+
+
+def list_identifiers(base_url, arguments, context, key=None):
+    return list_records(base_url, arguments, context, key, with_metadata=False)
+
+
+def article_for(identifier):
+    prefix = f'oai:{repository_identifier()}:'
+    pk = identifier[len(prefix):] if identifier.startswith(prefix) else None
+    try:
+        row = published().filter(pk=pk).values(*RECORD_FIELDS).first() if pk else None
+    except ValidationError:
+        # A malformed UUID is simply an unknown identifier.
+        row = None
+    if row is None:
+        raise OAIError('idDoesNotExist', f'No record {identifier!r}.')
+    return row
+
+
+def get_record(base_url, arguments, context):
+    row = article_for(arguments['identifier'])
+    yield envelope_start(base_url, context['echo'])
+    yield f'<GetRecord><record>{header(row)}{dublin_core(row, context["file_url"])}</record></GetRecord>'
+    yield ENVELOPE_END
+
+
+VERBS = {
+    'Identify': identify,
+    'ListMetadataFormats': list_metadata_formats,
+    'ListSets': list_sets,
+    'ListIdentifiers': list_identifiers,
+    'ListRecords': list_records,
+    'GetRecord': get_record,
+}
+
+
+def respond(params, base_url, absolute_uri):
+    """
+    Handle one OAI-PMH request. Returns an iterator of XML chunks; protocol
+    errors come back as a single error document, as OAI-PMH requires.
+    ``absolute_uri`` turns a path into a full URL (for file links).
+    """
+    try:
+        arguments, key = parse_arguments(params)
+        handler = VERBS[arguments['verb']]
+        context = {
+            'file_url': lambda name: absolute_uri(_file_storage.url(name)),
+            'echo': {name: params[name] for name in params},
+        }
+        if arguments['verb'] in ('ListIdentifiers', 'ListRecords'):
+            chunks = handler(base_url, arguments, context, key=key)
+        else:
+            chunks = handler(base_url, arguments, context)
+        # Run the handler up to its first chunk so errors surface here.
+        first = next(chunks)
+    except OAIError as error:
+        return iter([error_response(base_url, error, params)])
+
+    def stream():
+        yield first
+        yield from chunks
+
+    return stream()
@@ -0,0 +1,14 @@
+from rest_framework.permissions import BasePermission
+
+from .models import RoleChoices
+
+
+class IsReviewer(BasePermission):
+    """Authenticated reviewers and admins."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated
+            and user.role in (RoleChoices.REVIEWER, RoleChoices.ADMIN)
+        )
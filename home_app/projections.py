@@ -0,0 +1,185 @@
+from abc import ABC, abstractmethod
+
+from rest_framework import serializers
+
+from .models import Journal, Volume, Issue, Article
+
+
+# -------------------------
+# Read-only projections
+# -------------------------
+# Model-free equivalents of `ArticleSerializer`, `IssueSerializer` and
+# `VolumeSerializer` for list endpoints. Rows come straight from
+# `.values_list()` and are mapped to the exact same JSON shape, so no model
+# instances are built and no DRF field machinery runs per row.
+#
+# Nested journal/volume/issue dicts are built once and shared between the
+# rows that reference them; treat `.data` as read-only.
+
+_datetime = serializers.DateTimeField().to_representation
+_file_storage = Article._meta.get_field('file').storage
+
+JOURNAL_FIELDS = ('id', 'name', 'slug', 'description', 'issn', 'created_at', 'updated_at')
+VOLUME_FIELDS = ('id', 'number', 'year', 'journal_id', 'created_at', 'updated_at')
+ISSUE_FIELDS = ('id', 'number', 'title', 'month', 'volume_id', 'created_at', 'updated_at')
+ARTICLE_FIELDS = (
+    'id', 'issue_id', 'publisher_id', 'title', 'slug', 'authors', 'abstract',
+    'file', 'status', 'payment_proof', 'payment_verified', 'created_at', 'updated_at', 'version',
+    'lease_expires_at', 'reviewer_id', 'counter__views', 'counter__downloads',
+)
+
+
+def _journals(ids):
+    """JournalSerializer shape, keyed by pk."""
+    return {
+        pk: {
+            'id': str(pk),
+            'name': name,
+            'slug': slug,
+            'description': description,
+            'issn': issn,
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+        }
+        for pk, name, slug, description, issn, created_at, updated_at
+        in Journal.objects.filter(pk__in=ids).values_list(*JOURNAL_FIELDS)
+    }
+
+
+def _issues_by_volume(volume_ids):
+    """Issue3Serializer shape, grouped by volume pk."""
+    grouped = {}
+    rows = Issue.objects.filter(volume_id__in=volume_ids).order_by('volume_id', 'number')
+    for pk, number, title, month, volume_id, created_at, updated_at in rows.values_list(*ISSUE_FIELDS):
+        grouped.setdefault(volume_id, []).append({
+            'id': str(pk),
+            'number': number,
+            'title': title,
+            'month': month,
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+            'volume': volume_id,
+        })
+    return grouped
+
+
+def _volumes(rows):
+    """VolumeSerializer shape for `VOLUME_FIELDS` rows, in row order."""
+    journals = _journals({row[3] for row in rows})
+    issues = _issues_by_volume({row[0] for row in rows})
+    return [
+        {
+            'id': str(pk),
+            'number': number,
+            'year': year,
+            'journal': journals[journal_id],
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+            'issues': issues.get(pk, []),
+        }
+        for pk, number, year, journal_id, created_at, updated_at in rows
+    ]
+
+
+def _issues(rows):
+    """IssueSerializer shape for `ISSUE_FIELDS` rows, in row order."""
+    volume_ids = {row[4] for row in rows}
+    volumes = {
+        volume['id']: volume
+        for volume in _volumes(list(Volume.objects.filter(pk__in=volume_ids).values_list(*VOLUME_FIELDS)))
+    }
+    return [
+        {
+            'id': str(pk),
+            'number': number,
+            'title': title,
+            'month': month,
+            'volume': volumes[str(volume_id)],
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+        }
+        for pk, number, title, month, volume_id, created_at, updated_at in rows
+    ]
+
+
+class Projection(ABC):
+    """
+    Read-only stand-in for ``Serializer(queryset, many=True)``.
+
+    Only ``.data`` is supported; pass the same ``context`` the serializer
+    would get so file URLs are built the same way.
+    """
+
+    def __init__(self, queryset, context=None):
+        self.queryset = queryset
+        self.context = context or {}
+
+    @property
+    def data(self):
+        return self.project(list(self.queryset.values_list(*self.fields)))
+
+    @abstractmethod
+    def project(self, rows):
+        """JSON-ready dicts for ``rows`` (tuples of ``fields``), in order."""
+
+
+class VolumeProjection(Projection):
+    fields = VOLUME_FIELDS
+
+    def project(self, rows):
+        return _volumes(rows)
+
+
+class IssueProjection(Projection):
+    fields = ISSUE_FIELDS
+
+    def project(self, rows):
+        return _issues(rows)
+
+
+class ArticleProjection(Projection):
+    fields = ARTICLE_FIELDS
+
+    def file_url(self, name):
+        if not name:
+            return None
+        url = _file_storage.url(name)
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def project(self, rows):
+        issue_ids = {row[1] for row in rows if row[1] is not None}
+        issues = {
+            issue['id']: issue
+            for issue in _issues(list(Issue.objects.filter(pk__in=issue_ids).values_list(*ISSUE_FIELDS)))
+        }
+        file_url = self.file_url
+        return [
+            {
+                'id': str(pk),
+                'issue': issues[str(issue_id)] if issue_id is not None else None,
+                'publisher': publisher_id,
+                'views': views or 0,
+                'downloads': downloads or 0,
+                'title': title,
+                'slug': slug,
+                'authors': authors,
+                'abstract': abstract,
+                'file': file_url(file),
+                'status': status,
+                'payment_proof': file_url(payment_proof),
+                'payment_verified': payment_verified,
+                'created_at': _datetime(created_at),
+                'updated_at': _datetime(updated_at),
+                'version': version,
+                'lease_expires_at': _datetime(lease_expires_at),
+                'reviewer': reviewer_id,
+            }
+            for (
+                pk, issue_id, publisher_id, title, slug, authors, abstract,
+                file, status, payment_proof, payment_verified, created_at, updated_at, version,
+                lease_expires_at, reviewer_id, views, downloads,
+            ) in rows
+        ]
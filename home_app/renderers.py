@@ -0,0 +1,68 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+
+# Fallback for the types neither orjson nor msgpack know about
+# (lazy translation strings, Decimal, QuerySet, ...). Reusing DRF's encoder
+# keeps the wire format identical to the stock JSONRenderer.
+_drf_encoder = encoders.JSONEncoder()
+
+# orjson writes UTC datetimes with a "Z" suffix, which matches what
+# DRF's encoder produces for aware datetimes in UTC.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+# -------------------------
+# JSON
+# -------------------------
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    UUIDs and datetimes are encoded natively instead of going through
+    ``JSONEncoder.default`` one value at a time. Pretty-printed output
+    (``indent`` in the Accept header or the browsable API) and anything
+    orjson refuses to encode fall back to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+# -------------------------
+# MessagePack
+# -------------------------
+class MessagePackRenderer(BaseRenderer):
+    """
+    Compact binary encoding for internal clients.
+
+    Selected with ``Accept: application/msgpack`` or ``?format=msgpack``.
+    Values msgpack can't encode natively (UUID, datetime, ...) get the
+    same string representation as in the JSON output.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_drf_encoder.default, use_bin_type=True)
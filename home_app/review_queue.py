@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Article, ArticleStatus
+from .changes import record_queryset
+from .stats import bulk_status_update
+
+
+# -------------------------
+# Reviewer work queue
+# -------------------------
+# Claiming is one conditional UPDATE of the article table: the candidate
+# subquery picks the oldest claimable rows and the outer WHERE re-checks that
+# they are still claimable, so two reviewers racing for the same rows can't
+# both get them. The stats rollups count those rows first, in the same
+# transaction; on SQLite that transaction takes the write lock up front (see
+# DATABASES in settings), so concurrent claimers queue for it one at a time
+# and each gets its own rows instead of failing on a lock upgrade.
+#
+# Where the database has SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL), the
+# candidates are locked first instead, skipping rows another claimer holds,
+# so concurrent claimers each get their own rows rather than colliding on the
+# same oldest ones and coming away short.
+
+DEFAULT_LEASE = timedelta(minutes=30)
+
+
+def lease_duration():
+    return getattr(settings, 'REVIEW_LEASE', DEFAULT_LEASE)
+
+
+def claimable(now):
+    """Waiting for a reviewer, or under review with a lease that ran out."""
+    return Q(status=ArticleStatus.SUBMITTED) | Q(
+        status=ArticleStatus.UNDER_REVIEW, lease_expires_at__lt=now
+    )
+
+
+def claim_articles(reviewer, batch_size, lease=None):
+    """
+    Hand ``reviewer`` up to ``batch_size`` of the oldest claimable articles.
+
+    Returns a queryset of the articles claimed by this call.
+    """
+    now = timezone.now()
+    expires = now + (lease or lease_duration())
+    candidates = Article.objects.filter(claimable(now)).order_by('created_at')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = list(
+                candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size]
+            )
+        else:
+            candidates = candidates.values('pk')[:batch_size]
+        bulk_status_update(
+            Article.objects.filter(claimable(now), pk__in=candidates),
+            ArticleStatus.UNDER_REVIEW,
+            reviewer=reviewer,
+            lease_expires_at=expires,
+            updated_at=now,
+            version=F('version') + 1,
+        )
+        # The lease timestamp identifies this claim among the reviewer's rows.
+        claimed = Article.objects.filter(reviewer=reviewer, lease_expires_at=expires)
+        record_queryset(claimed)
+    return claimed
+
+
+def renew_lease(reviewer, articles, lease=None):
+    """
+    Extend the reviewer's unexpired leases on ``articles``; returns the count.
+
+    Leaves ``version`` alone: renewing is not an edit, and bumping it would
+    make the reviewer's own pending save fail as stale.
+    """
+    now = timezone.now()
+    renewable = articles.filter(reviewer=reviewer, status=ArticleStatus.UNDER_REVIEW, lease_expires_at__gte=now)
+    with transaction.atomic():
+        record_queryset(renewable)
+        return renewable.update(lease_expires_at=now + (lease or lease_duration()))
+
+
+def release_expired_leases():
+    """Put articles whose review lease expired back to SUBMITTED, in one UPDATE."""
+    now = timezone.now()
+    expired = Article.objects.filter(status=ArticleStatus.UNDER_REVIEW, lease_expires_at__lt=now)
+    with transaction.atomic():
+        record_queryset(expired)
+        return bulk_status_update(
+            expired,
+            ArticleStatus.SUBMITTED,
+            reviewer=None,
+            lease_expires_at=None,
+            updated_at=now,
+            version=F('version') + 1,
+        )
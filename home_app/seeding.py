@@ -0,0 +1,95 @@
+from django.contrib.auth.hashers import make_password
+
+from .models import User, Journal, Volume, Issue, Article, ArticleStatus, RoleChoices
+from .changes import record
+from .stats import recompute
+
+
+# -------------------------
+# Deterministic demo dataset
+# -------------------------
+# Used by the benchmark suites and the test-suite so numbers are comparable
+# between runs. Everything goes through bulk_create: Article.save() runs a
+# slug-uniqueness query per row, which would dominate seeding time.
+
+STATUS_CYCLE = [
+    ArticleStatus.PUBLISHED,
+    ArticleStatus.SUBMITTED,
+    ArticleStatus.UNDER_REVIEW,
+    ArticleStatus.APPROVED,
+    ArticleStatus.DRAFT,
+    ArticleStatus.REJECTED,
+]
+
+
+def seed_dataset(journals=2, volumes=3, issues=4, articles=10, publishers=5, prefix='seed'):
+    """
+    Create ``journals`` journals, each with ``volumes`` volumes of ``issues``
+    issues holding ``articles`` articles. Returns a dict of the created rows.
+    """
+    password = make_password(None)
+    users = User.objects.bulk_create([
+        User(
+            email=f'{prefix}-publisher{u}@example.com',
+            name=f'Publisher {u}',
+            Institution=f'University {u % 3}',
+            role=RoleChoices.PUBLISHER if u else RoleChoices.REVIEWER,
+            password=password,
+        ).fold()
+        for u in range(publishers)
+    ])
+
+    journal_rows = Journal.objects.bulk_create([
+        Journal(
+            name=f'{prefix.title()} Journal {j}',
+            slug=f'{prefix}-journal-{j}',
+            description=f'Description of journal {j}',
+            issn=f'{prefix}-{j:04d}',
+        )
+        for j in range(journals)
+    ])
+    volume_rows = Volume.objects.bulk_create([
+        Volume(journal=journal, number=v + 1, year=2020 + v)
+        for journal in journal_rows
+        for v in range(volumes)
+    ])
+    issue_rows = Issue.objects.bulk_create([
+        Issue(volume=volume, number=i + 1, title=f'Issue {i + 1}', month=(i * 3) % 12 + 1)
+        for volume in volume_rows
+        for i in range(issues)
+    ])
+
+    article_rows = []
+    n = 0
+    for issue in issue_rows:
+        for a in range(articles):
+            article_rows.append(Article(
+                title=f'{prefix.title()} article {n}',
+                slug=f'{prefix}-article-{n}',
+                authors=f'Author {n}, Co-Author {n + 1}',
+                abstract=f'Abstract of article {n}. ' * 5,
+                file=f'articles/{prefix}-article-{n}.pdf',
+                status=STATUS_CYCLE[n % len(STATUS_CYCLE)],
+                payment_verified=bool(n % 2),
+                issue=issue,
+                journal_id=issue.volume.journal_id,
+                year=issue.volume.year,
+                publisher=users[n % publishers],
+            ))
+            n += 1
+    article_rows = Article.objects.bulk_create(article_rows, batch_size=500)
+    # bulk_create bypasses the receivers that maintain the rollups and the
+    # change feed.
+    recompute()
+    for model_name, rows in (
+        ('journal', journal_rows), ('volume', volume_rows), ('issue', issue_rows), ('article', article_rows),
+    ):
+        record(model_name, [row.pk for row in rows])
+
+    return {
+        'users': users,
+        'journals': journal_rows,
+        'volumes': volume_rows,
+        'issues': issue_rows,
+        'articles': article_rows,
+    }
@@ -1,11 +1,52 @@
+import threading
+
 from rest_framework import serializers
 from .models import User, Journal, Volume, Issue, Article
 
 
+# -------------------------
+# Cached field construction
+# -------------------------
+def _clone(value):
+    """
+    Fresh instance of a template field, like Field.__deepcopy__ but copying
+    only the nested fields (a ListSerializer's child, say) and passing every
+    other constructor argument through as is.
+    """
+    if not isinstance(value, serializers.Field):
+        return value
+    return value.__class__(*map(_clone, value._args), **{key: _clone(arg) for key, arg in value._kwargs.items()})
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that introspects its model and builds its fields once per
+    class instead of once per instance. Each instance gets fresh clones of
+    that template, as DRF gives it copies of the declared fields, so binding
+    and per-instance changes never touch the shared one.
+
+    Subclasses must not build fields from per-instance state (context,
+    request) in get_fields().
+    """
+    _fields_lock = threading.Lock()
+
+    def get_fields(self):
+        cls = type(self)
+        # Looked up in the class's own __dict__: subclasses build their own.
+        template = cls.__dict__.get('_fields_template')
+        if template is None:
+            with cls._fields_lock:
+                template = cls.__dict__.get('_fields_template')
+                if template is None:
+                    template = super().get_fields()
+                    cls._fields_template = template
+        return {name: _clone(field) for name, field in template.items()}
+
+
 # -------------------------
 # User Serializer
 # -------------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -30,7 +71,7 @@ class UserSerializer(serializers.ModelSerializer):
 from django.utils.text import slugify
 from rest_framework import serializers
 
-class JournalSerializer(serializers.ModelSerializer):
+class JournalSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Journal
         fields = ['id', 'name', 'slug', 'description', 'issn', 'created_at',"" 'updated_at']
@@ -54,7 +95,7 @@ class JournalSerializer(serializers.ModelSerializer):
 # Volume Serializer
 # -------------------------
 
-class Issue3Serializer(serializers.ModelSerializer):
+class Issue3Serializer(CachedFieldsModelSerializer):
     # volume = VolumeSerializer(read_only=True)
     # volume_id = serializers.PrimaryKeyRelatedField(
     #     queryset=Volume.objects.all(), source='volume', write_only=True
@@ -66,7 +107,7 @@ class Issue3Serializer(serializers.ModelSerializer):
 
 
 
-class VolumeSerializer(serializers.ModelSerializer):
+class VolumeSerializer(CachedFieldsModelSerializer):
     journal = JournalSerializer(read_only=True)
     journal_id = serializers.PrimaryKeyRelatedField(
         queryset=Journal.objects.all(), source='journal', write_only=True
@@ -84,7 +125,7 @@ class VolumeSerializer(serializers.ModelSerializer):
 # -------------------------
 # Issue Serializer
 # -------------------------
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(CachedFieldsModelSerializer):
     volume = VolumeSerializer(read_only=True)
     volume_id = serializers.PrimaryKeyRelatedField(
         queryset=Volume.objects.all(), source='volume', write_only=True
@@ -126,22 +167,35 @@ class IssueSerializer(serializers.ModelSerializer):
 #         ]
 #         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(CachedFieldsModelSerializer):
     issue = IssueSerializer(read_only=True)
     # Change publisher from read_only to a primary key field:
     publisher = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all()
     )
+    # Flushed in batches by home_app.counters, so a few seconds behind.
+    views = serializers.SerializerMethodField()
+    downloads = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
-        fields = '__all__'
+        # journal and year are copies of issue.volume's, which `issue` shows.
+        exclude = ['journal', 'year']
+        read_only_fields = ['version', 'reviewer', 'lease_expires_at']
+
+    def get_views(self, obj):
+        counter = getattr(obj, 'counter', None)
+        return counter.views if counter else 0
+
+    def get_downloads(self, obj):
+        counter = getattr(obj, 'counter', None)
+        return counter.downloads if counter else 0
 
 from rest_framework import serializers
 from .models import Journal, Volume, Issue
 
 
-class IssueWithCountSerializer(serializers.ModelSerializer):
+class IssueWithCountSerializer(CachedFieldsModelSerializer):
     article_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -152,7 +206,7 @@ class IssueWithCountSerializer(serializers.ModelSerializer):
         return obj.articles.count()
 
 
-class VolumeWithIssuesSerializer(serializers.ModelSerializer):
+class VolumeWithIssuesSerializer(CachedFieldsModelSerializer):
     issues = IssueWithCountSerializer(many=True)
 
     class Meta:
@@ -160,7 +214,7 @@ class VolumeWithIssuesSerializer(serializers.ModelSerializer):
         fields = ['id', 'number', 'year', 'issues']
 
 
-class JournalWithNestedSerializer(serializers.ModelSerializer):
+class JournalWithNestedSerializer(CachedFieldsModelSerializer):
     volumes = VolumeWithIssuesSerializer(many=True)
 
     class Meta:
@@ -169,7 +223,7 @@ class JournalWithNestedSerializer(serializers.ModelSerializer):
 
 
 # New serializer for detailed view (used with slug)
-class JournalDetailSerializer(serializers.ModelSerializer):
+class JournalDetailSerializer(CachedFieldsModelSerializer):
     volumes = serializers.SerializerMethodField()
 
     class Meta:
@@ -208,3 +262,18 @@ class RegisterSerializer(serializers.ModelSerializer):
         user.is_active = True
         user.save()
         return user
+
+
+# -------------------------
+# JWT refresh / blacklist
+# -------------------------
+from rest_framework_simplejwt import serializers as jwt_serializers
+from .tokens import RefreshToken
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    token_class = RefreshToken
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .changes import latest_seq
+from .metrics import CACHE_LOOKUPS
+
+
+# -------------------------
+# Single-flight payloads
+# -------------------------
+# Expensive read-only payloads are cached against the change-feed sequence
+# (home_app.changes): any write to a journal, volume, issue or article moves
+# the sequence on, which makes every entry stale. When an entry is missing or
+# stale, one caller rebuilds it and concurrent callers for the same key wait
+# for that result instead of rebuilding it too:
+#
+# - within a process, on the leader's Future;
+# - across processes, on a lease taken with cache.add(). That needs a cache
+#   the processes share (CACHES); with the default per-process LocMemCache
+#   each process still builds its own copy, but only once.
+#
+# With SINGLE_FLIGHT_STALE, callers that find a stale entry while someone
+# else rebuilds it get the stale entry straight away (stale-while-revalidate).
+# The rebuilding caller itself still waits for the build.
+
+DEFAULT_TTL = 600
+DEFAULT_LEASE = 30
+LEASE_POLL = 0.05
+
+_lock = threading.Lock()
+_flights = {}  # (key, version) -> Future of the build in progress
+
+
+def _cache():
+    return caches[getattr(settings, 'SINGLE_FLIGHT_CACHE', 'default')]
+
+
+def get_or_build(key, build, stale_ok=None):
+    """
+    ``build()``'s result for ``key`` as of the current change-feed sequence,
+    built once however many callers ask for it at the same time.
+    """
+    if stale_ok is None:
+        stale_ok = getattr(settings, 'SINGLE_FLIGHT_STALE', False)
+    cache_key = 'single-flight:' + hashlib.sha256(key.encode()).hexdigest()
+    version = latest_seq()
+    entry = _cache().get(cache_key)
+    if entry is not None and entry[0] >= version:
+        CACHE_LOOKUPS.labels('single_flight', 'hit').inc()
+        return entry[1]
+    stale = entry if stale_ok else None
+    CACHE_LOOKUPS.labels('single_flight', 'stale' if stale else 'miss').inc()
+
+    with _lock:
+        future = _flights.get((key, version))
+        leader = future is None
+        if leader:
+            future = _flights[(key, version)] = Future()
+    if not leader:
+        return stale[1] if stale else future.result()
+
+    try:
+        value = _lead(cache_key, version, build, stale)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        with _lock:
+            del _flights[(key, version)]
+
+
+def _lead(cache_key, version, build, stale):
+    """Build under the cross-process lease, or take another process's result."""
+    cache = _cache()
+    lease_key = f'{cache_key}:lease'
+    lease = getattr(settings, 'SINGLE_FLIGHT_LEASE', DEFAULT_LEASE)
+    deadline = time.monotonic() + lease
+    while not (leased := cache.add(lease_key, version, lease)):
+        if stale:
+            return stale[1]
+        time.sleep(LEASE_POLL)
+        entry = cache.get(cache_key)
+        if entry is not None and entry[0] >= version:
+            return entry[1]
+        if time.monotonic() > deadline:
+            # The holder is stuck or gone without releasing the lease.
+            break
+    try:
+        value = build()
+        cache.set(cache_key, (version, value), getattr(settings, 'SINGLE_FLIGHT_TTL', DEFAULT_TTL))
+        return value
+    finally:
+        if leased:
+            cache.delete(lease_key)
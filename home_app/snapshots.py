@@ -0,0 +1,259 @@
+import gzip
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.db.models import Q
+
+from .changes import latest_seq
+from .models import Journal, Issue, Article, ArticleStatus, Change
+from .renderers import FastJSONRenderer
+from .serializers import ArticleSerializer, JournalDetailSerializer
+from .views import IssueDetailAPIView
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# -------------------------
+# Static snapshots
+# -------------------------
+# `manage.py publish_static` renders the public JSON of every journal
+# (JournalDetailVolume), issue (IssueDetailAPIView) and published article
+# (ArticleDetailView) to files under STATIC_SNAPSHOT_ROOT, laid out like the
+# API URLs, each with .gz and .br variants:
+#
+#   api/journals_data/<slug>.json                          /api/journals_data/<slug>
+#   api/journals/<slug>/volumes/<volume>/<issue>/index.json  /api/journals/<slug>/volumes/<volume>/<issue>/
+#   api/articles/<slug>/index.json                         /api/articles/<slug>/
+#
+# so the front proxy can answer those GETs from disk, e.g. for nginx:
+#
+#   location /api/ {
+#       root <STATIC_SNAPSHOT_ROOT>;
+#       gzip_static on; brotli_static on;
+#       try_files $uri.json $uri/index.json @django;
+#   }
+#
+# Later runs are incremental: the change feed (home_app.changes) says which
+# rows changed since the last run, and only the files showing those rows are
+# rewritten or removed. A manifest in the root remembers each file's path and
+# the files above it, for rows that have since been deleted or renamed.
+#
+# Reads served from the snapshot bypass Django, so they are not counted by
+# home_app.counters, and the counts inside article files are as of the run.
+
+MANIFEST = '.snapshot.json'
+RENDER_BATCH = 500
+# Quality 11 takes about 10x as long for a few percent smaller files, which
+# adds up over a full run.
+BROTLI_QUALITY = 9
+# World-readable, so a front proxy running as another user can serve them.
+FILE_MODE = 0o644
+
+
+def snapshot_root():
+    return str(getattr(settings, 'STATIC_SNAPSHOT_ROOT', os.path.join(settings.BASE_DIR, 'public_snapshot')))
+
+
+class BaseURL:
+    """Stands in for the request when file URLs are made absolute."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def build_absolute_uri(self, location):
+        return self.base_url + location
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as tmp:
+        tmp.write(data)
+    # Temporary files are created 0600.
+    os.chmod(tmp.name, FILE_MODE)
+    os.replace(tmp.name, path)
+
+
+def write_file(path, data):
+    """Write ``data`` and its compressed variants, each replaced atomically."""
+    _write(path, data)
+    _write(path + '.gz', gzip.compress(data, mtime=0))
+    if brotli is not None:
+        _write(path + '.br', brotli.compress(data, quality=BROTLI_QUALITY))
+
+
+def remove_file(path):
+    for name in (path, path + '.gz', path + '.br'):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+    try:
+        # api/articles/<slug>/ and the like; fails while anything else is in it.
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def journal_path(slug):
+    return f'api/journals_data/{slug}.json'
+
+
+def issue_path(slug, volume_id, issue_id):
+    return f'api/journals/{slug}/volumes/{volume_id}/{issue_id}/index.json'
+
+
+def article_path(slug):
+    return f'api/articles/{slug}/index.json'
+
+
+class Snapshot:
+    def __init__(self, root=None, base_url=''):
+        self.root = root or snapshot_root()
+        self.base_url = base_url
+        self.context = {'request': BaseURL(base_url) if base_url else None}
+        self.renderer = FastJSONRenderer()
+        self.seq = None
+        self.entries = {}  # 'journal:<id>' etc. -> {'path': ..., 'parents': [keys]}
+        self.written = self.removed = 0
+        try:
+            with open(os.path.join(self.root, MANIFEST)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        if manifest.get('base_url') == base_url:
+            self.seq, self.entries = manifest['seq'], manifest['entries']
+
+    def save_manifest(self):
+        manifest = {'seq': self.seq, 'base_url': self.base_url, 'entries': self.entries}
+        _write(os.path.join(self.root, MANIFEST), json.dumps(manifest).encode())
+
+    # Rendering ------------------------------------------------------------
+
+    def put(self, key, path, data, parents):
+        old = self.entries.get(key)
+        if old and old['path'] != path:
+            remove_file(os.path.join(self.root, old['path']))
+        write_file(os.path.join(self.root, path), self.renderer.render(data))
+        self.entries[key] = {'path': path, 'parents': parents}
+        self.written += 1
+
+    def drop(self, key):
+        old = self.entries.pop(key, None)
+        if old:
+            remove_file(os.path.join(self.root, old['path']))
+            self.removed += 1
+
+    def render_journals(self, journal_ids):
+        found = Journal.objects.filter(pk__in=journal_ids).prefetch_related('volumes__issues__articles')
+        for journal in found:
+            data = JournalDetailSerializer(journal, context=self.context).data
+            self.put(f'journal:{journal.pk}', journal_path(journal.slug), data, [])
+        return {str(journal.pk) for journal in found}
+
+    def render_issues(self, issue_ids):
+        rows = Issue.objects.filter(pk__in=issue_ids).values_list(
+            'pk', 'volume_id', 'volume__journal_id', 'volume__journal__slug'
+        )
+        for pk, volume_id, journal_id, slug in rows:
+            data = IssueDetailAPIView.build(self.context['request'], slug, volume_id, pk)
+            self.put(f'issue:{pk}', issue_path(slug, volume_id, pk), data, [f'journal:{journal_id}'])
+        return {str(row[0]) for row in rows}
+
+    def render_articles(self, article_ids):
+        found = list(
+            Article.objects.filter(pk__in=article_ids, status=ArticleStatus.PUBLISHED)
+            .select_related('issue__volume__journal', 'counter')
+        )
+        # One list serializer, so the fields are built once per batch.
+        for article, data in zip(found, ArticleSerializer(found, many=True, context=self.context).data):
+            parents = []
+            if article.issue_id:
+                parents = [f'issue:{article.issue_id}', f'journal:{article.issue.volume.journal_id}']
+            self.put(f'article:{article.pk}', article_path(article.slug), data, parents)
+        return {str(article.pk) for article in found}
+
+    def render(self, journal_ids, issue_ids, article_ids):
+        """Rewrite the given rows' files; remove those of rows gone or no longer public."""
+        for kind, ids, render in (
+            ('journal', journal_ids, self.render_journals),
+            ('issue', issue_ids, self.render_issues),
+            ('article', article_ids, self.render_articles),
+        ):
+            ids = set(ids)
+            for pk in ids - render(ids):
+                self.drop(f'{kind}:{pk}')
+
+    # Runs -------------------------------------------------------------------
+
+    def full(self):
+        """Render everything public; remove files of anything else."""
+        seq = latest_seq()
+        public = {
+            'journal': _ids(Journal.objects.all()),
+            'issue': _ids(Issue.objects.all()),
+            'article': _ids(Article.objects.filter(status=ArticleStatus.PUBLISHED)),
+        }
+        for key in list(self.entries):
+            kind, pk = key.split(':')
+            if pk not in public[kind]:
+                self.drop(key)
+        self.render_batched(public['journal'], public['issue'], public['article'])
+        self.seq = seq
+        self.save_manifest()
+
+    def render_batched(self, journal_ids, issue_ids, article_ids, batch=RENDER_BATCH):
+        ids = [sorted(journal_ids), sorted(issue_ids), sorted(article_ids)]
+        for start in range(0, max(map(len, ids)), batch):
+            self.render(*(part[start:start + batch] for part in ids))
+
+    def incremental(self):
+        """Apply the changes since the last run. Returns False if there was no run to build on."""
+        if self.seq is None:
+            return False
+        seq = latest_seq()
+        changed = {'journal': set(), 'volume': set(), 'issue': set(), 'article': set()}
+        rows = Change.objects.filter(id__gt=self.seq, id__lte=seq).values_list('model', 'object_id')
+        for model, object_id in rows.iterator():
+            changed[model].add(str(object_id))
+        if any(changed.values()):
+            self.render_batched(*self.affected(changed))
+        self.seq = seq
+        self.save_manifest()
+        return True
+
+    def parents(self, kind, ids):
+        """Parent keys the manifest recorded for these rows' files."""
+        return {parent for pk in ids for parent in self.entries.get(f'{kind}:{pk}', {}).get('parents', [])}
+
+    def affected(self, changed):
+        """Journal, issue and article ids whose files show any of the ``changed`` rows."""
+        # Downwards: an issue file shows its volume and journal, an article
+        # file its issue, volume and journal.
+        issue_ids = changed['issue'] | _ids(
+            Issue.objects.filter(Q(volume_id__in=changed['volume']) | Q(volume__journal_id__in=changed['journal']))
+        )
+        article_ids = changed['article'] | _ids(
+            Article.objects.filter(issue_id__in=issue_ids, status=ArticleStatus.PUBLISHED)
+        )
+
+        # Upwards: a journal file lists volumes, issues and article counts, an
+        # issue file its articles. Where changed rows sat before comes from
+        # the manifest, where they sit now from the database.
+        article_parents = self.parents('article', changed['article'])
+        issue_ids |= {key.split(':')[1] for key in article_parents if key.startswith('issue:')}
+        issue_ids |= _ids(Issue.objects.filter(articles__in=changed['article']))
+        journal_ids = (
+            changed['journal']
+            | {key.split(':')[1] for key in article_parents | self.parents('issue', issue_ids) if key.startswith('journal:')}
+            | _ids(Journal.objects.filter(Q(volumes__in=changed['volume']) | Q(volumes__issues__in=issue_ids)))
+        )
+        return journal_ids, issue_ids, article_ids
+
+
+def _ids(queryset):
+    return {str(pk) for pk in queryset.values_list('pk', flat=True).distinct()}
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+from django.conf import settings
+
+
+# -------------------------
+# Cold-start profiling
+# -------------------------
+# Startup is measured in a fresh interpreter: by the time a management
+# command or test runs, everything it would measure is already imported.
+
+SETUP_SNIPPET = "import django; django.setup()"
+URLCONF_SNIPPET = SETUP_SNIPPET + "; import importlib; importlib.import_module(settings.ROOT_URLCONF)"
+
+ImportRecord = namedtuple('ImportRecord', ['module', 'self_us', 'cumulative_us', 'depth'])
+StartupProfile = namedtuple('StartupProfile', ['seconds', 'imports', 'modules'])
+
+
+def profile_startup(snippet=SETUP_SNIPPET, importtime=True):
+    """
+    Run ``snippet`` in a new interpreter with this project's settings.
+
+    Returns the wall time of the snippet, the ``-X importtime`` records (empty
+    when ``importtime`` is False, since it adds its own overhead) and the
+    names of every module loaded once the snippet finished.
+    """
+    code = (
+        "import sys, time; from django.conf import settings; _t = time.perf_counter(); "
+        + snippet
+        + "; print(time.perf_counter() - _t); print(','.join(sorted(sys.modules)))"
+    )
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+        'DJANGO_SETTINGS_MODULE', 'ujoset_backend.settings'
+    ))
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    proc = subprocess.run(
+        args, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+    )
+    seconds, modules = proc.stdout.strip().splitlines()[-2:]
+    return StartupProfile(float(seconds), parse_importtime(proc.stderr), set(modules.split(',')))
+
+
+def parse_importtime(output):
+    records = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
@@ -0,0 +1,192 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Journal, Volume, Issue, Article, ArticleStatsRollup
+
+
+# -------------------------
+# Statistics rollups
+# -------------------------
+# ArticleStatsRollup holds one row per journal x year x month x status. It is
+# kept current with +/- deltas:
+#
+# - single-article saves and deletes (including save_versioned) through the
+#   post_save/post_delete receivers below;
+# - set-based UPDATEs through bulk_status_update(), set-based deletes through
+#   subtract_articles() and bulk inserts through add_articles();
+# - issues/volumes moving between journals or years by recomputing the
+#   affected journals.
+#
+# `manage.py recompute_stats` rebuilds the table from scratch.
+
+NO_JOURNAL = ArticleStatsRollup.NO_JOURNAL
+NO_KEY = (NO_JOURNAL, 0, 0)
+
+KEY_FIELDS = ('issue__volume__journal_id', 'issue__volume__year', 'issue__month')
+
+
+def issue_key(issue_id):
+    """(journal_id, year, month) an article in ``issue_id`` is counted under."""
+    if issue_id is None:
+        return NO_KEY
+    row = Issue.objects.filter(pk=issue_id).values_list('volume__journal_id', 'volume__year', 'month').first()
+    return _normalize(row) if row else NO_KEY
+
+
+def _normalize(key):
+    journal_id, year, month = key
+    return (journal_id or NO_JOURNAL, year or 0, month or 0)
+
+
+def bump(key, status, delta):
+    """Add ``delta`` to the rollup row for ``key`` and ``status``."""
+    bump_many({(key, status): delta})
+
+
+def bump_many(deltas):
+    """
+    Add each ``{(key, status): delta}`` to its rollup row, creating missing
+    rows, in one batched upsert whatever the number of groups.
+    """
+    rows = [(key, status, delta) for (key, status), delta in deltas.items() if delta]
+    if not rows:
+        return
+    table = connection.ops.quote_name(ArticleStatsRollup._meta.db_table)
+    prep = ArticleStatsRollup._meta.get_field('journal_id').get_db_prep_value
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (journal_id, year, month, status, count) VALUES (%s, %s, %s, %s, %s) '
+            f'ON CONFLICT (journal_id, year, month, status) DO UPDATE SET count = {table}.count + excluded.count',
+            [(prep(journal_id, connection), year, month, status, delta)
+             for (journal_id, year, month), status, delta in rows],
+        )
+
+
+def grouped_counts(articles):
+    """Yield (key, status, count) for ``articles``, one row per rollup group."""
+    rows = articles.order_by().values(*KEY_FIELDS, 'status').annotate(n=Count('pk'))
+    for row in rows:
+        yield _normalize([row[field] for field in KEY_FIELDS]), row['status'], row['n']
+
+
+def bulk_status_update(articles, status, **values):
+    """
+    ``articles.update(status=status, **values)`` keeping the rollups in step.
+
+    Counts the rows, then updates them, in one transaction. On SQLite that
+    transaction must be IMMEDIATE (see DATABASES in settings) or concurrent
+    callers fail upgrading their read lock. If the rows changed between
+    counting and updating (only possible on databases with concurrent
+    writers), the affected journals are recomputed.
+    """
+    with transaction.atomic():
+        groups = list(grouped_counts(articles))
+        updated = articles.update(status=status, **values)
+        if updated != sum(n for _, _, n in groups):
+            transaction.on_commit(lambda: recompute({key[0] for key, _, _ in groups}))
+        deltas = Counter()
+        for key, old_status, n in groups:
+            if old_status != status:
+                deltas[key, old_status] -= n
+                deltas[key, status] += n
+        bump_many(deltas)
+    return updated
+
+
+def add_articles(articles):
+    """Count ``articles`` into the rollups after a bulk insert."""
+    bump_many({(key, status): n for key, status, n in grouped_counts(articles)})
+
+
+def subtract_articles(articles):
+    """Remove ``articles`` from the rollups before a set-based delete."""
+    bump_many({(key, status): -n for key, status, n in grouped_counts(articles)})
+
+
+def recompute(journal_ids=None):
+    """Rebuild the rollups, for all journals or only ``journal_ids``."""
+    articles = Article.objects.all()
+    rollups = ArticleStatsRollup.objects.all()
+    if journal_ids is not None:
+        journal_ids = set(journal_ids)
+        articles = articles.filter(issue__volume__journal_id__in=journal_ids - {NO_JOURNAL})
+        if NO_JOURNAL in journal_ids:
+            articles = articles | Article.objects.filter(issue__isnull=True)
+        rollups = rollups.filter(journal_id__in=journal_ids)
+    with transaction.atomic():
+        rollups.delete()
+        ArticleStatsRollup.objects.bulk_create(
+            ArticleStatsRollup(journal_id=key[0], year=key[1], month=key[2], status=status, count=n)
+            for key, status, n in grouped_counts(articles)
+        )
+
+
+def dashboard(group_by):
+    """Sum the rollups over ``group_by`` (a subset of journal/status/year/month)."""
+    fields = ['journal_id' if name == 'journal' else name for name in group_by]
+    return list(
+        ArticleStatsRollup.objects.filter(count__gt=0)
+        .values(*fields)
+        .annotate(total=Sum('count'))
+        .order_by(*fields)
+    )
+
+
+# -------------------------
+# Receivers
+# -------------------------
+@receiver(post_save, sender=Article)
+def article_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = instance.loaded_values()
+    if created or loaded is None:
+        bump(issue_key(instance.issue_id), instance.status, 1)
+    elif (loaded['status'], loaded['issue_id']) != (instance.status, instance.issue_id):
+        old_key = issue_key(loaded['issue_id'])
+        new_key = old_key if loaded['issue_id'] == instance.issue_id else issue_key(instance.issue_id)
+        deltas = Counter()
+        deltas[old_key, loaded['status']] -= 1
+        deltas[new_key, instance.status] += 1
+        bump_many(deltas)
+    instance.reset_loaded_values()
+
+
+@receiver(post_delete, sender=Article)
+def article_deleted(sender, instance, **kwargs):
+    loaded = instance.loaded_values() or {'status': instance.status, 'issue_id': instance.issue_id}
+    bump(issue_key(loaded['issue_id']), loaded['status'], -1)
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Volume)
+def structure_saved(sender, instance, created, raw=False, **kwargs):
+    """An issue or volume moved: recompute the journals involved."""
+    if raw:
+        return
+    loaded = instance.loaded_values()
+    # After every save, created ones included, so the next save of this same
+    # instance (here and in Volume/Issue.save()) can tell what it changed.
+    instance.reset_loaded_values()
+    if created or loaded is None:
+        return
+    current = {name: instance.__dict__.get(name) for name in instance.tracked_fields}
+    if current == loaded:
+        return
+    if sender is Volume:
+        journal_ids = {loaded['journal_id'], instance.journal_id}
+    else:
+        journal_ids = set(
+            Volume.objects.filter(pk__in={loaded['volume_id'], instance.volume_id})
+            .values_list('journal_id', flat=True)
+        )
+    transaction.on_commit(lambda: recompute(journal_ids))
+
+
+@receiver(post_delete, sender=Journal)
+def journal_deleted(sender, instance, **kwargs):
+    ArticleStatsRollup.objects.filter(journal_id=instance.pk).delete()
@@ -1,3 +1,1651 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
 
-# Create your tests here.
+import msgpack
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.contrib.admin import site
+from django.core.cache import cache
+from django.core.management import call_command
+from django.forms import modelform_factory
+from django.db import connection, connections, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .admin import ArticleAdmin, ArticleAdminForm, EstimatedCountPaginator
+from . import counters, urls
+from .changes import record_queryset
+from .deletion import delete_subtree
+from .export import bibtex_escape
+from .importing import store_pdf
+from .management.commands.gc_media import sort_digests
+from .models import (
+    User, Journal, Volume, Issue, Article, ArticleCounter, ArticleStatsRollup, ArticleStatus, Change, PendingFileDeletion,
+    RoleChoices, StaleVersion,
+)
+from .projections import ArticleProjection, IssueProjection, Projection, VolumeProjection
+from .renderers import FastJSONRenderer
+from .review_queue import claim_articles, release_expired_leases, renew_lease
+from . import singleflight
+from .seeding import seed_dataset
+from .serializers import ArticleSerializer, CachedFieldsModelSerializer, IssueSerializer, VolumeSerializer
+from .startup import SETUP_SNIPPET, parse_importtime, profile_startup
+from .stats import bulk_status_update, dashboard, recompute
+from .tokens import RefreshToken
+from .views import UserListView, load_frontend_index
+
+
+class RendererTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=2, articles=3)
+
+    def test_fast_json_matches_drf_json(self):
+        data = ArticleSerializer(Article.objects.all(), many=True).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_raw_uuid_and_datetime(self):
+        article = Article.objects.first()
+        data = {'id': article.id, 'created_at': article.created_at}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_json_is_default(self):
+        response = self.client.get('/api/articles/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_msgpack_negotiation(self):
+        response = self.client.get('/api/articles/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(len(msgpack.unpackb(response.content)), 6)
+
+
+class ProjectionContractTests(TestCase):
+    """Projections must render byte-for-byte what the serializers render."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=2, volumes=2, issues=2, articles=2)
+        # An article outside any issue, with a payment proof.
+        cls.orphan = Article.objects.create(
+            title='Orphan', authors='A', publisher=User.objects.first(),
+            payment_proof='payment_proofs/orphan.png',
+        )
+
+    def assertSameJSON(self, serialized, projected):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(projected), renderer.render(serialized))
+
+    def test_articles(self):
+        self.assertSameJSON(
+            ArticleSerializer(Article.objects.all(), many=True).data,
+            ArticleProjection(Article.objects.all()).data,
+        )
+
+    def test_articles_with_request_context(self):
+        request = RequestFactory().get('/api/articles/')
+        self.assertSameJSON(
+            ArticleSerializer(Article.objects.all(), many=True, context={'request': request}).data,
+            ArticleProjection(Article.objects.all(), context={'request': request}).data,
+        )
+
+    def test_issues(self):
+        self.assertSameJSON(
+            IssueSerializer(Issue.objects.all(), many=True).data,
+            IssueProjection(Issue.objects.all()).data,
+        )
+
+    def test_volumes(self):
+        self.assertSameJSON(
+            VolumeSerializer(Volume.objects.all(), many=True).data,
+            VolumeProjection(Volume.objects.all()).data,
+        )
+
+    def test_constant_query_count(self):
+        with self.assertNumQueries(5):
+            ArticleProjection(Article.objects.all()).data
+
+    def test_base_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Projection(Article.objects.all())
+
+
+class SerializerFieldCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=2, issues=2, articles=2)
+
+    def test_same_output_as_stock_fields(self):
+        cached = JSONRenderer().render(VolumeSerializer(Volume.objects.all(), many=True).data)
+        with mock.patch.object(CachedFieldsModelSerializer, 'get_fields', ModelSerializer.get_fields):
+            stock = JSONRenderer().render(VolumeSerializer(Volume.objects.all(), many=True).data)
+        self.assertEqual(cached, stock)
+
+    def test_instances_get_their_own_fields(self):
+        first, second = VolumeSerializer(), VolumeSerializer()
+        self.assertIsNot(first.fields['issues'], second.fields['issues'])
+        self.assertIsNot(first.fields['issues'].child, second.fields['issues'].child)
+        self.assertIs(first.fields['issues'].parent, first)
+        first.fields.pop('year')
+        self.assertIn('year', VolumeSerializer().fields)
+
+    def test_template_built_once_per_class(self):
+        class Probe(ArticleSerializer):
+            class Meta(ArticleSerializer.Meta):
+                pass
+
+        with mock.patch.object(ModelSerializer, 'get_fields', autospec=True,
+                               side_effect=ModelSerializer.get_fields) as get_fields:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: Probe().fields, range(16)))
+        self.assertEqual(get_fields.call_count, 1)
+
+
+class FrontendServingTests(TestCase):
+    def setUp(self):
+        load_frontend_index.cache_clear()
+
+    def test_hashed_assets_are_immutable(self):
+        response = self.client.get('/assets/index-nBnZmk5r.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_client_routes_fall_back_to_index(self):
+        response = self.client.get('/journals/some-journal')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertIn(b'/assets/index-nBnZmk5r.js', response.content)
+
+        response = self.client.get('/dashboard', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_api_routes_are_not_swallowed(self):
+        self.assertEqual(self.client.get('/api/nope/').status_code, 404)
+
+    def test_collectstatic_precompresses(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            asset = Path(root) / 'frontend' / 'assets' / 'vendor-vK3nZf8G.js'
+            self.assertTrue(asset.with_name(asset.name + '.gz').exists())
+            self.assertTrue(asset.with_name(asset.name + '.br').exists())
+
+
+class LeanMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='admin@example.com', password='pw', name='Admin')
+
+    def test_api_skips_browser_middleware(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/journals/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Frame-Options', response)
+        self.assertFalse(any('django_session' in query['sql'] for query in queries))
+
+    def test_admin_keeps_browser_middleware(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', response.cookies)
+
+    def test_admin_still_checks_csrf(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        response = client.post('/admin/login/', {'username': 'admin@example.com', 'password': 'pw'})
+        self.assertEqual(response.status_code, 403)
+
+
+# Seconds for django.setup() in a fresh interpreter. Today's cold start is
+# ~0.4s; the default leaves room for slow CI machines, and
+# STARTUP_BUDGET_SECONDS tightens (or loosens) it.
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET_SECONDS', 3))
+
+# Web-only subsystems that must stay off the boot path of manage.py commands.
+WEB_ONLY_MODULES = {'rest_framework_simplejwt.tokens', 'prometheus_client', 'social_django', 'social_core'}
+
+
+class StartupBudgetTests(SimpleTestCase):
+    def test_cold_start_within_budget(self):
+        self.assertLess(profile_startup(importtime=False).seconds, STARTUP_BUDGET)
+
+    def test_management_commands_skip_web_only_modules(self):
+        snippet = "from django.core.management import ManagementUtility; ManagementUtility(['manage.py', 'help']).execute()"
+        with mock.patch.dict(os.environ):
+            os.environ.pop('SOCIAL_AUTH_ENABLED', None)
+            modules = profile_startup(SETUP_SNIPPET + '; ' + snippet, importtime=False).modules
+        self.assertEqual(WEB_ONLY_MODULES & modules, set())
+
+    def test_admin_is_not_loaded_by_setup(self):
+        modules = profile_startup(importtime=False).modules
+        self.assertNotIn('home_app.admin', modules)
+        self.assertNotIn('rest_framework_simplejwt.token_blacklist.admin', modules)
+
+    def test_social_auth_is_not_loaded_when_disabled(self):
+        with mock.patch.dict(os.environ, SOCIAL_AUTH_ENABLED='0'):
+            modules = profile_startup(importtime=False).modules
+        self.assertFalse({'social_django', 'social_core'} & modules)
+
+    def test_parse_importtime(self):
+        records = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       264 |     148777 | django.urls\n'
+            'import time:       535 |     148326 |   django.urls.base\n'
+        )
+        self.assertEqual(records[1], ('django.urls.base', 535, 148326, 1))
+
+
+class AdminScalabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=2, issues=2, articles=3)
+        cls.admin = User.objects.create_superuser('admin@example.com', 'pw')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelists_have_no_n_plus_one(self):
+        urls = ('/admin/home_app/article/', '/admin/home_app/issue/', '/admin/home_app/volume/')
+        for n, url in enumerate(urls):
+            self.client.get(url)  # warm up the session and content types
+            with CaptureQueriesContext(connection) as small:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            seed_dataset(journals=1, volumes=2, issues=2, articles=3, prefix=f'more{n}')
+            with CaptureQueriesContext(connection) as large:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(len(small), len(large), url)
+
+    def test_search_uses_indexes(self):
+        request = RequestFactory().get('/admin/')
+        request.user = self.admin
+        searches = {
+            User: ('SEED-Publisher', 'user_email_folded_idx', 'user_name_folded_idx'),
+            Journal: ('"Seed Journal"', 'sqlite_autoindex_home_app_journal'),
+            Issue: ('Issue', 'issue_title_idx'),
+            Article: ('Seed', 'article_title_idx'),
+        }
+        for model, (term, *indexes) in searches.items():
+            model_admin = site._registry[model]
+            queryset, _ = model_admin.get_search_results(request, model_admin.get_queryset(request), term)
+            self.assertTrue(queryset.exists(), model)
+            plan = queryset.explain()
+            table = model._meta.db_table
+            self.assertNotRegex(plan, rf'SCAN {table}\b', model)
+            for index in indexes:
+                self.assertIn(index, plan, model)
+
+    def test_estimated_count_for_unfiltered_changelist(self):
+        with mock.patch.object(EstimatedCountPaginator, 'exact_count_threshold', 0):
+            paginator = EstimatedCountPaginator(Article.objects.all(), 10)
+            self.assertGreaterEqual(paginator.count, Article.objects.count())
+
+    def test_publish_action_is_single_update(self):
+        approved = list(Article.objects.filter(status=ArticleStatus.APPROVED).values_list('pk', flat=True))
+        drafts = list(Article.objects.filter(status=ArticleStatus.DRAFT).values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post('/admin/home_app/article/', {
+                'action': 'mark_published',
+                '_selected_action': [str(pk) for pk in approved + drafts],
+            })
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "home_app_article"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Article.objects.filter(pk__in=approved, status=ArticleStatus.PUBLISHED).count(), len(approved))
+        self.assertFalse(Article.objects.filter(pk__in=drafts).exclude(status=ArticleStatus.DRAFT).exists())
+
+
+class UserDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=1, articles=1, publishers=30)
+        User.objects.filter(email__startswith='seed-publisher2').update(is_active=False)
+        User.objects.create_user('zoe@example.com', name='Zoe Reviewer', role=RoleChoices.REVIEWER)
+        User.objects.create_user('emile@example.com', name='Émile Strauß')
+        # Social-auth accounts can lack an email.
+        User.objects.create(name='No Email 1')
+        User.objects.create(name='No Email 2')
+
+    def test_filters(self):
+        response = self.client.get('/api/users/', {'role': 'reviewer'})
+        self.assertEqual(
+            [u['email'] for u in response.json()],
+            ['seed-publisher0@example.com', 'zoe@example.com'],
+        )
+        response = self.client.get('/api/users/', {'is_active': 'false'})
+        self.assertEqual(len(response.json()), 11)  # publisher2, publisher20..29
+        response = self.client.get('/api/users/', {'institution': 'University 1'})
+        self.assertEqual(len(response.json()), 10)
+
+    def test_prefix_search_is_case_insensitive(self):
+        response = self.client.get('/api/users/', {'q': 'ZOE'})
+        self.assertEqual([u['email'] for u in response.json()], ['zoe@example.com'])
+        response = self.client.get('/api/users/', {'q': 'publisher 1'})
+        self.assertEqual(len(response.json()), 11)  # Publisher 1, 10..19
+
+    def test_prefix_search_folds_non_ascii(self):
+        for q in ('ÉMILE', 'émile s', 'Émile STRAUSS'):
+            response = self.client.get('/api/users/', {'q': q})
+            self.assertEqual([u['email'] for u in response.json()], ['emile@example.com'], q)
+
+    def test_keyset_pagination(self):
+        seen = []
+        url = '/api/users/?limit=7'
+        while url:
+            response = self.client.get(url)
+            seen += [u['email'] for u in response.json()]
+            url = response.get('Link', '').partition('<')[2].partition('>')[0]
+        emails = sorted(User.objects.filter(email__isnull=False).values_list('email', flat=True))
+        self.assertEqual(seen, [None, None] + emails)
+
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get('/api/users/', {'cursor': 'nope'}).status_code, 400)
+
+    def test_compact_typeahead(self):
+        response = self.client.get('/api/users/', {'q': 'zo', 'compact': '1', 'role': 'REVIEWER'})
+        self.assertEqual(
+            set(response.json()[0]), {'id', 'name', 'email', 'Institution', 'role'}
+        )
+        with self.assertNumQueries(1):
+            self.client.get('/api/users/', {'q': 'pub', 'compact': '1', 'limit': 10})
+
+    def test_prefix_search_uses_the_folded_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite-specific')
+        users = UserListView().filter_users({'q': 'pub'})
+        sql, params = users.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('user_email_folded_idx', plan)
+        self.assertIn('user_name_folded_idx', plan)
+
+
+class BulkDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=2, volumes=2, issues=2, articles=3)
+
+    def test_journal_delete_is_set_based(self):
+        journal = self.data['journals'][0]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/journals/{journal.slug}/')
+        self.assertEqual(response.status_code, 204)
+        deletes = [q['sql'] for q in queries if q['sql'].startswith('DELETE') and 'rollup' not in q['sql']]
+        self.assertEqual(len(deletes), 5)  # counters, article, issue, volume, journal
+        self.assertFalse(Volume.objects.filter(journal=journal).exists())
+        self.assertEqual(Article.objects.count(), 12)
+        self.assertEqual(PendingFileDeletion.objects.count(), 12)
+
+        seed_dataset(journals=1, volumes=4, issues=4, articles=5, prefix='big')
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.delete('/api/journals/big-journal-0/')
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_issue_and_article_delete(self):
+        issue = self.data['issues'][0]
+        self.assertEqual(self.client.delete(f'/api/issues/{issue.pk}/').status_code, 204)
+        self.assertFalse(Article.objects.filter(issue_id=issue.pk).exists())
+        self.assertTrue(Volume.objects.filter(pk=issue.volume_id).exists())
+
+        article = Article.objects.first()
+        self.assertEqual(self.client.delete(f'/api/articles/{article.slug}/').status_code, 204)
+        self.assertEqual(Article.objects.count(), 20)
+        self.assertEqual(PendingFileDeletion.objects.count(), 4)
+
+    def test_purge_deleted_files(self):
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            gone = Path(media, 'articles', 'gone.pdf')
+            reused = Path(media, 'articles', 'seed-article-0.pdf')
+            for path in (gone, reused):
+                path.parent.mkdir(exist_ok=True)
+                path.write_bytes(b'%PDF')
+            PendingFileDeletion.objects.create(path='articles/gone.pdf')
+            PendingFileDeletion.objects.create(path='articles/seed-article-0.pdf')
+
+            call_command('purge_deleted_files', stdout=StringIO())
+
+            self.assertFalse(gone.exists())
+            self.assertTrue(reused.exists())
+            self.assertFalse(PendingFileDeletion.objects.exists())
+
+
+class MediaGarbageCollectorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=1, articles=2)
+
+    def make_file(self, media, name, age_hours):
+        path = Path(media, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * 10)
+        mtime = time.time() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_gc_media(self):
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            referenced = self.make_file(media, 'articles/seed-article-0.pdf', 48)
+            orphan = self.make_file(media, 'articles/old/orphan.pdf', 48)
+            proof = self.make_file(media, 'payment_proofs/orphan.png', 48)
+            fresh = self.make_file(media, 'articles/just-uploaded.pdf', 0)
+            unrelated = self.make_file(media, 'avatars/someone.png', 48)
+
+            out = StringIO()
+            call_command('gc_media', '--dry-run', stdout=out)
+            self.assertIn('2 orphan(s) would be deleted', out.getvalue())
+            self.assertTrue(orphan.exists())
+
+            call_command('gc_media', '--rate-limit', '1000', stdout=StringIO())
+            self.assertFalse(orphan.exists())
+            self.assertFalse(proof.exists())
+            for path in (referenced, fresh, unrelated):
+                self.assertTrue(path.exists(), path)
+
+    def test_sort_digests_merges_runs(self):
+        digests = array('Q', [(i * 2654435761) % 1000003 for i in range(1000)])
+        self.assertEqual(list(sort_digests(array('Q', digests), run_size=64)), sorted(digests))
+
+
+class ArticleConcurrencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=1, articles=2)
+
+    def setUp(self):
+        self.article = Article.objects.get(status=ArticleStatus.SUBMITTED)
+        self.url = f'/api/articles/{self.article.slug}/'
+
+    def put(self, data, **headers):
+        return self.client.put(self.url, data=data, content_type='application/json', headers=headers)
+
+    def test_transition_bumps_version(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.put({'status': ArticleStatus.UNDER_REVIEW}, **{'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], self.article.version + 1)
+        self.assertEqual(response['ETag'], f'"{self.article.version + 1}"')
+
+    def test_stale_version_conflicts(self):
+        self.assertEqual(self.put({'status': ArticleStatus.UNDER_REVIEW}, **{'If-Match': '"0"'}).status_code, 200)
+        # A second editor still holding version 0 loses instead of overwriting.
+        response = self.put({'status': ArticleStatus.REJECTED, 'version': 0})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['version'], 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.status, ArticleStatus.UNDER_REVIEW)
+
+    def test_invalid_transition(self):
+        response = self.put({'status': ArticleStatus.PUBLISHED})
+        self.assertEqual(response.status_code, 400)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.status, ArticleStatus.SUBMITTED)
+
+    def test_save_versioned_is_conditional(self):
+        first = Article.objects.get(pk=self.article.pk)
+        second = Article.objects.get(pk=self.article.pk)
+        first.payment_verified = True
+        first.save_versioned(['payment_verified'])
+        second.payment_verified = False
+        with self.assertRaises(StaleVersion):
+            second.save_versioned(['payment_verified'])
+
+    def test_plain_save_increments_in_the_database(self):
+        first = Article.objects.get(pk=self.article.pk)
+        stale = Article.objects.get(pk=self.article.pk)
+        first.save()
+        first.save(update_fields=['title'])
+        stale.save()
+        self.assertEqual(stale.version, self.article.version + 3)
+        self.assertEqual(Article.objects.get(pk=self.article.pk).version, self.article.version + 3)
+
+    def test_admin_form_enforces_transitions(self):
+        form_class = modelform_factory(Article, form=ArticleAdminForm, fields=['status'])
+        for status, valid in ((ArticleStatus.PUBLISHED, False), (ArticleStatus.UNDER_REVIEW, True)):
+            form = form_class(data={'status': status}, instance=Article.objects.get(pk=self.article.pk))
+            self.assertEqual(form.is_valid(), valid, status)
+
+
+@contextmanager
+def file_database(path):
+    """
+    Point this thread's default connection at the SQLite file ``path``. The
+    in-memory test database shares one cache between threads, so real
+    database-level locking only shows up on a file.
+    """
+    original = connections['default']
+    connections['default'] = original.__class__({**original.settings_dict, 'NAME': path}, 'default')
+    try:
+        yield
+    finally:
+        connections['default'].close()
+        connections['default'] = original
+
+
+def copy_test_schema(path):
+    """Create the test database's tables and indexes, empty, in the SQLite file ``path``."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'")
+        statements = [sql for sql, in cursor.fetchall()]
+    target = sqlite3.connect(path)
+    for sql in statements:
+        target.execute(sql)
+    target.close()
+
+
+def run_concurrently(path, work, threads=8):
+    """Run ``work(i)`` in ``threads`` threads on ``path``; returns (results, errors)."""
+    def run(i):
+        with file_database(path):
+            try:
+                return work(i), None
+            except Exception as exc:
+                return None, exc
+
+    with ThreadPoolExecutor(threads) as pool:
+        outcomes = list(pool.map(run, range(threads)))
+    return [r for r, _ in outcomes], [e for _, e in outcomes if e is not None]
+
+
+class ReviewQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=2, articles=6)  # 2 SUBMITTED per 6
+        cls.alice = User.objects.create_user('alice@example.com', role=RoleChoices.REVIEWER)
+        cls.bob = User.objects.create_user('bob@example.com', role=RoleChoices.REVIEWER)
+
+    def claim(self, user, batch):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post('/api/review-queue/claim/', {'batch': batch}, format='json')
+
+    def test_claims_are_disjoint_and_oldest_first(self):
+        submitted = list(
+            Article.objects.filter(status=ArticleStatus.SUBMITTED).order_by('created_at').values_list('slug', flat=True)
+        )
+        alice = [a['slug'] for a in self.claim(self.alice, 1).json()]
+        bob = [a['slug'] for a in self.claim(self.bob, 5).json()]
+        self.assertEqual(alice, submitted[:1])
+        self.assertEqual(sorted(bob), sorted(submitted[1:]))
+        self.assertEqual(self.claim(self.bob, 5).json(), [])
+        self.assertEqual(Article.objects.filter(reviewer=self.alice).count(), 1)
+
+    def test_claim_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            claim_articles(self.alice, 2)
+        self.assertEqual(sum(q['sql'].startswith('UPDATE "home_app_article"') for q in queries), 1)
+
+    def test_expired_leases_are_reclaimed(self):
+        claim_articles(self.alice, 10, lease=timedelta(seconds=-1))
+        self.assertEqual(claim_articles(self.bob, 10).count(), 2)
+
+        Article.objects.filter(reviewer=self.bob).update(lease_expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(release_expired_leases(), 2)
+        self.assertEqual(Article.objects.filter(status=ArticleStatus.SUBMITTED, reviewer=None).count(), 2)
+
+    def test_claims_with_skip_locked(self):
+        # SQLite leaves out FOR UPDATE itself; this runs the lock-first path.
+        with mock.patch.object(connection.features, 'has_select_for_update_skip_locked', True):
+            alice = set(claim_articles(self.alice, 1).values_list('pk', flat=True))
+            bob = set(claim_articles(self.bob, 5).values_list('pk', flat=True))
+        self.assertEqual((len(alice), len(bob)), (1, 1))
+        self.assertFalse(alice & bob)
+
+    def test_renewing_keeps_the_version(self):
+        claim_articles(self.alice, 1)
+        article = Article.objects.get(reviewer=self.alice)
+        self.assertEqual(renew_lease(self.alice, Article.objects.all()), 1)
+        article.title = 'Reviewed'
+        article.save_versioned(['title'])
+
+    def test_concurrent_claims_each_get_their_own_articles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'db.sqlite3')
+            copy_test_schema(path)
+            with file_database(path):
+                seed_dataset(journals=1, volumes=1, issues=4, articles=15, prefix='race')
+                reviewers = [
+                    User.objects.create_user(f'race-reviewer{i}@example.com', role=RoleChoices.REVIEWER)
+                    for i in range(8)
+                ]
+                submitted = set(Article.objects.filter(status=ArticleStatus.SUBMITTED).values_list('pk', flat=True))
+
+                def claim(i):
+                    return [pk for _ in range(5) for pk in claim_articles(reviewers[i], 2).values_list('pk', flat=True)]
+
+                results, errors = run_concurrently(path, claim)
+                self.assertEqual(errors, [])
+                claimed = [pk for pks in results for pk in pks]
+                self.assertEqual(len(claimed), len(set(claimed)))
+                self.assertEqual(set(claimed), submitted)
+                self.assertFalse(Article.objects.filter(status=ArticleStatus.SUBMITTED).exists())
+
+    def test_only_reviewers_can_claim(self):
+        publisher = User.objects.filter(role=RoleChoices.PUBLISHER).first()
+        self.assertEqual(self.claim(publisher, 1).status_code, 403)
+        self.assertEqual(APIClient().post('/api/review-queue/claim/').status_code, 401)
+
+
+class StatsRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=2, volumes=2, issues=2, articles=6)
+        cls.reviewer = User.objects.create_user('stats-reviewer@example.com', role=RoleChoices.REVIEWER)
+
+    def snapshot(self):
+        return {
+            (r.journal_id, r.year, r.month, r.status): r.count
+            for r in ArticleStatsRollup.objects.filter(count__gt=0)
+        }
+
+    def assertMatchesRecompute(self):
+        incremental = self.snapshot()
+        recompute()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_incremental_deltas_match_recompute(self):
+        issues = self.data['issues']
+        publisher = self.data['users'][1]
+        Article.objects.create(
+            title='New', authors='A', abstract='B', file='articles/new.pdf', issue=issues[0], publisher=publisher
+        )
+        Article.objects.create(title='Loose', authors='A', abstract='B', file='articles/loose.pdf', publisher=publisher)
+
+        article = Article.objects.filter(status=ArticleStatus.SUBMITTED).first()
+        response = self.client.put(
+            f'/api/articles/{article.slug}/', data={'status': ArticleStatus.UNDER_REVIEW},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        moved = Article.objects.filter(issue=issues[1]).first()
+        moved.issue = issues[-1]
+        moved.save()
+
+        admin_action = ArticleAdmin.actions[0]
+        with mock.patch.object(ArticleAdmin, 'message_user'):
+            admin_action(ArticleAdmin(Article, None), None, Article.objects.all())
+        claim_articles(self.reviewer, 3, lease=timedelta(seconds=-1))
+        release_expired_leases()
+
+        delete_subtree(Issue.objects.filter(pk=issues[2].pk))
+        self.client.delete(f'/api/journals/{self.data["journals"][1].slug}/')
+        Article.objects.filter(issue=issues[3]).first().delete()
+
+        self.assertMatchesRecompute()
+        self.assertEqual(sum(self.snapshot().values()), Article.objects.count())
+
+    def test_volume_moving_journal_recomputes(self):
+        volume = Volume.objects.get(pk=self.data['volumes'][0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            volume.journal = self.data['journals'][1]
+            volume.number = 99
+            volume.save()
+        self.assertMatchesRecompute()
+
+    def test_migration_backfills_existing_articles(self):
+        expected = self.snapshot()
+        ArticleStatsRollup.objects.all().delete()
+        importlib.import_module('home_app.migrations.0008_article_stats_rollup').backfill(django_apps, None)
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_concurrent_status_updates_keep_the_rollups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'db.sqlite3')
+            copy_test_schema(path)
+            with file_database(path):
+                seed_dataset(journals=2, volumes=1, issues=2, articles=10, prefix='race')
+                reviewers = [
+                    User.objects.create_user(f'race-reviewer{i}@example.com', role=RoleChoices.REVIEWER)
+                    for i in range(8)
+                ]
+
+                def churn(i):
+                    for _ in range(5):
+                        claim_articles(reviewers[i], 2, lease=timedelta(seconds=-1))
+                        release_expired_leases()
+
+                self.assertEqual(run_concurrently(path, churn)[1], [])
+                self.assertMatchesRecompute()
+
+    def test_endpoint_reads_only_rollups(self):
+        self.assertEqual(self.client.get('/api/stats/articles/').status_code, 401)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reviewer)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/stats/articles/', {'group_by': 'journal,status'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('home_app_article"' in q['sql'] for q in queries))
+        rows = response.json()
+        self.assertEqual(sum(row['total'] for row in rows), Article.objects.count())
+        self.assertEqual({row['journal']['name'] for row in rows}, {'Seed Journal 0', 'Seed Journal 1'})
+        self.assertEqual(len(rows), len(dashboard(['journal', 'status'])))
+
+        self.assertEqual(self.client.get('/api/stats/articles/', {'group_by': 'nope'}).status_code, 400)
+
+
+class ChangeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=1, volumes=1, issues=2, articles=5)
+
+    def feed(self, cursor=None, **params):
+        if cursor:
+            params['since'] = cursor
+        response = self.client.get('/api/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def drain(self, cursor=None):
+        entries = []
+        while True:
+            page = self.feed(cursor, limit=4)
+            entries += page['changes']
+            cursor = page['next']
+            if not page['has_more']:
+                return entries, cursor
+
+    def test_full_sync_then_delta(self):
+        entries, cursor = self.drain()
+        self.assertEqual(
+            {entry['model'] for entry in entries}, {'journal', 'volume', 'issue', 'article'}
+        )
+        self.assertEqual(sum(entry['model'] == 'article' for entry in entries), 10)
+        self.assertEqual(self.feed(cursor)['changes'], [])
+
+        article = Article.objects.filter(issue=self.data['issues'][0]).first()
+        self.client.put(
+            f'/api/articles/{article.slug}/', data={'title': 'Renamed'}, content_type='application/json'
+        )
+        self.client.put(
+            f'/api/articles/{article.slug}/', data={'title': 'Renamed twice'}, content_type='application/json'
+        )
+        delete_subtree(Issue.objects.filter(pk=self.data['issues'][1].pk))
+
+        page = self.feed(cursor)
+        changed = [entry for entry in page['changes'] if not entry['deleted']]
+        self.assertEqual(
+            [(entry['id'], entry['data']['title']) for entry in changed], [(str(article.pk), 'Renamed twice')]
+        )
+        tombstones = [entry for entry in page['changes'] if entry['deleted']]
+        self.assertEqual(len(tombstones), 6)  # the issue and its 5 articles
+        self.assertTrue(all(entry['data'] is None for entry in tombstones))
+        self.assertEqual([e['seq'] for e in page['changes']], sorted(e['seq'] for e in page['changes']))
+
+    def test_bulk_writes_are_recorded(self):
+        _, cursor = self.drain()
+        reviewer = User.objects.create_user('feed-reviewer@example.com', role=RoleChoices.REVIEWER)
+        claimed = {str(pk) for pk in claim_articles(reviewer, 2).values_list('pk', flat=True)}
+        ids = {entry['id'] for entry in self.feed(cursor)['changes'] if entry['model'] == 'article'}
+        self.assertEqual(ids, claimed)
+
+    def test_compaction_keeps_latest_change_per_row(self):
+        article = Article.objects.first()
+        article.title = 'Edited'
+        article.save()
+        call_command('compact_changes', stdout=StringIO())
+        entries, _ = self.drain()
+        self.assertEqual(len(entries), 1 + 1 + 2 + 10)
+        self.assertEqual(next(e for e in entries if e['id'] == str(article.pk))['data']['title'], 'Edited')
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/changes/', {'since': 'nope'}).status_code, 400)
+
+
+@override_settings(SSE_POLL_INTERVAL=0.01)
+class StatusEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=1, volumes=1, issues=1, articles=4, publishers=2)
+        cls.publisher = cls.data['users'][1]
+
+    async def open_stream(self, user, **extra):
+        token = str(AccessToken.for_user(user))
+        response = await self.async_client.get('/api/events/article-status/', {'token': token}, **extra)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertIn(b'retry:', await anext(chunks))
+        return response, chunks
+
+    def approve(self, articles):
+        with transaction.atomic():
+            record_queryset(articles)
+            bulk_status_update(articles, ArticleStatus.APPROVED)
+
+    async def test_status_change_reaches_its_publisher_only(self):
+        response, chunks = await self.open_stream(self.publisher)
+        other_response, other_chunks = await self.open_stream(self.data['users'][0])
+        own = Article.objects.filter(publisher=self.publisher).exclude(status=ArticleStatus.APPROVED)
+        own_pk = (await own.afirst()).pk
+        await sync_to_async(self.approve)(Article.objects.filter(pk=own_pk))
+
+        event = (await asyncio.wait_for(anext(chunks), 5)).decode()
+        self.assertIn('event: status', event)
+        self.assertIn(f'"id": "{own_pk}"', event)
+        self.assertIn('"status": "APPROVED"', event)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(anext(other_chunks), 0.1)
+        await chunks.aclose()
+        await other_chunks.aclose()
+
+    async def test_reconnect_replays_missed_changes(self):
+        seq = (await Change.objects.order_by('-id').afirst()).pk
+        own = await Article.objects.filter(publisher=self.publisher).exclude(status=ArticleStatus.APPROVED).afirst()
+        await sync_to_async(self.approve)(Article.objects.filter(pk=own.pk))
+
+        _, chunks = await self.open_stream(self.publisher, headers={'Last-Event-ID': str(seq)})
+        event = (await asyncio.wait_for(anext(chunks), 5)).decode()
+        self.assertIn(f'"id": "{own.pk}"', event)
+        await chunks.aclose()
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get('/api/events/article-status/').status_code, 401)
+        self.assertEqual(self.client.get('/api/events/article-status/', {'token': 'nope'}).status_code, 401)
+
+
+@override_settings(OAI_PAGE_SIZE=4)
+class OAIPMHTests(TestCase):
+    ns = {'oai': 'http://www.openarchives.org/OAI/2.0/', 'dc': 'http://purl.org/dc/elements/1.1/'}
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=2, volumes=1, issues=3, articles=6)  # one in six is PUBLISHED
+        cls.published = Article.objects.filter(status=ArticleStatus.PUBLISHED)
+
+    def oai(self, **params):
+        response = self.client.get('/api/oai/', params)
+        self.assertEqual(response.status_code, 200)
+        return ElementTree.fromstring(b''.join(response.streaming_content))
+
+    def test_identify(self):
+        root = self.oai(verb='Identify')
+        self.assertEqual(root.find('oai:Identify/oai:protocolVersion', self.ns).text, '2.0')
+
+    def test_list_records_pages_with_keyset_tokens(self):
+        seen = []
+        params = {'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                root = self.oai(**params)
+            self.assertFalse(any('OFFSET' in q['sql'] for q in queries))
+            seen += [node.text for node in root.iterfind('.//oai:record/oai:header/oai:identifier', self.ns)]
+            token = root.find('.//oai:resumptionToken', self.ns)
+            if token is None or not token.text:
+                break
+            params = {'verb': 'ListRecords', 'resumptionToken': token.text}
+        self.assertEqual(len(seen), self.published.count())
+        self.assertEqual(len(set(seen)), len(seen))
+        self.assertGreater(len(seen), 4)
+
+    def test_list_identifiers_by_set_and_get_record(self):
+        root = self.oai(verb='ListIdentifiers', metadataPrefix='oai_dc', set='seed-journal-1')
+        headers = root.findall('.//oai:header', self.ns)
+        self.assertTrue(headers)
+        self.assertEqual({h.find('oai:setSpec', self.ns).text for h in headers}, {'seed-journal-1'})
+
+        identifier = headers[0].find('oai:identifier', self.ns).text
+        record = self.oai(verb='GetRecord', metadataPrefix='oai_dc', identifier=identifier)
+        self.assertTrue(record.find('.//dc:title', self.ns).text)
+        self.assertTrue(record.find('.//dc:identifier', self.ns).text.startswith('http://testserver/'))
+
+    def test_errors(self):
+        def code(**params):
+            return self.oai(**params).find('oai:error', self.ns).get('code')
+
+        self.assertEqual(code(verb='Nope'), 'badVerb')
+        self.assertEqual(code(verb='ListRecords'), 'badArgument')
+        self.assertEqual(code(verb='ListRecords', metadataPrefix='marc'), 'cannotDisseminateFormat')
+        self.assertEqual(code(verb='ListRecords', resumptionToken='junk'), 'badResumptionToken')
+        self.assertEqual(code(verb='ListRecords', metadataPrefix='oai_dc', set='missing'), 'noRecordsMatch')
+        self.assertEqual(code(verb='GetRecord', metadataPrefix='oai_dc', identifier='oai:x:y'), 'idDoesNotExist')
+
+
+class ArticleExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=2, volumes=1, issues=2, articles=6)
+        cls.published = Article.objects.filter(status=ArticleStatus.PUBLISHED).count()
+
+    def export(self, **params):
+        response = self.client.get('/api/export/articles/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_formats(self):
+        rows = list(csv.DictReader(StringIO(self.export(format='csv'))))
+        self.assertEqual(len(rows), self.published)
+        self.assertEqual({row['status'] for row in rows}, {'PUBLISHED'})
+        self.assertTrue(rows[0]['file'].startswith('http://testserver/'))
+
+        lines = self.export(format='jsonl', status='all').splitlines()
+        self.assertEqual(len(lines), Article.objects.count())
+        self.assertIn('journal', json.loads(lines[0]))
+
+        bibtex = self.export(format='bibtex')
+        self.assertEqual(bibtex.count('@article{'), self.published)
+        self.assertIn('author = {Author 0 and Co-Author 1}', bibtex)
+
+        ris = self.export(format='ris', journal='seed-journal-0')
+        self.assertEqual(ris.count('ER  - '), self.published // 2)
+        self.assertIn('JO  - Seed Journal 0', ris)
+
+    def test_bibtex_escape_round_trips(self):
+        value = r'50% of {x_i} & $y$ #1 ~ a^b \ c'
+        escaped = bibtex_escape(value)
+        self.assertEqual(
+            escaped,
+            r'50\% of \{x\_i\} \& \$y\$ \#1 \textasciitilde{} a\textasciicircum{}b \textbackslash{} c',
+        )
+        # What LaTeX typesets, read back.
+        commands = {r'\textbackslash{}': '\\', r'\textasciitilde{}': '~', r'\textasciicircum{}': '^'}
+        decoded = re.sub(
+            r'\\text\w+\{\}|\\(.)', lambda m: m.group(1) or commands[m.group()], escaped,
+        )
+        self.assertEqual(decoded, value)
+
+    def test_single_query_and_bad_arguments(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.export(format='csv', status='all')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.client.get('/api/export/articles/', {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/export/articles/', {'status': 'nope'}).status_code, 400)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'articles.ris')
+            call_command('export_articles', format='ris', output=path, base_url='https://example.org')
+            content = Path(path).read_text()
+        self.assertEqual(content.count('TY  - JOUR'), self.published)
+        self.assertIn('UR  - https://example.org/', content)
+
+
+class ImportArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.publisher = User.objects.create_user('archive@example.com')
+        cls.editor = User.objects.create_user('editor@example.com')
+
+    def write_archive(self, directory):
+        pdfs = Path(directory, 'pdfs')
+        pdfs.mkdir()
+        Path(pdfs, 'a.pdf').write_bytes(b'%PDF-a')
+        Path(pdfs, 'b.pdf').write_bytes(b'%PDF-b')
+        Path(pdfs, 'a-again.pdf').write_bytes(b'%PDF-a')
+        base = {'journal': 'Archive Journal', 'issn': '1111-2222', 'volume': 1, 'year': 1999, 'authors': 'A, B'}
+        lines = [
+            dict(base, issue=1, month=3, title='First', pdf='a.pdf'),
+            dict(base, issue=1, month=3, title='Second', pdf='b.pdf', publisher='editor@example.com'),
+            dict(base, issue=2, title='Third', pdf='a-again.pdf', status='draft'),
+            dict(base, issue=2, title='Lost', pdf='missing.pdf'),
+        ]
+        manifest = Path(directory, 'manifest.jsonl')
+        manifest.write_text('\n'.join([json.dumps(line) for line in lines] + ['{"journal": "no volume"}']))
+        return manifest, pdfs
+
+    def run_import(self, manifest, pdfs, workers):
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_archive', str(manifest), pdf_root=str(pdfs), publisher='archive@example.com',
+            batch_size=2, workers=workers, stdout=out, stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(MEDIA_ROOT=directory):
+            manifest, pdfs = self.write_archive(directory)
+            out, err = self.run_import(manifest, pdfs, workers=2)
+            self.assertIn('3 article(s) imported, 0 already present, 2 error(s)', out)
+            self.assertIn('line 4:', err)
+            self.assertIn('line 5: KeyError', err)
+
+            articles = Article.objects.filter(issue__volume__journal__slug='archive-journal')
+            self.assertEqual(articles.count(), 3)
+            self.assertEqual(Issue.objects.filter(volume__journal__slug='archive-journal').count(), 2)
+            first, third = articles.get(title='First'), articles.get(title='Third')
+            # Identical PDFs are stored once, under their content hash.
+            self.assertEqual(first.file.name, third.file.name)
+            self.assertTrue(first.file.name.startswith('articles/archive/'))
+            self.assertTrue(os.path.exists(first.file.path))
+            self.assertEqual(third.status, ArticleStatus.DRAFT)
+            self.assertEqual(articles.get(title='Second').publisher, self.editor)
+            self.assertEqual(
+                set(Change.objects.filter(model='article').values_list('object_id', flat=True)),
+                set(articles.values_list('pk', flat=True)),
+            )
+            self.assertEqual(
+                dashboard(['status']),
+                [{'status': 'DRAFT', 'total': 1}, {'status': 'PUBLISHED', 'total': 2}],
+            )
+
+            # A rerun (say, after fixing the missing PDF) only adds what is new.
+            Path(pdfs, 'missing.pdf').write_bytes(b'%PDF-lost')
+            out, _ = self.run_import(manifest, pdfs, workers=0)
+            self.assertIn('1 article(s) imported, 3 already present, 1 error(s)', out)
+            self.assertEqual(articles.count(), 4)
+            stored = [path for path in Path(directory, 'articles').rglob('*') if path.is_file()]
+            self.assertEqual(len(stored), 3)
+
+
+    def test_reused_pdf_is_refreshed_for_gc(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory, 'paper.pdf')
+            source.write_bytes(b'%PDF-x')
+            name, _, error = store_pdf(str(source), directory)
+            self.assertIsNone(error)
+            target = Path(directory, name)
+            self.assertEqual(target.stat().st_mode & 0o777, 0o644)
+            old = time.time() - 7 * 24 * 3600
+            os.utime(target, (old, old))
+
+            self.assertEqual(store_pdf(str(source), directory)[0], name)
+            self.assertGreater(target.stat().st_mtime, old + 3600)
+            self.assertEqual(len(list(Path(directory, 'articles/archive').rglob('*'))), 2)  # the file and its directory
+
+class SingleFlightTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=1, volumes=1, issues=2, articles=3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_callers_share_one_build(self):
+        builds = []
+        release = threading.Event()
+
+        def build():
+            builds.append(1)
+            release.wait(5)
+            return {'payload': len(builds)}
+
+        with mock.patch('home_app.singleflight.latest_seq', return_value=1), ThreadPoolExecutor(8) as pool:
+            results = [pool.submit(singleflight.get_or_build, 'herd', build) for _ in range(8)]
+            time.sleep(0.1)
+            release.set()
+            self.assertEqual([result.result() for result in results], [{'payload': 1}] * 8)
+        self.assertEqual(len(builds), 1)
+
+    def test_waits_on_another_process_lease(self):
+        cache_key = 'single-flight:' + hashlib.sha256(b'remote').hexdigest()
+        cache.add(f'{cache_key}:lease', 1)
+        threading.Timer(0.1, cache.set, (cache_key, (1, 'built elsewhere'))).start()
+        build = mock.Mock(return_value='built here')
+        with mock.patch('home_app.singleflight.latest_seq', return_value=1):
+            self.assertEqual(singleflight.get_or_build('remote', build), 'built elsewhere')
+        build.assert_not_called()
+
+        # A newer sequence is rebuilt; with stale_ok, a caller finding the
+        # lease held gets the old entry instead of waiting.
+        with mock.patch('home_app.singleflight.latest_seq', return_value=2):
+            self.assertEqual(singleflight.get_or_build('remote', build, stale_ok=True), 'built elsewhere')
+            cache.delete(f'{cache_key}:lease')
+            self.assertEqual(singleflight.get_or_build('remote', build, stale_ok=True), 'built here')
+        build.assert_called_once()
+
+    def test_views_rebuild_after_a_write(self):
+        issue = self.data['issues'][0]
+        urls = [
+            '/api/journals/detailed/',
+            f'/api/journals/{issue.volume.journal.slug}/volumes/{issue.volume_id}/{issue.id}/',
+        ]
+        for url in urls:
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).json(), first.json())
+            self.assertEqual(len(queries), 1)
+
+        article = Article.objects.get(pk=self.data['articles'][0].pk)
+        article.title = 'Retitled'
+        article.save()
+        payload = self.client.get(urls[1]).json()
+        self.assertIn('Retitled', [row['title'] for row in payload['articles']])
+
+
+class ArticleCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=1, volumes=1, issues=3, articles=6)
+        cls.published = list(Article.objects.filter(status=ArticleStatus.PUBLISHED).order_by('slug'))
+        cls.draft = Article.objects.exclude(status=ArticleStatus.PUBLISHED).first()
+
+    def setUp(self):
+        counters._pending.clear()
+        self.addCleanup(counters._pending.clear)
+
+    @override_settings(COUNTER_FLUSH_INTERVAL=3600)
+    def test_hits_are_buffered_then_upserted(self):
+        article = self.published[0]
+        for _ in range(3):
+            self.assertEqual(self.client.get(f'/api/articles/{article.slug}/').status_code, 200)
+        response = self.client.get(f'/api/articles/{article.slug}/download/')
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(ArticleCounter.objects.exists())
+
+        with self.assertNumQueries(4):  # savepoint, existing ids, upsert, release
+            self.assertEqual(counters.flush(), 1)
+        counters.hit(article.pk)
+        counters.hit(self.published[1].pk, 'downloads')
+        counters.flush()
+        self.assertEqual(
+            list(ArticleCounter.objects.order_by('-views').values_list('article_id', 'views', 'downloads')),
+            [(article.pk, 4, 1), (self.published[1].pk, 0, 1)],
+        )
+        payload = self.client.get(f'/api/articles/{article.slug}/').json()
+        self.assertEqual((payload['views'], payload['downloads']), (4, 1))
+
+    @override_settings(COUNTER_FLUSH_INTERVAL=0)
+    def test_flushed_at_request_end_and_ranked(self):
+        for article, views in zip(self.published, (1, 3, 2)):
+            for _ in range(views):
+                self.client.get(f'/api/articles/{article.slug}/')
+        for _ in range(5):
+            self.client.get(f'/api/articles/{self.draft.slug}/')
+        self.assertFalse(counters._pending)
+
+        ranking = self.client.get('/api/articles/most-read/', {'limit': 2}).json()
+        self.assertEqual([row['slug'] for row in ranking], [self.published[1].slug, self.published[2].slug])
+        self.assertEqual(self.client.get('/api/articles/most-read/', {'by': 'likes'}).status_code, 400)
+
+        with CaptureQueriesContext(connection) as queries:
+            counters.most_read('views', 2)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('counter_views_idx', counters.ranked('views')[:50].explain())
+
+    def test_flushed_without_traffic_and_backlog_reported(self):
+        def gauge():
+            return REGISTRY.get_sample_value('ujoset_unflushed_article_counters')
+
+        flushed = threading.Event()
+
+        def flush():
+            counters._take()
+            flushed.set()
+
+        with mock.patch.object(counters, 'flush', flush):
+            with override_settings(COUNTER_FLUSH_THREAD=True, COUNTER_FLUSH_INTERVAL=0.05):
+                counters.hit(self.published[0].pk)
+                counters.hit(self.published[1].pk)
+                self.assertEqual(gauge(), 2)
+                # No request comes in; the thread flushes on its own.
+                self.assertTrue(flushed.wait(5))
+                self.assertEqual(gauge(), 0)
+            counters._flusher.join(5)
+        self.assertFalse(counters._flusher.is_alive())
+
+    def test_deleted_articles_are_dropped(self):
+        article = self.published[0]
+        counters.hit(article.pk)
+        counters.flush()
+        counters.hit(article.pk)
+        delete_subtree(Article.objects.filter(pk=article.pk))
+        self.assertEqual(counters.flush(), 0)
+        self.assertFalse(ArticleCounter.objects.exists())
+
+
+class StaticSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=2, volumes=1, issues=2, articles=6)
+
+    def publish(self, root, *args):
+        out = StringIO()
+        call_command('publish_static', '--root', root, '--base-url', 'http://testserver', *args, stdout=out)
+        return out.getvalue()
+
+    def read(self, root, path):
+        return Path(root, path).read_bytes()
+
+    def test_files_are_world_readable(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.publish(root)
+            files = [path for path in Path(root).rglob('*') if path.is_file()]
+            self.assertTrue(any(path.name.endswith('.json.gz') for path in files))
+            for path in files:
+                self.assertEqual(path.stat().st_mode & 0o777, 0o644, path)
+
+    def test_snapshot_matches_api_and_updates_incrementally(self):
+        issue = self.data['issues'][0]
+        journal = issue.volume.journal
+        article = Article.objects.filter(issue=issue, status=ArticleStatus.PUBLISHED).first()
+        draft = Article.objects.filter(issue=issue, status=ArticleStatus.APPROVED).first()
+        issue_file = f'api/journals/{journal.slug}/volumes/{issue.volume_id}/{issue.pk}/index.json'
+        with tempfile.TemporaryDirectory() as root:
+            self.assertIn('Full snapshot', self.publish(root))
+            published = Article.objects.filter(status=ArticleStatus.PUBLISHED).count()
+            self.assertEqual(len(list(Path(root, 'api/articles').iterdir())), published)
+            self.assertFalse(Path(root, f'api/articles/{draft.slug}').exists())
+            for path, url in (
+                (f'api/journals_data/{journal.slug}.json', f'/api/journals_data/{journal.slug}'),
+                (issue_file, f'/{issue_file[:-len("index.json")]}'),
+                (f'api/articles/{article.slug}/index.json', f'/api/articles/{article.slug}/'),
+            ):
+                self.assertEqual(self.read(root, path), self.client.get(url).content, path)
+                self.assertEqual(gzip.decompress(self.read(root, path + '.gz')), self.read(root, path))
+                self.assertTrue(Path(root, path + '.br').exists())
+
+            # Nothing changed: nothing rewritten.
+            self.assertIn('0 file(s) written, 0 removed', self.publish(root))
+
+            # Publishing one article rewrites it, its issue and its journal.
+            draft.status = ArticleStatus.PUBLISHED
+            draft.save()
+            self.assertIn('Incremental snapshot', self.publish(root))
+            self.assertIn(draft.slug.encode(), self.read(root, issue_file))
+            self.assertTrue(Path(root, f'api/articles/{draft.slug}/index.json').exists())
+            out = self.publish(root)
+            self.assertIn('0 file(s) written', out)
+
+            # Unpublishing or deleting removes the file and refreshes the parents.
+            draft.status = ArticleStatus.DRAFT
+            draft.save_versioned(['status'])
+            delete_subtree(Article.objects.filter(pk=article.pk))
+            self.assertIn('2 file(s) written, 2 removed', self.publish(root))
+            self.assertFalse(Path(root, f'api/articles/{article.slug}').exists())
+            self.assertNotIn(article.slug.encode(), self.read(root, issue_file))
+
+            # A journal rename moves its files.
+            Journal.objects.filter(pk=journal.pk).update(slug='renamed')
+            record_queryset(Journal.objects.filter(pk=journal.pk))
+            self.publish(root)
+            self.assertTrue(Path(root, 'api/journals_data/renamed.json').exists())
+            self.assertFalse(Path(root, f'api/journals_data/{journal.slug}.json').exists())
+            self.assertFalse(Path(root, issue_file).exists())
+
+
+class TokenBlacklistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='reader@example.com', password='pw', name='Reader')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_refresh_and_blacklist(self):
+        refresh = self.client.post('/api/login/', {'email': 'reader@example.com', 'password': 'pw'}).json()['refresh']
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+
+        self.assertEqual(self.client.post('/api/token/blacklist/', {'refresh': refresh}).status_code, 200)
+        self.assertEqual(self.client.post('/api/token/refresh/', {'refresh': refresh}).status_code, 401)
+
+    def test_not_blacklisted_is_only_cached_when_shared(self):
+        encoded = str(RefreshToken.for_user(self.user))
+        RefreshToken(encoded)
+        # LocMemCache: another worker could blacklist the token meanwhile.
+        with self.assertNumQueries(1):
+            RefreshToken(encoded)
+        with mock.patch('home_app.tokens.is_shared', return_value=True):
+            RefreshToken(encoded)
+            with self.assertNumQueries(0):
+                RefreshToken(encoded)
+
+    def test_blacklist_check_is_cached(self):
+        encoded = str(RefreshToken.for_user(self.user))
+        # Blacklisting updates the cached answer; un-blacklisting drops it.
+        RefreshToken(encoded).blacklist()
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            RefreshToken(encoded)
+        BlacklistedToken.objects.get(token__jti=RefreshToken(encoded, verify=False)['jti']).delete()
+        RefreshToken(encoded)
+
+    def test_prune_removes_expired_tokens_in_batches(self):
+        now = timezone.now()
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=self.user, jti=f'old-{i}', token='', expires_at=now - timedelta(days=1))
+            for i in range(5)
+        ])
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti='old-0'))
+        live = RefreshToken.for_user(self.user)
+
+        out = StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=out)
+        self.assertIn('5 expired token(s) removed', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class ArticleFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset(journals=2, volumes=2, issues=2, articles=12)
+        cls.journal = cls.data['journals'][0]
+
+    def assertPlaced(self):
+        for article in Article.objects.select_related('issue__volume'):
+            volume = article.issue.volume if article.issue else None
+            self.assertEqual(
+                (article.journal_id, article.year),
+                (volume.journal_id, volume.year) if volume else (None, None),
+                article.slug,
+            )
+
+    def test_copies_follow_moves(self):
+        other = Volume.objects.exclude(journal=self.journal).first()
+        issue = Issue.objects.filter(volume__journal=self.journal).first()
+        issue.volume, issue.number = other, 99
+        issue.save()
+        self.assertPlaced()
+
+        volume = Volume.objects.get(pk=other.pk)
+        volume.year, volume.number, volume.journal = 1999, 99, self.journal
+        volume.save()
+        self.assertPlaced()
+
+        article = Article.objects.filter(issue=issue).first()
+        article.issue = Issue.objects.exclude(pk=issue.pk).first()
+        article.save_versioned(['issue'])
+        article = Article.objects.exclude(issue=issue).first()
+        article.issue = None
+        article.save()
+        self.assertPlaced()
+
+    def test_created_instances_track_their_moves(self):
+        # Saved again straight after create(), without being reloaded.
+        volume = Volume.objects.create(journal=self.journal, number=98, year=2001)
+        issue = Issue.objects.create(volume=volume, number=97, month=1)
+        article = Article.objects.filter(issue__volume__journal=self.journal).first()
+        article.issue = issue
+        article.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            volume.year = 2002
+            volume.save()
+        self.assertPlaced()
+
+        other = Volume.objects.exclude(journal=self.journal).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.volume = other
+            issue.save()
+        self.assertPlaced()
+        # The move also recomputed the rollups of both journals.
+        rollups = list(ArticleStatsRollup.objects.filter(count__gt=0).order_by('pk').values_list(
+            'journal_id', 'year', 'month', 'status', 'count',
+        ))
+        recompute()
+        self.assertCountEqual(rollups, ArticleStatsRollup.objects.filter(count__gt=0).values_list(
+            'journal_id', 'year', 'month', 'status', 'count',
+        ))
+
+    def test_pages_through_journal_and_year(self):
+        year = Volume.objects.filter(journal=self.journal).first().year
+        expected = list(
+            Article.objects.filter(
+                issue__volume__journal=self.journal, issue__volume__year=year, status=ArticleStatus.PUBLISHED,
+            ).order_by('-created_at', '-id').values_list('slug', flat=True)
+        )
+        self.assertGreater(len(expected), 2)
+        seen, url = [], f'/api/articles/feed/?journal={self.journal.slug}&year={year}&limit=2'
+        while url:
+            response = self.client.get(url)
+            seen += [article['slug'] for article in response.json()]
+            url = response.get('Link', '').partition('<')[2].partition('>')[0]
+        self.assertEqual(seen, expected)
+
+    def test_rejects_bad_filters(self):
+        self.assertEqual(self.client.get('/api/articles/feed/?status=nope').status_code, 400)
+        self.assertEqual(self.client.get('/api/articles/feed/?year=nope').status_code, 400)
+        self.assertEqual(self.client.get('/api/articles/feed/?journal=nope').status_code, 404)
+
+    def test_latest_in_journal_is_an_index_range_scan(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite-specific')
+        for filters, index in (
+            ({}, 'article_journal_feed_idx'),
+            ({'year': 2020}, 'article_journal_year_idx'),
+        ):
+            query = Article.objects.filter(
+                journal=self.journal, status=ArticleStatus.PUBLISHED, **filters,
+            ).order_by('-created_at', '-id')[:20]
+            sql, params = query.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            self.assertIn(index, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(journals=1, volumes=1, issues=1, articles=2)
+        User.objects.create_user(email='reader@example.com', password='pw', name='Reader')
+
+    def sample(self, text, name, **labels):
+        """Value of the sample ``name`` with exactly ``labels`` in an exposition, or 0."""
+        for family in text_string_to_metric_families(text):
+            for sample in family.samples:
+                if sample.name == name and sample.labels == labels:
+                    return sample.value
+        return 0.0
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+
+    def test_requests_queries_and_logins(self):
+        before = self.scrape()
+        self.client.get('/api/journals/')
+        self.client.post('/api/login/', {'email': 'reader@example.com', 'password': 'pw'})
+        self.client.post('/api/login/', {'email': 'reader@example.com', 'password': 'wrong'})
+        after = self.scrape()
+
+        route = {'route': 'api/journals/', 'method': 'GET'}
+        for name, labels in (
+            ('ujoset_http_request_duration_seconds_count', route),
+            ('ujoset_http_responses_total', {**route, 'status': '200'}),
+            ('ujoset_db_queries_per_request_count', {'route': 'api/journals/'}),
+            ('ujoset_logins_total', {'flow': 'api', 'outcome': 'success'}),
+            ('ujoset_logins_total', {'flow': 'api', 'outcome': 'failure'}),
+        ):
+            self.assertEqual(self.sample(after, name, **labels) - self.sample(before, name, **labels), 1, name)
+        queries = (
+            self.sample(after, 'ujoset_db_queries_per_request_sum', route='api/journals/')
+            - self.sample(before, 'ujoset_db_queries_per_request_sum', route='api/journals/')
+        )
+        self.assertGreaterEqual(queries, 1)
+
+    def test_queue_depths(self):
+        text = self.scrape()
+        self.assertEqual(self.sample(text, 'ujoset_pending_file_deletions'), PendingFileDeletion.objects.count())
+        self.assertEqual(
+            self.sample(text, 'ujoset_review_queue_depth'),
+            Article.objects.filter(status=ArticleStatus.SUBMITTED).count(),
+        )
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code, 200)
+
+
+# Queries per request, by route (and method, for routes with several). Each
+# must stay the same when the dataset grows; see QueryBudgetTests.
+QUERY_BUDGETS = {
+    'GET users/': 1,
+    'POST signup/': 4,
+    'POST login/': 2,
+    'POST token/refresh/': 2,
+    'POST token/blacklist/': 7,
+    'GET journals/detailed/': 5,
+    'GET journals_data/<slug>': 4,
+    'GET journals/': 1,
+    'POST journals/': 5,
+    'GET journals/<slug>/': 1,
+    'PUT journals/<slug>/': 3,
+    'DELETE journals/<slug>/': 19,
+    'GET journals/<slug>/volumes/<volume>/<issue>/': 7,
+    'GET volumes/': 3,
+    'GET volumes/<pk>/': 3,
+    'PUT volumes/<pk>/': 6,
+    'GET issues/': 4,
+    'GET issues/<pk>/': 4,
+    'PUT issues/<pk>/': 6,
+    'DELETE issues/<pk>/': 14,
+    'GET articles/': 5,
+    'GET articles/most-read/': 1,
+    'GET articles/feed/': 6,
+    'GET articles/<slug>/': 5,
+    'PUT articles/<slug>/': 8,
+    'DELETE articles/<slug>/': 11,
+    'GET articles/<slug>/download/': 1,
+    'GET articles/issue/<pk>/': 6,
+    'GET review-queue/': 6,
+    'POST review-queue/claim/': 15,
+    'POST review-queue/renew/': 6,
+    'GET stats/articles/': 3,
+    'GET changes/': 5,
+    'GET events/article-status/': 0,
+    'GET oai/': 1,
+    'GET export/articles/': 1,
+}
+# Wall time per request on the larger dataset. Coarse on purpose: it's there
+# to catch a request gone quadratic, not a few percent.
+LATENCY_BUDGET = 0.5
+
+
+# A fast hasher: signup and login would otherwise be timed hashing passwords.
+@override_settings(COUNTER_FLUSH_INTERVAL=3600, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTests(TestCase):
+    """
+    Every /api/ route is requested against a small dataset, then again against
+    a larger one. The query count must be the same both times (no per-row
+    queries) and within QUERY_BUDGETS; the second request must also finish
+    within LATENCY_BUDGET.
+    """
+    # 1 journal, 2 volumes, 4 issues and 12 articles, then 5 journals, 20
+    # volumes, 40 issues and 240 articles.
+    datasets = (
+        dict(journals=1, volumes=2, issues=2, articles=3, prefix='small'),
+        dict(journals=5, volumes=4, issues=2, articles=6, prefix='large'),
+    )
+
+    # Status of each request, 200 unless listed: one the route rejects runs
+    # fewer queries than the path it's meant to measure. The event stream
+    # never ends; only its refusal of anonymous clients is measured.
+    statuses = {
+        'POST journals/': 201,
+        'GET articles/<slug>/download/': 302,
+        'DELETE journals/<slug>/': 204,
+        'DELETE issues/<pk>/': 204,
+        'DELETE articles/<slug>/': 204,
+        'GET events/article-status/': 401,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def auth(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+    def requests(self, data):
+        """(route, method, path, kwargs) of one request per route, aimed at ``data``'s rows."""
+        prefix = data['journals'][0].slug.split('-')[0]
+        journal, volume, issue = data['journals'][0], data['volumes'][0], data['issues'][0]
+        article = data['articles'][0]
+        reviewer, member = data['users'][0], data['users'][1]
+        member.set_password('pw')
+        member.save()
+        return [
+            ('users/', 'get', '/api/users/', {}),
+            ('signup/', 'post', '/api/signup/', {'data': {'email': f'{prefix}-new@example.com', 'password': 'pw'}}),
+            ('login/', 'post', '/api/login/', {'data': {'email': member.email, 'password': 'pw'}}),
+            ('token/refresh/', 'post', '/api/token/refresh/', {'data': {'refresh': str(RefreshToken.for_user(member))}}),
+            ('token/blacklist/', 'post', '/api/token/blacklist/', {'data': {'refresh': str(RefreshToken.for_user(member))}}),
+            ('journals/detailed/', 'get', '/api/journals/detailed/', {}),
+            ('journals_data/<slug>', 'get', f'/api/journals_data/{journal.slug}', {}),
+            ('journals/', 'get', '/api/journals/', {}),
+            ('journals/', 'post', '/api/journals/', {'data': {'name': f'{prefix} new', 'slug': f'{prefix}-new', 'issn': f'{prefix}-new'}}),
+            ('journals/<slug>/', 'get', f'/api/journals/{journal.slug}/', {}),
+            ('journals/<slug>/', 'put', f'/api/journals/{journal.slug}/', {'data': {'description': 'Edited'}}),
+            (
+                'journals/<slug>/volumes/<volume>/<issue>/', 'get',
+                f'/api/journals/{journal.slug}/volumes/{volume.pk}/{issue.pk}/', {},
+            ),
+            ('volumes/', 'get', '/api/volumes/', {}),
+            ('volumes/<pk>/', 'get', f'/api/volumes/{volume.pk}/', {}),
+            ('volumes/<pk>/', 'put', f'/api/volumes/{volume.pk}/', {'data': {'year': 1999}}),
+            ('issues/', 'get', '/api/issues/', {}),
+            ('issues/<pk>/', 'get', f'/api/issues/{issue.pk}/', {}),
+            ('issues/<pk>/', 'put', f'/api/issues/{issue.pk}/', {'data': {'title': 'Edited'}}),
+            ('articles/', 'get', '/api/articles/', {}),
+            ('articles/most-read/', 'get', '/api/articles/most-read/', {}),
+            ('articles/feed/', 'get', f'/api/articles/feed/?journal={journal.slug}', {}),
+            ('articles/<slug>/', 'get', f'/api/articles/{article.slug}/', {}),
+            ('articles/<slug>/', 'put', f'/api/articles/{article.slug}/', {'data': {'title': 'Edited'}}),
+            ('articles/<slug>/download/', 'get', f'/api/articles/{article.slug}/download/', {}),
+            ('articles/issue/<pk>/', 'get', f'/api/articles/issue/{issue.pk}/', {}),
+            ('review-queue/claim/', 'post', '/api/review-queue/claim/', {'data': {'batch': 50}, **self.auth(reviewer)}),
+            ('review-queue/', 'get', '/api/review-queue/', self.auth(reviewer)),
+            ('review-queue/renew/', 'post', '/api/review-queue/renew/', self.auth(reviewer)),
+            ('stats/articles/', 'get', '/api/stats/articles/?group_by=journal,status', self.auth(reviewer)),
+            ('changes/', 'get', '/api/changes/', {}),
+            ('events/article-status/', 'get', '/api/events/article-status/', {}),
+            ('oai/', 'get', '/api/oai/?verb=ListRecords&metadataPrefix=oai_dc', {}),
+            ('export/articles/', 'get', '/api/export/articles/?status=all', {}),
+            # Deletes last, the rows above are gone after them.
+            ('articles/<slug>/', 'delete', f'/api/articles/{article.slug}/', {}),
+            ('issues/<pk>/', 'delete', f'/api/issues/{issue.pk}/', {}),
+            ('journals/<slug>/', 'delete', f'/api/journals/{journal.slug}/', {}),
+        ]
+
+    def measure(self, route, method, path, kwargs):
+        cache.clear()  # singleflight'ed views build their payload every time
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(self.client, method)(path, format='json', **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        expected = self.statuses.get(f'{method.upper()} {route}', 200)
+        self.assertEqual(response.status_code, expected, f'{method.upper()} {path}')
+        return len(queries), elapsed
+
+    def test_queries_do_not_grow_with_the_dataset(self):
+        runs = []
+        for sizes in self.datasets:
+            requests = self.requests(seed_dataset(**sizes))
+            runs.append([
+                (f'{method.upper()} {route}', *self.measure(route, method, path, kwargs))
+                for route, method, path, kwargs in requests
+            ])
+        # A new route must be added here, with its budget.
+        self.assertEqual(
+            {resolve(urlsplit(path).path).route for _, _, path, _ in requests},
+            {f'api/{pattern.pattern}' for pattern in urls.urlpatterns},
+        )
+        small, large = runs
+        self.assertEqual(sorted(row[0] for row in small), sorted(QUERY_BUDGETS))
+        for (name, small_queries, _), (_, large_queries, elapsed) in zip(small, large):
+            with self.subTest(name):
+                self.assertEqual(large_queries, small_queries, 'queries grow with the dataset')
+                self.assertLessEqual(large_queries, QUERY_BUDGETS[name])
+                self.assertLess(elapsed, LATENCY_BUDGET)
@@ -0,0 +1,112 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .metrics import CACHE_LOOKUPS
+
+
+# -------------------------
+# JWT blacklist
+# -------------------------
+# Every RefreshToken.for_user() (LoginView, SignupView) adds an
+# OutstandingToken row, and simplejwt never removes them. `manage.py
+# prune_tokens`, run from cron, deletes the expired ones and their
+# BlacklistedToken rows in bounded batches.
+#
+# The blacklist check on refresh is a join of both tables. RefreshToken here
+# caches its answer per jti: "blacklisted" until the token expires and, only
+# if TOKEN_BLACKLIST_CACHE is shared between the workers (Redis, Memcached,
+# the database), "not blacklisted" for TOKEN_BLACKLIST_CACHE_TTL seconds at
+# most. Blacklisting or un-blacklisting a token updates its entry (receivers
+# below), but only in the cache they run against: with a per-process cache
+# (the default LocMemCache) another worker would keep accepting a token
+# logged out elsewhere until its "not blacklisted" entry ran out.
+
+DEFAULT_CACHE_TTL = 60
+PRUNE_BATCH = 1000
+
+
+def _cache():
+    return caches[getattr(settings, 'TOKEN_BLACKLIST_CACHE', 'default')]
+
+
+def is_shared(cache):
+    """False for backends whose entries live (or die) with the process."""
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def _key(jti):
+    return f'token-blacklist:{jti}'
+
+
+def _lifetime(expires_at):
+    """Seconds until ``expires_at``, at least one."""
+    return max(1, int((expires_at - timezone.now()).total_seconds()))
+
+
+class RefreshToken(tokens.RefreshToken):
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        cache = _cache()
+        blacklisted = cache.get(_key(jti))
+        CACHE_LOOKUPS.labels('token_blacklist', 'miss' if blacklisted is None else 'hit').inc()
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            lifetime = _lifetime(datetime_from_epoch(self.payload['exp']))
+            if blacklisted:
+                cache.set(_key(jti), True, lifetime)
+            elif is_shared(cache):
+                ttl = getattr(settings, 'TOKEN_BLACKLIST_CACHE_TTL', DEFAULT_CACHE_TTL)
+                cache.set(_key(jti), False, min(lifetime, ttl))
+        if blacklisted:
+            raise TokenError(_('Token is blacklisted'))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def _blacklisted(sender, instance, **kwargs):
+    _cache().set(_key(instance.token.jti), True, _lifetime(instance.token.expires_at))
+
+
+@receiver(post_delete, sender=BlacklistedToken)
+def _unblacklisted(sender, instance, **kwargs):
+    jti = OutstandingToken.objects.filter(pk=instance.token_id).values_list('jti', flat=True).first()
+    if jti:
+        _cache().delete(_key(jti))
+
+
+def prune_expired(batch_size=PRUNE_BATCH, pause=0, now=None):
+    """
+    Delete the outstanding tokens expired by ``now`` and their blacklist
+    entries, one transaction per ``batch_size`` tokens, sleeping ``pause``
+    seconds in between. Returns the number of tokens deleted.
+
+    Their cache entries are left to run out: they expire with the tokens.
+    """
+    expired = OutstandingToken.objects.filter(expires_at__lte=now or timezone.now()).order_by('pk')
+    last = deleted = 0
+    while True:
+        # Resumes from the last batch's pk instead of rescanning from the start.
+        pks = list(expired.filter(pk__gt=last).values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            blacklisted = BlacklistedToken.objects.filter(token_id__in=pks)
+            blacklisted._raw_delete(blacklisted.db)
+            outstanding = OutstandingToken.objects.filter(pk__in=pks)
+            deleted += outstanding._raw_delete(outstanding.db)
+        last = pks[-1]
+        if pause:
+            time.sleep(pause)
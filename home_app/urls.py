@@ -1,13 +1,16 @@
 from django.urls import path
+from rest_framework_simplejwt.views import TokenBlacklistView, TokenRefreshView
 from .views import (
     JournalWithDetailsView,
     UserListView,
     JournalListCreateView, JournalDetailView,
     VolumeListCreateView, VolumeDetailView,
     IssueListCreateView, IssueDetailView,
-    ArticleListCreateView, ArticleDetailView,
+    ArticleListCreateView, ArticleDetailView, ArticleDownloadView, MostReadArticlesView, ArticleFeedView,
     JournalDetailVolume,IssueDetailAPIView,
-    SignupView,LoginView,ArticlesByIssueSlugView
+    SignupView,LoginView,ArticlesByIssueSlugView,
+    ReviewQueueView, ReviewQueueClaimView, ReviewQueueRenewView,
+    ArticleStatsView, ChangeFeedView, ArticleStatusEventsView, OAIPMHView, ArticleExportView,
 )
 
 urlpatterns = [
@@ -15,6 +18,8 @@ urlpatterns = [
     path('users/', UserListView.as_view(), name='user-list'),
    path('signup/', SignupView.as_view()),
     path('login/', LoginView.as_view()),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('token/blacklist/', TokenBlacklistView.as_view(), name='token-blacklist'),
     # Journals
     path('journals/detailed/', JournalWithDetailsView.as_view(), name='journal-detailed-list'),
     path('journals_data/<str:slug>', JournalDetailVolume.as_view(), name='journal-list'),
@@ -32,5 +37,20 @@ urlpatterns = [
 
     # Articles
     path('articles/', ArticleListCreateView.as_view(), name='article-list-create'),
+    path('articles/most-read/', MostReadArticlesView.as_view(), name='articles-most-read'),
+    path('articles/feed/', ArticleFeedView.as_view(), name='article-feed'),
     path('articles/<str:slug>/', ArticleDetailView.as_view(), name='article-detail'),
-    path('articles/issue/<str:slug>/', ArticlesByIssueSlugView.as_view(), name='articles-by-issue-slug'),]
+    path('articles/<str:slug>/download/', ArticleDownloadView.as_view(), name='article-download'),
+    path('articles/issue/<str:slug>/', ArticlesByIssueSlugView.as_view(), name='articles-by-issue-slug'),
+
+    # Review queue
+    path('review-queue/', ReviewQueueView.as_view(), name='review-queue'),
+    path('review-queue/claim/', ReviewQueueClaimView.as_view(), name='review-queue-claim'),
+    path('review-queue/renew/', ReviewQueueRenewView.as_view(), name='review-queue-renew'),
+
+    path('stats/articles/', ArticleStatsView.as_view(), name='article-stats'),
+    path('changes/', ChangeFeedView.as_view(), name='change-feed'),
+    path('events/article-status/', ArticleStatusEventsView.as_view(), name='article-status-events'),
+    path('oai/', OAIPMHView.as_view(), name='oai-pmh'),
+    path('export/articles/', ArticleExportView.as_view(), name='article-export'),
+]
@@ -2,13 +2,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.shortcuts import get_object_or_404
-from django.views.generic import TemplateView
-from django.shortcuts import render
-from django.http import HttpResponse
-
-
-from .models import User, Journal, Volume, Issue, Article
+from django.db.models import F, Q
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from django.http import (
+    HttpResponse, HttpResponseNotModified, HttpResponseRedirect, JsonResponse, StreamingHttpResponse,
+)
+from django.conf import settings
+from django.utils import timezone
+from asgiref.sync import sync_to_async
+from prometheus_client import CONTENT_TYPE_LATEST
+from pathlib import Path
+from datetime import datetime, timezone as dt_timezone
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import uuid
+
+
+from .models import User, Journal, Volume, Issue, Article, ArticleStatus, InvalidTransition, StaleVersion
 from .serializers import (
     UserSerializer,
     JournalSerializer,
@@ -18,30 +37,158 @@ from .serializers import (
     JournalWithNestedSerializer,
     JournalDetailSerializer
 )
-
-
-
-class FrontendAppView(TemplateView):
-    template_name = 'index.html'
+from .projections import ArticleProjection, IssueProjection, VolumeProjection, _file_storage
+from .deletion import delete_subtree
+from .permissions import IsReviewer
+from .review_queue import claim_articles, renew_lease
+from .stats import NO_JOURNAL, dashboard
+from .changes import changes_since
+from . import counters
+from . import events
+from . import oai
+from . import export
+from . import singleflight
+from . import metrics
+
+
+
+@functools.lru_cache(maxsize=1)
+def load_frontend_index():
+    """
+    Read the SPA's index.html once per process, with its ETag.
+
+    Returns None when the React build is missing.
+    """
+    path = Path(settings.WHITENOISE_ROOT) / 'index.html'
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    return content, '"%s"' % hashlib.md5(content).hexdigest()
+
+
+class FrontendAppView(View):
+    """
+    Fallback for client-side routes: serves the cached index.html.
+
+    The hashed assets themselves are served by WhiteNoise; index.html must
+    revalidate on every load so a deploy is picked up straight away.
+    """
 
     def get(self, request, *args, **kwargs):
-        try:
-            return render(request, self.template_name)
-        except:
+        index = load_frontend_index()
+        if index is None:
             return HttpResponse(
                 "index.html not found! Run `npm run build` in your React app.",
                 status=501,
             )
+        content, etag = index
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+def encode_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, *types):
+    """Inverse of encode_cursor, coercing each value with the matching type."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return [cast(value) for cast, value in zip(types, values, strict=True)]
+    except (ValueError, TypeError, AttributeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+def optional(cast):
+    """decode_cursor type for values that may be None."""
+    return lambda value: None if value is None else cast(value)
+
+
+def folded_prefix(field, prefix):
+    """
+    Case-insensitive prefix match on a case-folded column, written as a range
+    so the column's index is used instead of a LIKE scan.
+    """
+    prefix = prefix.casefold()
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
 
 
 class UserListView(APIView):
+    """
+    User directory.
+
+    Filters: ``role``, ``is_active``, ``institution`` and ``q`` (prefix of
+    name or email). Results are ordered by email, users without one first,
+    and keyset-paginated: the next page's URL is in the ``Link`` header.
+    ``?compact=1`` returns only what the reviewer picker needs.
+    """
     permission_classes = [AllowAny]
+    page_size = 100
+    max_page_size = 500
+    compact_fields = ('id', 'name', 'email', 'Institution', 'role')
+
+    def filter_users(self, params):
+        users = User.objects.all()
+        if params.get('role'):
+            users = users.filter(role=params['role'].upper())
+        if params.get('is_active'):
+            users = users.filter(is_active=params['is_active'].lower() in ('1', 'true', 'yes'))
+        if params.get('institution'):
+            users = users.filter(Institution=params['institution'])
+        if params.get('q'):
+            users = users.filter(folded_prefix('email_folded', params['q']) | folded_prefix('name_folded', params['q']))
+        if params.get('cursor'):
+            email, pk = decode_cursor(params['cursor'], optional(str), uuid.UUID)
+            if email is None:
+                users = users.filter(Q(email__isnull=True, pk__gt=pk) | Q(email__isnull=False))
+            else:
+                # email is unique, so past the users without one it's a complete keyset.
+                users = users.filter(email__gt=email)
+        # Users without an email (possible with social auth) first, by pk.
+        return users.order_by(F('email').asc(nulls_first=True), 'pk')
+
+    def get_limit(self, params):
+        try:
+            return max(1, min(int(params.get('limit', self.page_size)), self.max_page_size))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
 
     def get(self, request):
         try:
-            users = User.objects.all()
-            serializer = UserSerializer(users, many=True)
-            return Response(serializer.data)
+            params = request.query_params
+            users = self.filter_users(params)
+            limit = self.get_limit(params)
+            compact = params.get('compact', '').lower() in ('1', 'true', 'yes')
+
+            if compact:
+                page = list(users.values(*self.compact_fields)[:limit + 1])
+            else:
+                page = list(users[:limit + 1])
+            has_next = len(page) > limit
+            page = page[:limit]
+
+            if compact:
+                response = Response(page)
+            else:
+                response = Response(UserSerializer(page, many=True).data)
+            if has_next:
+                last = page[-1]
+                query = params.copy()
+                query['cursor'] = encode_cursor(*(
+                    (last['email'], str(last['id'])) if compact else (last.email, str(last.pk))
+                ))
+                response['Link'] = '<%s>; rel="next"' % request.build_absolute_uri(
+                    f'{request.path}?{query.urlencode()}'
+                )
+            return response
+        except ValidationError:
+            raise
         except Exception as e:
             return Response({'detail': str(e)}, status=500)
         
@@ -61,11 +208,14 @@ class JournalWithDetailsView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
+        return Response(singleflight.get_or_build('journals-detailed', self.build))
+
+    @staticmethod
+    def build():
         journals = Journal.objects.prefetch_related(
             'volumes__issues__articles'
         ).all()
-        serializer = JournalWithNestedSerializer(journals, many=True)
-        return Response(serializer.data)
+        return JournalWithNestedSerializer(journals, many=True).data
 
 
 class JournalListCreateView(APIView):
@@ -100,16 +250,18 @@ class JournalDetailView(APIView):
             return Response(serializer.data)
         return Response({'errors': serializer.errors}, status=400)
 
-    def delete(self, request, pk):
-        journal = get_object_or_404(Journal, pk=pk)
-        journal.delete()
+    def delete(self, request, slug):
+        journals = Journal.objects.filter(slug=slug)
+        if not journals.exists():
+            return Response({'detail': 'Not found.'}, status=404)
+        delete_subtree(journals)
         return Response({'detail': 'Deleted successfully.'}, status=204)
 
 class JournalDetailVolume(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, slug):
-        journal = get_object_or_404(Journal, slug=slug)
+        journal = get_object_or_404(Journal.objects.prefetch_related('volumes__issues__articles'), slug=slug)
         serializer = JournalDetailSerializer(journal, context={'request':request})
         return Response(serializer.data)
 # -------------------------------
@@ -117,18 +269,29 @@ class JournalDetailVolume(APIView):
 # -------------------------------
 class IssueDetailAPIView(APIView):
     def get(self, request, slug, volume_number, issue_number):
+        # File URLs are absolute, so the payload depends on the host as well.
+        key = f'issue-detail:{request.build_absolute_uri("/")}:{slug}:{volume_number}:{issue_number}'
+        data = singleflight.get_or_build(
+            key, functools.partial(self.build, request, slug, volume_number, issue_number)
+        )
+        if data is None:
+            return Response({'detail': 'Issue not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def build(request, slug, volume_number, issue_number):
         try:
             issue = Issue.objects.select_related(
                 'volume__journal'
-            ).prefetch_related('articles').get(
+            ).get(
                 id=issue_number,  # ✅ Use UUID for issue
                 volume__id=volume_number,  # ✅ Use UUID for volume
                 volume__journal__slug=slug
             )
         except Issue.DoesNotExist:
-            return Response({'detail': 'Issue not found'}, status=status.HTTP_404_NOT_FOUND)
+            return None
 
-        data = {
+        return {
             'id': issue.id,
             'number': issue.number,
             'title': issue.title,
@@ -143,19 +306,16 @@ class IssueDetailAPIView(APIView):
                     'issn': issue.volume.journal.issn
                 }
             },
-            'articles': ArticleSerializer(issue.articles.all(), many=True,context={"request":request}).data
+            'articles': ArticleProjection(issue.articles.all(), context={"request":request}).data
         }
 
-        return Response(data, status=status.HTTP_200_OK)
-    
 
 class VolumeListCreateView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
         volumes = Volume.objects.all()
-        serializer = VolumeSerializer(volumes, many=True)
-        return Response(serializer.data)
+        return Response(VolumeProjection(volumes).data)
 
     def post(self, request):
         serializer = VolumeSerializer(data=request.data)
@@ -183,7 +343,7 @@ class VolumeDetailView(APIView):
 
     def delete(self, request, pk):
         volume = get_object_or_404(Volume, pk=pk)
-        volume.delete()
+        delete_subtree(Volume.objects.filter(pk=volume.pk))
         return Response({'detail': 'Deleted successfully.'}, status=204)
 
 
@@ -196,8 +356,7 @@ class IssueListCreateView(APIView):
 
     def get(self, request):
         issues = Issue.objects.all()
-        serializer = IssueSerializer(issues, many=True)
-        return Response(serializer.data)
+        return Response(IssueProjection(issues).data)
 
     def post(self, request):
         serializer = IssueSerializer(data=request.data)
@@ -225,7 +384,7 @@ class IssueDetailView(APIView):
 
     def delete(self, request, pk):
         issue = get_object_or_404(Issue, pk=pk)
-        issue.delete()
+        delete_subtree(Issue.objects.filter(pk=issue.pk))
         return Response({'detail': 'Deleted successfully.'}, status=204)
 
 
@@ -238,14 +397,12 @@ class ArticleListCreateView(APIView):
 
     def get(self, request):
         articles = Article.objects.all()
-        serializer = ArticleSerializer(articles, many=True)
-        return Response(serializer.data)
+        return Response(ArticleProjection(articles).data)
 
     def post(self, request):
         data = request.data.copy()
         # You can uncomment the next line if you want to auto-assign the logged-in user
         # data['publisher_id'] = request.user.id
-        print(data)
         serializer = ArticleSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
@@ -263,38 +420,387 @@ class ArticlesByIssueSlugView(APIView):
         # Step 2: Get all related articles
         articles = issue.articles.all()
 
-        # Step 3: Serialize the article list
-        serializer = ArticleSerializer(articles, many=True, context={'request': request})
-        return Response(serializer.data)
+        # Step 3: Project the article list (same shape as ArticleSerializer)
+        return Response(ArticleProjection(articles, context={'request': request}).data)
     
 
+class ArticleFeedView(APIView):
+    """
+    Articles newest first, filtered by ``journal`` (slug), ``year`` (volume
+    year) and ``status`` (default PUBLISHED), ``limit`` at a time with a
+    ``Link: rel="next"`` cursor.
+
+    With a journal, each page is one range scan of article_journal_feed_idx
+    or, with a year too, article_journal_year_idx.
+    """
+    permission_classes = [AllowAny]
+    page_size = 20
+    max_page_size = 100
+
+    def get_limit(self, params):
+        try:
+            return max(1, min(int(params.get('limit', self.page_size)), self.max_page_size))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+
+    def get(self, request):
+        params = request.query_params
+        status_filter = params.get('status', ArticleStatus.PUBLISHED).upper()
+        if status_filter not in ArticleStatus.values:
+            raise ValidationError({'status': 'Unknown status.'})
+        articles = Article.objects.filter(status=status_filter)
+        if params.get('journal'):
+            journal_id = get_object_or_404(Journal.objects.values_list('pk', flat=True), slug=params['journal'])
+            articles = articles.filter(journal_id=journal_id)
+        if params.get('year'):
+            try:
+                articles = articles.filter(year=int(params['year']))
+            except ValueError:
+                raise ValidationError({'year': 'Must be an integer.'})
+        if params.get('cursor'):
+            created_at, pk = decode_cursor(params['cursor'], parse_datetime_param, uuid.UUID)
+            # The redundant <= gives the planner a range to seek to.
+            articles = articles.filter(Q(created_at__lt=created_at) | Q(pk__lt=pk), created_at__lte=created_at)
+        limit = self.get_limit(params)
+
+        page = ArticleProjection(
+            articles.order_by('-created_at', '-id')[:limit + 1], context={'request': request}
+        ).data
+        response = Response(page[:limit])
+        if len(page) > limit:
+            last = page[limit - 1]
+            query = params.copy()
+            query['cursor'] = encode_cursor(last['created_at'], last['id'])
+            response['Link'] = '<%s>; rel="next"' % request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+        return response
+
+
 class ArticleDetailView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, slug):
-        article = get_object_or_404(Article, slug=slug)
+        article = get_object_or_404(Article.objects.select_related('counter'), slug=slug)
+        counters.hit(article.pk, 'views')
         serializer = ArticleSerializer(article, context={'request':request})
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        response['ETag'] = f'"{article.version}"'
+        return response
+
+    def expected_version(self, request, article):
+        """
+        Version the client based its edit on: If-Match, then a ``version``
+        field, else the one just read (still guards the read-modify-write).
+        """
+        version = request.headers.get('If-Match', '').strip('W/"') or request.data.get('version')
+        if version in (None, '', '*'):
+            return article.version
+        try:
+            return int(version)
+        except (TypeError, ValueError):
+            raise ValidationError({'version': 'Must be an integer.'})
 
+    def put(self, request, slug):
+        article = get_object_or_404(Article, slug=slug)
+        article.version = self.expected_version(request, article)
+        serializer = ArticleSerializer(article, data=request.data, partial=True, context={'request': request})
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=400)
 
-    def put(self, request, pk):
-        article = get_object_or_404(Article, pk=pk)
-        serializer = ArticleSerializer(article, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response({'errors': serializer.errors}, status=400)
+        data = serializer.validated_data
+        try:
+            if 'status' in data:
+                article.check_transition(data['status'])
+            for attr, value in data.items():
+                setattr(article, attr, value)
+            article.save_versioned(data.keys())
+        except InvalidTransition as e:
+            return Response({'errors': {'status': [str(e)]}}, status=400)
+        except StaleVersion:
+            current = Article.objects.filter(pk=article.pk).values_list('version', flat=True).first()
+            return Response(
+                {'detail': 'Article was modified by someone else; reload and retry.', 'version': current},
+                status=status.HTTP_409_CONFLICT,
+            )
 
-    def delete(self, request, pk):
-        article = get_object_or_404(Article, pk=pk)
-        article.delete()
+        response = Response(ArticleSerializer(article, context={'request': request}).data)
+        response['ETag'] = f'"{article.version}"'
+        return response
+
+    def delete(self, request, slug):
+        article = get_object_or_404(Article, slug=slug)
+        delete_subtree(Article.objects.filter(pk=article.pk))
         return Response({'detail': 'Deleted successfully.'}, status=204)
 
+class ArticleDownloadView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, slug):
+        # Counted here, then served by whatever serves MEDIA_URL.
+        row = Article.objects.filter(slug=slug).values_list('pk', 'file').first()
+        if row is None or not row[1]:
+            return Response({'detail': 'Not found.'}, status=404)
+        counters.hit(row[0], 'downloads')
+        return HttpResponseRedirect(_file_storage.url(row[1]))
+
+
+class MostReadArticlesView(APIView):
+    permission_classes = [AllowAny]
+    max_limit = 100
+
+    def get(self, request):
+        kind = request.query_params.get('by', 'views')
+        if kind not in counters.KINDS:
+            raise ValidationError({'by': f"Must be one of {', '.join(counters.KINDS)}."})
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return Response(counters.most_read(kind, max(limit, 1)))
+
+
+# -------------------------------
+# Review queue
+# -------------------------------
+
+class ReviewQueueView(APIView):
+    """The requesting reviewer's current (unexpired) claims."""
+    permission_classes = [IsReviewer]
+
+    def get(self, request):
+        articles = Article.objects.filter(
+            reviewer=request.user,
+            status=ArticleStatus.UNDER_REVIEW,
+            lease_expires_at__gte=timezone.now(),
+        )
+        return Response(ArticleProjection(articles, context={'request': request}).data)
+
+
+class ReviewQueueClaimView(APIView):
+    """
+    POST ``{"batch": n}``: atomically claim the next ``n`` SUBMITTED
+    articles (or ones whose review lease expired) for the requesting reviewer.
+    """
+    permission_classes = [IsReviewer]
+    max_batch = 50
+
+    def post(self, request):
+        try:
+            batch = max(1, min(int(request.data.get('batch', 1)), self.max_batch))
+        except (TypeError, ValueError):
+            return Response({'errors': {'batch': ['Must be an integer.']}}, status=400)
+        claimed = claim_articles(request.user, batch)
+        return Response(ArticleProjection(claimed, context={'request': request}).data)
+
+
+class ReviewQueueRenewView(APIView):
+    """Extend the lease on all of the requesting reviewer's current claims."""
+    permission_classes = [IsReviewer]
+
+    def post(self, request):
+        renewed = renew_lease(request.user, Article.objects.all())
+        return Response({'renewed': renewed})
+
+# -------------------------------
+# Change feed
+# -------------------------------
+
+class ChangeFeedView(APIView):
+    """
+    Journals, volumes, issues and articles created, updated or deleted after
+    ``?since=<cursor>`` (omit it to start from the beginning), oldest first.
+
+    Keep calling with the returned ``next`` cursor while ``has_more`` is true;
+    after that, poll with the last cursor to pick up new changes.
+    """
+    permission_classes = [AllowAny]
+    page_size = 500
+    max_page_size = 2000
+
+    def get(self, request):
+        params = request.query_params
+        since = 0
+        if params.get('since'):
+            since, = decode_cursor(params['since'], int)
+        try:
+            limit = max(1, min(int(params.get('limit', self.page_size)), self.max_page_size))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+
+        entries, last, has_more = changes_since(since, limit, request)
+        return Response({'changes': entries, 'next': encode_cursor(last), 'has_more': has_more})
+
+# -------------------------------
+# Status events (server-sent events)
+# -------------------------------
+
+def stream_user(request):
+    """
+    The user behind the JWT in the Authorization header or, since browsers'
+    EventSource can't send headers, in ``?token=``.
+    """
+    auth = JWTAuthentication()
+    try:
+        if request.GET.get('token'):
+            return auth.get_user(auth.get_validated_token(request.GET['token']))
+        result = auth.authenticate(request)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+class ArticleStatusEventsView(View):
+    """
+    ``text/event-stream`` of status changes to the requesting publisher's
+    articles. Each event's id is its change-feed sequence, so a reconnecting
+    EventSource (which sends Last-Event-ID) gets what it missed.
+
+    Served only under ASGI; see home_app.events.
+    """
+    heartbeat = 15
+
+    async def get(self, request):
+        user = await sync_to_async(stream_user)(request)
+        if user is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+        try:
+            last_seq = int(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or 0)
+        except ValueError:
+            last_seq = 0
+
+        subscription = await events.bus.subscribe(user.pk)
+        missed = await sync_to_async(events.replay)(user.pk, last_seq) if last_seq else []
+        response = StreamingHttpResponse(
+            self.stream(subscription, missed), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, subscription, missed):
+        heartbeat = getattr(settings, 'SSE_HEARTBEAT', self.heartbeat)
+        try:
+            yield 'retry: 5000\n\n'
+            for event in missed:
+                yield event
+            while not subscription.overflowed:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+        finally:
+            events.bus.unsubscribe(subscription)
+
+# -------------------------------
+# OAI-PMH
+# -------------------------------
+
+@method_decorator(csrf_exempt, name='dispatch')
+class OAIPMHView(View):
+    """OAI-PMH 2.0 endpoint (GET or form-encoded POST); see home_app.oai."""
+
+    def get(self, request):
+        return self.respond(request, request.GET)
+
+    def post(self, request):
+        return self.respond(request, request.POST)
+
+    def respond(self, request, params):
+        chunks = oai.respond(params, request.build_absolute_uri(request.path), request.build_absolute_uri)
+        return StreamingHttpResponse(chunks, content_type='text/xml; charset=utf-8')
+
+# -------------------------------
+# Bulk metadata export
+# -------------------------------
+
+class ArticleExportView(View):
+    """
+    Streams article metadata as ``?format=csv|jsonl|bibtex|ris``.
+
+    Filters: ``journal`` (slug), ``status`` (default PUBLISHED, ``all`` for
+    every status), ``year`` (volume year) and ``updated_since`` (ISO date or
+    datetime).
+    """
+
+    def get(self, request):
+        params = request.GET
+        format = params.get('format', 'csv')
+        if format not in export.FORMATS:
+            return JsonResponse({'errors': {'format': [f"Choose from {', '.join(export.FORMATS)}."]}}, status=400)
+        status_filter = params.get('status', ArticleStatus.PUBLISHED).upper()
+        if status_filter != 'ALL' and status_filter not in ArticleStatus.values:
+            return JsonResponse({'errors': {'status': ['Unknown status.']}}, status=400)
+        try:
+            year = int(params['year']) if params.get('year') else None
+            updated_since = parse_datetime_param(params.get('updated_since'))
+        except ValueError:
+            return JsonResponse({'errors': {'year/updated_since': ['Invalid value.']}}, status=400)
+
+        articles = export.export_queryset(
+            journal=params.get('journal'),
+            status=None if status_filter == 'ALL' else status_filter,
+            year=year,
+            updated_since=updated_since,
+        )
+        content_type, extension = export.FORMATS[format]
+        response = StreamingHttpResponse(
+            export.export(format, articles, request.build_absolute_uri), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="articles.{extension}"'
+        return response
+
+
+def parse_datetime_param(value):
+    """ISO date or datetime (naive values are taken as UTC), or None."""
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    return moment if timezone.is_aware(moment) else moment.replace(tzinfo=dt_timezone.utc)
+
+# -------------------------------
+# Prometheus metrics
+# -------------------------------
+
+class MetricsView(View):
+    """Prometheus text exposition of home_app.metrics, at /metrics."""
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponse(status=401)
+        return HttpResponse(metrics.render(), content_type=CONTENT_TYPE_LATEST)
+
+# -------------------------------
+# Dashboard statistics
+# -------------------------------
+
+class ArticleStatsView(APIView):
+    """
+    Article counts from the stats rollups, e.g.
+    ``?group_by=journal,status`` or ``?group_by=year,month``.
+    """
+    permission_classes = [IsReviewer]
+    group_fields = ('journal', 'status', 'year', 'month')
+
+    def get(self, request):
+        group_by = [name for name in request.query_params.get('group_by', 'status').split(',') if name]
+        unknown = set(group_by) - set(self.group_fields)
+        if not group_by or unknown:
+            raise ValidationError({'group_by': f"Choose from {', '.join(self.group_fields)}."})
+
+        rows = dashboard(group_by)
+        if 'journal' in group_by:
+            names = dict(Journal.objects.filter(pk__in={row['journal_id'] for row in rows}).values_list('pk', 'name'))
+            for row in rows:
+                journal_id = row.pop('journal_id')
+                row['journal'] = None if journal_id == NO_JOURNAL else {'id': str(journal_id), 'name': names.get(journal_id)}
+        return Response(rows)
+
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -329,8 +835,10 @@ class LoginView(APIView):
 
         user = authenticate(request, username=email, password=password)
         if not user:
+            # Failures are counted by home_app.metrics' user_login_failed receiver.
             return Response({"error": "Invalid credentials"}, status=401)
 
+        metrics.LOGINS.labels('api', 'success').inc()
         refresh = RefreshToken.for_user(user)
         return Response({
             "access": str(refresh.access_token),
@@ -3,6 +3,10 @@ ASGI config for ujoset_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the site through this entry point (`uvicorn ujoset_backend.asgi:application`)
+when the server-sent event streams are in use: each open stream is a
+coroutine here, whereas under WSGI it would hold a worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
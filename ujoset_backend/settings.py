@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -32,7 +33,9 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # SimpleAdminConfig: admin modules are discovered when the URLconf is
+    # loaded (see ujoset_backend/urls.py), not on every manage.py command.
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -42,13 +45,21 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     'home_app',
     'corsheaders',
-        'social_django',
-
 ]
 
+# Google sign-in, off unless SOCIAL_AUTH_ENABLED=1. social_django imports
+# social_core and requests as soon as the app is loaded, so it is left out of
+# every process (manage.py commands, workers) of a deployment that doesn't
+# use it. Where it is used, set it for all processes, migrate included.
+SOCIAL_AUTH_ENABLED = os.environ.get('SOCIAL_AUTH_ENABLED', '0') == '1'
+
+if SOCIAL_AUTH_ENABLED:
+    INSTALLED_APPS.append('social_django')
+
 
 AUTHENTICATION_BACKENDS = (
-    'social_core.backends.google.GoogleOAuth2',
+    ('social_core.backends.google.GoogleOAuth2',) if SOCIAL_AUTH_ENABLED else ()
+) + (
     'django.contrib.auth.backends.ModelBackend',
 )
 
@@ -64,6 +75,9 @@ from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    # Check the blacklist through home_app.tokens' cache.
+    'TOKEN_REFRESH_SERIALIZER': 'home_app.serializers.TokenRefreshSerializer',
+    'TOKEN_BLACKLIST_SERIALIZER': 'home_app.serializers.TokenBlacklistSerializer',
 }
 # ✅ ALLOWED_HOSTS: Must NOT include http/https, just domain names
 ALLOWED_HOSTS = [
@@ -105,16 +119,21 @@ LOGOUT_REDIRECT_URL = "http://localhost:3000"
 
 APPEND_SLASH = False
 
+# The home_app.middleware classes are Django's, except that requests under
+# LEAN_MIDDLEWARE_PREFIXES (the JWT-authenticated API) skip them.
 MIDDLEWARE = [
+    'home_app.middleware.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'home_app.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'home_app.middleware.CsrfViewMiddleware',
+    'home_app.middleware.AuthenticationMiddleware',
+    'home_app.middleware.MessageMiddleware',
+    'home_app.middleware.XFrameOptionsMiddleware',
 ]
+LEAN_MIDDLEWARE_PREFIXES = ('/api/', '/metrics')
 
 ROOT_URLCONF = 'ujoset_backend.urls'
 
@@ -132,7 +151,14 @@ ROOT_URLCONF = 'ujoset_backend.urls'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # orjson-backed JSON by default; internal clients can negotiate
+    # MessagePack with `Accept: application/msgpack`.
+    'DEFAULT_RENDERER_CLASSES': (
+        'home_app.renderers.FastJSONRenderer',
+        'home_app.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 AUTH_USER_MODEL = 'home_app.User'
@@ -155,14 +181,49 @@ TEMPLATES = [
 
 
 
-# Add these:
-# TEMPLATES[0]['DIRS'] = [os.path.join(BASE_DIR, 'frontend', 'build')]
-# STATICFILES_DIRS = [os.path.join(BASE_DIR, 'frontend', 'build', 'static')]
-# STATIC_URL = '/static/'  # Because your React assets are in /static/
-# STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # for collectstatic
+WSGI_APPLICATION = 'ujoset_backend.wsgi.application'
+# Needed for the server-sent event streams (/api/events/...), e.g.
+# `uvicorn ujoset_backend.asgi:application`.
+ASGI_APPLICATION = 'ujoset_backend.asgi.application'
 
+# How often each process polls the change feed for status events, and how
+# long an idle event stream waits before sending a keepalive (seconds).
+SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', 1.0))
+SSE_HEARTBEAT = 15
 
-WSGI_APPLICATION = 'ujoset_backend.wsgi.application'
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+
+# Per-process by default. Point CACHE_BACKEND/CACHE_LOCATION at a shared
+# cache (e.g. django.core.cache.backends.redis.RedisCache) so single-flight
+# builds (home_app.singleflight) are coordinated across worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Serve a stale /api/journals/detailed/ or issue payload while one request
+# rebuilds it, rather than making concurrent requests wait for the rebuild.
+SINGLE_FLIGHT_STALE = os.environ.get('SINGLE_FLIGHT_STALE', '0') == '1'
+
+# Article view/download counts are buffered per process and written every
+# this many seconds by a background thread; a crash loses at most the hits of
+# one interval. The thread stays off under `manage.py test`, whose tests
+# flush explicitly (its writes would contend with their transactions).
+COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL', 5.0))
+COUNTER_FLUSH_THREAD = sys.argv[1:2] != ['test']
+
+# How long a refresh token's "not blacklisted" status may be served from the
+# cache (seconds), if that cache is shared between workers; see home_app.tokens.
+TOKEN_BLACKLIST_CACHE_TTL = 60
+
+# Prometheus metrics at /metrics (home_app.metrics). With several worker
+# processes, also set PROMETHEUS_MULTIPROC_DIR in their environment. When
+# METRICS_TOKEN is set, scrapers must send `Authorization: Bearer <token>`.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
 
 
 # Database
@@ -172,6 +233,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take SQLite's write lock when a transaction opens rather than at its
+        # first write. A deferred transaction that reads before it writes
+        # (stats.bulk_status_update, so every claim and status change) can't
+        # upgrade its read lock while another one holds a read lock too, and
+        # fails with "database is locked" instead of waiting its turn.
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
@@ -211,6 +278,31 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# The Vite build of the React app. collectstatic copies it to
+# STATIC_ROOT/frontend and writes .gz/.br variants next to every file.
+FRONTEND_BUILD_DIR = BASE_DIR / 'frontend' / 'build'
+STATICFILES_DIRS = [('frontend', FRONTEND_BUILD_DIR)]
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        # No manifest: Vite already puts content hashes in the asset names
+        # and index.html references them by those names.
+        'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage',
+    },
+}
+
+# Serve the build at the site root (/assets/..., /index.html). Use the
+# collected copy when it exists so the precompressed variants are picked up.
+WHITENOISE_ROOT = (
+    STATIC_ROOT / 'frontend' if (STATIC_ROOT / 'frontend').is_dir() else FRONTEND_BUILD_DIR
+)
+# Vite asset names carry an 8 character content hash: cache them forever.
+WHITENOISE_IMMUTABLE_FILE_TEST = r'^/assets/.+-[\w-]{8}\.\w+$'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -219,4 +311,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# `manage.py publish_static` writes the public journal/issue/article JSON
+# here for the front proxy to serve (see home_app.snapshots).
+STATIC_SNAPSHOT_ROOT = BASE_DIR / 'public_snapshot'
+STATIC_SNAPSHOT_BASE_URL = os.environ.get('STATIC_SNAPSHOT_BASE_URL', '')
\ No newline at end of file
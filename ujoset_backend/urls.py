@@ -2,21 +2,25 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-# from home_app.views import FrontendAppView
+from home_app.views import FrontendAppView, MetricsView
 import os
 
+# Admin is installed as SimpleAdminConfig so the admin modules are only
+# imported by processes that actually route requests.
+admin.autodiscover()
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('home_app.urls')),
-    # re_path(r'^.*$', FrontendAppView.as_view()),  # catch-all to serve index.html for React
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
     # Serve uploaded media files in development
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
-    # # Serve React build's asset files in development
-    # urlpatterns += static(
-    #     '/static/',  # This must match STATIC_URL in settings.py
-    #     document_root=os.path.join(settings.BASE_DIR, 'frontend', 'build', 'static')
-    # )
+urlpatterns += [
+    # catch-all to serve index.html for React client-side routes; the hashed
+    # /assets/ files never get here, WhiteNoise answers them first.
+    re_path(r'^(?!api/|admin/|static/|media/).*$', FrontendAppView.as_view()),
+]